@@ -1,13 +1,27 @@
 from functools import wraps
-from flask import Flask, jsonify, request, send_from_directory, redirect, url_for, render_template
+from flask import Flask, Response, jsonify, request, send_from_directory, redirect, url_for, render_template
 from flask_cors import CORS
 from flask_login import login_required, current_user, login_user, logout_user
 from config import Config
 from auth import login_manager, authenticate, init_oauth, oauth, is_email_allowed, get_or_create_user
+from storage import encode_compact, get_store, project_items
+from search import highlights
+from query import ItemQuery, QueryError, decode_cursor, encode_cursor
+from stats import StatsError, parse_group_by, parse_metrics
+from export import FORMATS as EXPORT_FORMATS, csv_chunks, csv_columns, ndjson_chunks
+from gitqueue import GitCommitQueue
+from comments import get_comments
+from history import get_history
+from votes import cast_vote, get_vote_log
+from respcache import ENCODINGS, ResponseCache
+from changes import ChangeLog
+from timeline import get_timeline, parse_timestamp
+import atexit
 import hmac
 import json
 import os
 import subprocess
+import time
 from datetime import datetime, timezone
 
 app = Flask(__name__, static_folder='../static', template_folder='../templates')
@@ -33,50 +47,193 @@ TRACKED_FIELDS = [
     'priority_score', 'start_date', 'completed_date',
     'expected_delivery', 'owner', 'dependencies',
 ]
+# Fields a PATCH may set: everything make_item() takes from the request body
+PATCHABLE_FIELDS = TRACKED_FIELDS + ['name', 'phase', 'n8n_workflows']
+# What items keep of their edit history; the entries live in HistoryStore
+HISTORY_FIELDS = ['history_count', 'last_edit']
+SCORE_FIELDS = ['impact_score', 'ease_score', 'priority_score']
 
 
 # --- Data helpers ---
 
+def roadmap_store():
+    store = get_store(ROADMAP_FILE)
+    if store.group_commit is None and Config.GROUP_COMMIT_WINDOW_MS > 0:
+        store.enable_group_commit(Config.GROUP_COMMIT_WINDOW_MS / 1000, Config.GROUP_COMMIT_MAX_BATCH)
+    return store
+
+
+def roadmap_history():
+    return get_history(ROADMAP_FILE)
+
+
+def roadmap_comments():
+    return get_comments(ROADMAP_FILE)
+
+
+def roadmap_votes():
+    return get_vote_log(ROADMAP_FILE)
+
+
+def roadmap_timeline():
+    return get_timeline(ROADMAP_FILE, Config.TIMELINE_CHECKPOINT_EVERY, Config.TIMELINE_CACHE_SIZE,
+                        Config.TIMELINE_KEEP_CHECKPOINTS)
+
+
 def load_roadmap():
-    with open(ROADMAP_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return roadmap_store().load()
 
 
-def save_roadmap(data):
+def save_roadmap(data, changed=(), deleted=()):
+    """Persist the roadmap. Pass the `changed` items and `deleted` ids when known
+    so incremental storage modes only write what the request touched."""
     data['last_updated'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-    # Recompute metadata
-    items = data.get('items', [])
+    revision = data.get('revision', 0) + 1
+    data['revision'] = revision
+    for item in changed:
+        item['revision'] = revision
+    index = roadmap_index(data)
+    index.record_changes(changed, deleted)
+    counters = index.counters
     metadata = data.get('metadata', {})
-    metadata['total_items'] = len(items)
-    metadata['categories'] = sorted(set(i.get('category', 'Uncategorized') for i in items))
+    metadata['total_items'] = counters.total
+    metadata['categories'] = counters.categories()
     data['metadata'] = metadata
-    with open(ROADMAP_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    store = roadmap_store()
+    before = store.generation
+    store.save(data, changed, deleted)
+    change_log.record(revision, changed, deleted, before, store.generation, metadata)
+    roadmap_timeline().record(data, changed, deleted, before, store.generation)
     if Config.GIT_AUTO_COMMIT:
-        git_commit()
+        git_queue.notify([i['id'] for i in changed] + list(deleted))
+
+
+def roadmap_write(f):
+    """Run a mutating handler under the roadmap write lock (threads and worker processes).
+
+    With group commit the save is only queued inside the lock; the response
+    goes out once the batch holding it has been written.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        store = roadmap_store()
+        with store.write_lock():
+            response = f(*args, **kwargs)
+        store.wait_for_flush()
+        return response
+    return decorated
+
+
+def item_etag(item):
+    return f'{item["id"]}.{item.get("revision", 0)}'
+
+
+def check_if_match(item):
+    """Return a 412 response if If-Match doesn't name the item's current revision."""
+    if request.if_match and not request.if_match.contains(item_etag(item)):
+        return jsonify({
+            'error': f'Item {item["id"]} was changed by someone else. Reload and try again.',
+            'revision': item.get('revision', 0),
+        }), 412
+    return None
+
+
+def with_etag(resp, etag):
+    resp.set_etag(etag)
+    return resp
+
+
+# --- Delta sync ---
+
+change_log = ChangeLog(Config.CHANGES_LOG_SIZE)
 
 
-def git_commit():
+# --- Pre-serialized responses ---
+
+roadmap_bodies = ResponseCache()
+
+
+def cached_roadmap_body():
+    """The serialized roadmap for the store's current generation, built once per change."""
+    store = roadmap_store()
+    store.load()  # Picks up changes written by other processes
+
+    def build():
+        with store.write_lock():  # Never snapshot a half-applied write
+            return encode_compact(store.load())
+
+    return roadmap_bodies.get((store, store.generation), build)
+
+
+def encoded_response(body):
+    """Serve an EncodedBody: Accept-Encoding negotiation, strong ETag, 304 on If-None-Match."""
+    encoding = request.accept_encodings.best_match(ENCODINGS, default='identity')
+    if any(request.if_none_match.contains_weak(etag) for etag in body.etags()):
+        resp = app.response_class(status=304)
+    else:
+        resp = app.response_class(body.encoded(encoding), mimetype='application/json')
+        if encoding != 'identity':
+            resp.headers['Content-Encoding'] = encoding
+    resp.vary.add('Accept-Encoding')
+    resp.headers['Cache-Control'] = 'no-cache'
+    return with_etag(resp, body.etag_for(encoding))
+
+
+@app.teardown_request
+def drop_cache_on_error(exc):
+    """A handler that crashed may have half-mutated the cached roadmap."""
+    if exc is not None:
+        roadmap_store().invalidate()
+
+
+def git_commit(item_ids=()):
+    """Commit the roadmap files. Runs on the git queue thread, not in requests."""
     repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     ts = datetime.now().strftime('%Y-%m-%d %H:%M')
+    message = f'Roadmap update: {ts}'
+    if item_ids:
+        message += '\n\nItems: ' + ', '.join(f'#{i}' for i in item_ids)
+    store = roadmap_store()
     try:
-        subprocess.run(['git', 'add', 'data/roadmap.json'], cwd=repo_root,
-                       capture_output=True, check=True)
-        subprocess.run(['git', 'commit', '-m', f'Roadmap update: {ts}'], cwd=repo_root,
+        with store.write_lock():
+            store.flush()
+            store.checkpoint()
+            paths = (store.paths + roadmap_history().paths + roadmap_comments().paths
+                     + roadmap_votes().paths)
+            paths = [p for p in paths if os.path.exists(p)]
+            subprocess.run(['git', 'add', *paths], cwd=repo_root,
+                           capture_output=True, check=True)
+        subprocess.run(['git', 'commit', '-m', message], cwd=repo_root,
                        capture_output=True, check=True)
     except Exception:
         pass  # Silently skip if nothing to commit, git unavailable, or permission denied
 
 
-def next_id(items):
-    return max((i['id'] for i in items), default=0) + 1
+git_queue = GitCommitQueue(git_commit, window=Config.GIT_COMMIT_WINDOW,
+                           max_changes=Config.GIT_COMMIT_MAX_CHANGES)
+atexit.register(git_queue.flush)
+
 
+def flush_roadmap():
+    """Write any saves still waiting for a group commit (runs at exit, before the git flush)."""
+    roadmap_store().flush()
 
-def find_item(items, item_id):
-    for i, item in enumerate(items):
-        if item['id'] == item_id:
-            return i, item
-    return None, None
+
+atexit.register(flush_roadmap)
+
+
+def roadmap_index(data):
+    index = roadmap_store().index(data)
+    index.comment_source = roadmap_comments().all
+    return index
+
+
+def next_id(data):
+    return roadmap_index(data).next_id()
+
+
+def find_item(data, item_id):
+    return roadmap_index(data).find(item_id)
 
 
 def today_str():
@@ -102,13 +259,15 @@ def make_item(data, item_id):
         'start_date': data.get('start_date'),
         'completed_date': data.get('completed_date'),
         'dependencies': data.get('dependencies', ''),
-        'votes': [],
+        'votes': {},
+        'voter_names': {},
         'vote_count': 0,
-        'comments': [],
+        'comment_count': 0,
         'n8n_workflows': data.get('n8n_workflows', []),
         'owner': data.get('owner', 'Zev'),
         'added_date': today_str(),
-        'edit_history': [],
+        'history_count': 0,
+        'last_edit': None,
     }
 
 
@@ -119,7 +278,7 @@ def validate_item_input(data, require_name=True):
         return 'Field "name" is required and cannot be empty'
     if 'status' in data and data['status'] not in VALID_STATUSES:
         return f'Invalid status. Must be one of: {", ".join(VALID_STATUSES)}'
-    for field in ['impact_score', 'ease_score', 'priority_score']:
+    for field in SCORE_FIELDS:
         if field in data:
             try:
                 val = float(data[field])
@@ -130,6 +289,18 @@ def validate_item_input(data, require_name=True):
     return None
 
 
+def validate_patch_input(data):
+    """Validate only the fields a PATCH sends."""
+    if not data or not isinstance(data, dict):
+        return 'Request body must be a JSON object'
+    unknown = sorted(k for k in data if k not in PATCHABLE_FIELDS and k != '_edited_by')
+    if unknown:
+        return f'Unknown or read-only fields: {", ".join(unknown)}'
+    if 'name' in data and not (isinstance(data['name'], str) and data['name'].strip()):
+        return 'Field "name" cannot be empty'
+    return validate_item_input(data, require_name=False)
+
+
 def apply_status_dates(item, new_status):
     """Auto-set dates based on status transitions."""
     if new_status == 'IN_PROGRESS' and not item.get('start_date'):
@@ -138,6 +309,103 @@ def apply_status_dates(item, new_status):
         item['completed_date'] = today_str()
 
 
+# --- Item mutations (shared by the single-item routes and the batch endpoint) ---
+
+def history_entry(field, old_value, new_value, edited_by, timestamp=None):
+    return {
+        'timestamp': timestamp or datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'field': field,
+        'old_value': old_value,
+        'new_value': new_value,
+        'edited_by': edited_by,
+    }
+
+
+def record_history(item, entries):
+    """Append edit history entries to the item's log (see HistoryStore)."""
+    roadmap_history().append(item, entries)
+
+
+def add_new_item(data, body, item_id=None, edited_by=None):
+    """Create an item from validated input and add it; `edited_by` records a creation entry."""
+    item = make_item(body, item_id or next_id(data))
+    apply_status_dates(item, item['status'])
+    entries = [history_entry('status', None, item['status'], edited_by)] if edited_by else []
+    roadmap_history().reset(item, entries)
+    roadmap_comments().drop(item['id'])
+    roadmap_index(data).add(item)
+    return item
+
+
+def replace_item(data, idx, existing, body, edited_by):
+    """Full update from validated input, keeping votes/comments and logging tracked fields."""
+    updated = make_item(body, existing['id'])
+    # Preserve fields that shouldn't be overwritten on full update
+    updated['added_date'] = existing.get('added_date', today_str())
+    for key in ('votes', 'voter_names', 'vote_count', 'comments', 'comment_count', 'edit_history', 'history_count', 'last_edit'):
+        if key in existing:
+            updated[key] = existing[key]
+    # Carry forward existing dates unless explicitly provided
+    if 'start_date' not in body:
+        updated['start_date'] = existing.get('start_date')
+    if 'completed_date' not in body:
+        updated['completed_date'] = existing.get('completed_date')
+    if 'expected_delivery' not in body:
+        updated['expected_delivery'] = existing.get('expected_delivery')
+    apply_status_dates(updated, updated['status'])
+    # Track edit history
+    now_ts = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    record_history(updated, [
+        history_entry(field, existing.get(field), updated.get(field), edited_by, now_ts)
+        for field in TRACKED_FIELDS
+        if (existing.get(field) or None) != (updated.get(field) or None)
+    ])
+    data['items'][idx] = updated
+    return updated
+
+
+def patch_item(item, body, edited_by):
+    """Apply validated PATCH fields to an item in place.
+
+    Returns ({field: new value} for the fields that actually changed, including
+    dates a status change filled in and the history bookkeeping, and the edit
+    history entries added).
+    """
+    before = {field: item.get(field) for field in PATCHABLE_FIELDS + HISTORY_FIELDS}
+    for field, value in body.items():
+        if field in PATCHABLE_FIELDS:
+            item[field] = float(value) if field in SCORE_FIELDS else value
+    if 'status' in body:
+        apply_status_dates(item, item['status'])
+    changed = {f: item.get(f) for f in PATCHABLE_FIELDS if item.get(f) != before[f]}
+    now_ts = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    entries = [history_entry(field, before[field], value, edited_by, now_ts)
+               for field, value in changed.items()
+               if field in TRACKED_FIELDS and (before[field] or None) != (value or None)]
+    if changed:
+        record_history(item, entries)
+        changed.update((f, item.get(f)) for f in HISTORY_FIELDS if item.get(f) != before[f])
+    return changed, entries
+
+
+def set_item_status(item, new_status, edited_by):
+    """Move an item to a validated status in place, logging the change."""
+    old_status = item['status']
+    item['status'] = new_status
+    apply_status_dates(item, new_status)
+    # Track status change in edit history
+    record_history(item, [history_entry('status', old_status, new_status, edited_by)]
+                   if old_status != new_status else [])
+    return item
+
+
+def remove_item(data, item_id):
+    """Remove an item, its edit history log and its comments."""
+    roadmap_index(data).remove(item_id)
+    roadmap_history().delete(item_id)
+    roadmap_comments().drop(item_id)
+
+
 # --- Static files ---
 
 @app.route('/')
@@ -162,9 +430,18 @@ def static_files(path):
 @app.route('/api/health')
 def health():
     try:
-        data = load_roadmap()
+        store = roadmap_store()
+        data = store.load()
         item_count = len(data.get('items', []))
-        return jsonify({'status': 'ok', 'items': item_count})
+        return jsonify({
+            'status': 'ok',
+            'items': item_count,
+            'cache': store.stats(),
+            'responses': roadmap_bodies.stats(),
+            'git': git_queue.stats(),
+            'group_commit': store.group_commit.stats() if store.group_commit else None,
+            'timeline': roadmap_timeline().stats(),
+        })
     except Exception:
         return jsonify({'status': 'error', 'error': 'Failed to load roadmap'}), 500
 
@@ -280,32 +557,373 @@ def google_callback():
 
 @app.route('/api/roadmap')
 def get_roadmap():
-    return jsonify(load_roadmap())
+    """The roadmap document; ?as_of=<ISO 8601 date or datetime> for how it stood then."""
+    as_of = request.args.get('as_of')
+    if not as_of:
+        return encoded_response(cached_roadmap_body())
+    try:
+        ts = parse_timestamp(as_of)
+    except ValueError:
+        return jsonify({'error': 'as_of must be an ISO 8601 date or datetime'}), 400
+    timeline = roadmap_timeline()
+    body = timeline.body_at(ts)
+    if body is None:
+        return jsonify({'error': f'No roadmap history before {ts}', 'earliest': timeline.earliest()}), 404
+    return encoded_response(body)
+
+
+@app.route('/api/roadmap/changes')
+def get_changes():
+    """Items created/updated and tombstones for items deleted after revision `since`.
+
+    Falls back to the full document ("snapshot": true) when the change log no
+    longer reaches back to `since`.
+    """
+    since = request.args.get('since', type=int)
+    if since is None:
+        return jsonify({'error': 'since must be a revision number'}), 400
+    store = roadmap_store()
+    data = store.load()
+    revision = data.get('revision', 0)
+    change_log.sync(revision, store.generation)
+    delta = change_log.since(since) if since <= revision else None
+    if delta is None:
+        return jsonify({'since': since, 'revision': revision, 'snapshot': True, 'roadmap': data})
+    changed, deleted = delta
+    index = roadmap_index(data)
+    items = (index.get(item_id) for item_id in sorted(changed, key=changed.get))
+    return jsonify({
+        'since': since,
+        'revision': revision,
+        'snapshot': False,
+        'items': [item for item in items if item is not None],
+        'deleted': [{'id': item_id, 'revision': rev} for item_id, rev in deleted.items()],
+        'metadata': data.get('metadata', {}),
+        'last_updated': data.get('last_updated'),
+    })
+
+
+@app.route('/api/roadmap/stream')
+def stream_changes():
+    """Server-sent events: one `change` event per save, id = the new revision.
+
+    Resumes after Last-Event-ID (or ?since= on first connect). A client the
+    change log can't catch up gets a `resync` event and should call /changes.
+    Streams end after STREAM_MAX_SECONDS; EventSource reconnects and resumes.
+    """
+    store = roadmap_store()
+
+    def current_revision():
+        data = store.load()
+        revision = data.get('revision', 0)
+        change_log.sync(revision, store.generation)
+        return revision
+
+    last = request.headers.get('Last-Event-ID', type=int)
+    if last is None:
+        last = request.args.get('since', type=int)
+    if last is None:
+        last = current_revision()
+
+    def events(last):
+        deadline = time.monotonic() + Config.STREAM_MAX_SECONDS
+        yield f'retry: {Config.STREAM_RETRY_MS}\n\n'
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            revision = current_revision()
+            batch = change_log.wait(last, min(Config.STREAM_HEARTBEAT, remaining)) if last <= revision else None
+            if batch is None:
+                last = current_revision()
+                yield f'id: {last}\nevent: resync\ndata: {{"revision": {last}}}\n\n'
+            elif not batch:
+                yield ': ping\n\n'
+            for rev, event in batch or ():
+                yield f'id: {rev}\nevent: change\ndata: {event}\n\n'
+                last = rev
+
+    return Response(events(last), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # nginx: deliver events as they are written
+    })
+
+
+@app.route('/api/roadmap/metadata')
+def get_metadata():
+    """Counts and score histograms without the items, for dashboards and header counts."""
+    data = load_roadmap()
+    counts = roadmap_index(data).counters.snapshot()
+    by_status = {status: counts['by_status'].pop(status, 0) for status in VALID_STATUSES}
+    by_status.update(counts['by_status'])
+    counts.update({
+        'revision': data.get('revision', 0),
+        'last_updated': data.get('last_updated'),
+        'categories': sorted(counts['by_category']),
+        'by_status': by_status,
+    })
+    return jsonify(counts)
+
+
+MAX_PAGE_SIZE = 1000
+
+
+def field_list(name):
+    """A comma-separated query parameter as a list, or None when absent."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    return [f.strip() for f in value.split(',') if f.strip()]
+
+
+@app.route('/api/roadmap/stats')
+def get_stats():
+    """Aggregates per group, e.g. ?group_by=category,status&metrics=count,avg:priority_score,sum:vote_count.
+
+    group_by: any of category, status, owner, phase (none = totals only).
+    metrics: count, sum:<field> or avg:<field> over impact_score, ease_score,
+    priority_score, vote_count and comment_count (default count). Averages
+    skip items without a value.
+    """
+    try:
+        group_by = parse_group_by(field_list('group_by') or [])
+        metrics = parse_metrics(field_list('metrics') or ['count'])
+    except StatsError as e:
+        return jsonify({'error': str(e)}), 400
+    data = load_roadmap()
+    result = roadmap_index(data).stats.query(group_by, metrics)
+    revision = data.get('revision', 0)
+    return with_etag(jsonify({
+        'revision': revision,
+        'group_by': list(group_by),
+        'metrics': list(metrics),
+        **result,
+    }), f'stats.{revision}')
 
 
 @app.route('/api/roadmap/items')
 def get_items():
+    """Items, optionally filtered, sorted, projected (?fields= / ?exclude=) and paginated.
+
+    Filters (all must hold): ?status=, ?category=, ?owner= (comma-separated
+    lists), ?impact_min= / ?impact_max= (also ease_, priority_), date ranges
+    such as ?completed_date_from= / ?completed_date_to=, ?has_votes= and
+    ?blocked= (has a blocker, per its dependencies, that isn't DONE).
+    ?sort= takes id, a score or a date field, prefixed with - for descending.
+
+    With ?limit= (and ?cursor= from the previous page's X-Next-Cursor header)
+    unsorted items come in id order, so pages stay stable while the board changes.
+    """
+    limit = request.args.get('limit', type=int)
+    if 'limit' in request.args and (limit is None or not 1 <= limit <= MAX_PAGE_SIZE):
+        return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    try:
+        query = ItemQuery.from_args(request.args)
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor, query.sort) if cursor is not None else None
+    except QueryError as e:
+        return jsonify({'error': str(e)}), 400
+    paginate = limit is not None or after is not None
+    fields, exclude = field_list('fields'), field_list('exclude')
+    if query.sort and fields and query.sort not in fields:
+        fields.append(query.sort)  # The next cursor is built from it
+    if query.sort and exclude:
+        exclude = [f for f in exclude if f != query.sort]
+    items = roadmap_store().list_items(
+        query,
+        after=after,
+        limit=(limit or MAX_PAGE_SIZE) + 1 if paginate else None,
+        fields=fields,
+        exclude=exclude,
+    )
+    headers = {}
+    if paginate and len(items) > (limit or MAX_PAGE_SIZE):
+        items = items[:-1]
+        headers['X-Next-Cursor'] = encode_cursor(query.cursor_key(items[-1]))
+    return Response(encode_compact(items), mimetype='application/json', headers=headers)
+
+
+@app.route('/api/roadmap/export')
+def export_items():
+    """Items as a streamed ?format=csv (default) or ?format=ndjson download.
+
+    Takes get_items' filters, ?sort=, ?fields= and ?exclude= (no paging). CSV
+    has one flat column per field (see export.CSV_COLUMNS); NDJSON one item
+    per line. Rows are encoded as the client reads them, so memory use does
+    not grow with the board.
+    """
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f'format must be one of: {", ".join(EXPORT_FORMATS)}'}), 400
+    try:
+        query = ItemQuery.from_args(request.args)
+    except QueryError as e:
+        return jsonify({'error': str(e)}), 400
+    fields, exclude = field_list('fields'), field_list('exclude')
+    if fmt == 'csv':
+        columns = csv_columns(fields, exclude)
+        body = csv_chunks(roadmap_store().iter_items(query, fields=columns), columns)
+    else:
+        body = ndjson_chunks(roadmap_store().iter_items(query, fields=fields, exclude=exclude))
+    filename = f'roadmap-{datetime.now(timezone.utc):%Y-%m-%d}.{fmt}'
+    return Response(body, mimetype=EXPORT_FORMATS[fmt], headers={
+        'Content-Disposition': f'attachment; filename="{filename}"',
+    })
+
+
+SEARCH_DEFAULT_FIELDS = ['name', 'status', 'category', 'priority_score']
+
+
+@app.route('/api/roadmap/search')
+def search_items():
+    """Ranked full-text search over names, descriptions, categories, impact,
+    dependencies and comments. Every word must match, as a whole word or a prefix.
+
+    ?q= query, ?limit= (default 20), ?fields= item fields to return (id is always included).
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+    limit = request.args.get('limit', 20, type=int)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    fields = field_list('fields') or SEARCH_DEFAULT_FIELDS
     data = load_roadmap()
-    status = request.args.get('status')
-    category = request.args.get('category')
-    items = data['items']
-    if status:
-        items = [i for i in items if i['status'] == status.upper()]
-    if category:
-        items = [i for i in items if i['category'].lower() == category.lower()]
-    return jsonify(items)
+    index = roadmap_index(data)
+    total, ranked = index.search.search(query, limit)
+    results = []
+    for item_id, score in ranked:
+        item = index.get(item_id)
+        if item is None:
+            continue
+        results.append({
+            'id': item_id,
+            'score': score,
+            'item': project_items([item], fields)[0],
+            'highlights': highlights(item, query, roadmap_comments().all),
+        })
+    return Response(encode_compact({'query': query, 'total': total, 'results': results}),
+                    mimetype='application/json')
+
+
+# --- Dependencies ---
+# Parsed from each item's free-text `dependencies`: every #<id> is a blocker.
+
+def dependency_summary(index, item_id, depth=None):
+    item = index.get(item_id)
+    summary = {'id': item_id, 'name': item.get('name'), 'status': item.get('status')}
+    if depth is not None:
+        summary['depth'] = depth
+    return summary
+
+
+def transitive_arg():
+    value = request.args.get('transitive', 'false').lower()
+    if value not in ('true', 'false'):
+        return None
+    return value == 'true'
+
+
+@app.route('/api/roadmap/items/<int:item_id>/blockers')
+def get_blockers(item_id):
+    """Items this one depends on, nearest first (?transitive=true follows them
+    all the way down). `blocked` is true while any direct blocker isn't DONE."""
+    transitive = transitive_arg()
+    if transitive is None:
+        return jsonify({'error': 'transitive must be true or false'}), 400
+    index = roadmap_index(load_roadmap())
+    graph = index.graph
+    if item_id not in graph:
+        return jsonify({'error': f'Item {item_id} not found'}), 404
+    _, unknown = graph.blockers(item_id)
+    return jsonify({
+        'item_id': item_id,
+        'blocked': graph.open_blockers(item_id) > 0,
+        'blockers': [dependency_summary(index, i, depth)
+                     for i, depth in graph.walk(item_id, transitive=transitive)],
+        'unknown': unknown,
+    })
+
+
+@app.route('/api/roadmap/items/<int:item_id>/dependents')
+def get_dependents(item_id):
+    """Items that list this one as a blocker, nearest first (?transitive=true for
+    everything downstream of it)."""
+    transitive = transitive_arg()
+    if transitive is None:
+        return jsonify({'error': 'transitive must be true or false'}), 400
+    index = roadmap_index(load_roadmap())
+    graph = index.graph
+    if item_id not in graph:
+        return jsonify({'error': f'Item {item_id} not found'}), 404
+    return jsonify({
+        'item_id': item_id,
+        'dependents': [dependency_summary(index, i, depth)
+                       for i, depth in graph.walk(item_id, reverse=True, transitive=transitive)],
+    })
+
+
+@app.route('/api/roadmap/dependencies')
+def get_dependency_graph():
+    """The board's blocked item ids, dependency cycles, and its critical path:
+    the longest chain of blockers weighted by build_time hours (DONE items
+    count 0). ?item= gives the longest chain ending at that item instead."""
+    item_id = request.args.get('item', type=int)
+    if 'item' in request.args and item_id is None:
+        return jsonify({'error': 'item must be an item id'}), 400
+    index = roadmap_index(load_roadmap())
+    graph = index.graph
+    if item_id is not None and item_id not in graph:
+        return jsonify({'error': f'Item {item_id} not found'}), 404
+    hours, path = graph.critical_path(item_id)
+    return jsonify({
+        'blocked': sorted(graph.blocked()),
+        'cycles': graph.cycles(),
+        'critical_path': {
+            'hours': hours,
+            'items': [dependency_summary(index, i) for i in path],
+        },
+    })
 
 
 @app.route('/api/roadmap/items/<int:item_id>')
 def get_item(item_id):
-    data = load_roadmap()
-    _, item = find_item(data['items'], item_id)
+    item = roadmap_store().get_item(item_id)
+    if item is None:
+        return jsonify({'error': f'Item {item_id} not found'}), 404
+    return with_etag(jsonify(item), item_etag(item))
+
+
+HISTORY_PAGE_SIZE = 50
+
+
+@app.route('/api/roadmap/items/<int:item_id>/history')
+def get_item_history(item_id):
+    """An item's edit history, newest first, a page at a time.
+
+    ?limit= (default 50), ?before= the `seq` of the last entry already shown,
+    ?field= only that field's entries. `next_before` is null on the last page.
+    """
+    limit = request.args.get('limit', HISTORY_PAGE_SIZE, type=int)
+    before = request.args.get('before', type=int)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    if 'before' in request.args and (before is None or before < 1):
+        return jsonify({'error': 'before must be a positive entry seq'}), 400
+    item = roadmap_store().get_item(item_id)
     if item is None:
         return jsonify({'error': f'Item {item_id} not found'}), 404
-    return jsonify(item)
+    total, entries, more = roadmap_history().page(item, limit, before, request.args.get('field') or None)
+    return jsonify({
+        'item_id': item_id,
+        'total': total,
+        'entries': entries,
+        'next_before': entries[-1]['seq'] if more else None,
+    })
 
 
 @app.route('/api/roadmap/items', methods=['POST'])
+@roadmap_write
 def create_item():
     body = request.get_json(silent=True)
     error = validate_item_input(body)
@@ -313,12 +931,9 @@ def create_item():
         return jsonify({'error': error}), 400
 
     data = load_roadmap()
-    new_id = next_id(data['items'])
-    item = make_item(body, new_id)
-    apply_status_dates(item, item['status'])
-    data['items'].append(item)
-    save_roadmap(data)
-    return jsonify(item), 201
+    item = add_new_item(data, body)
+    save_roadmap(data, changed=[item])
+    return with_etag(jsonify(item), item_etag(item)), 201
 
 
 # --- API Key Auth ---
@@ -341,6 +956,7 @@ def require_api_key(f):
 
 @app.route('/api/roadmap/items/create', methods=['POST'])
 @require_api_key
+@roadmap_write
 def api_create_item():
     """Authenticated endpoint for external item creation (e.g. Claude Browser)."""
     body = request.get_json(silent=True)
@@ -349,32 +965,131 @@ def api_create_item():
         return jsonify({'error': error}), 400
 
     data = load_roadmap()
-    new_id = next_id(data['items'])
-    item = make_item(body, new_id)
-    apply_status_dates(item, item['status'])
-
-    # Add creation edit_history entry
-    now_ts = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-    item['edit_history'] = [{
-        'timestamp': now_ts,
-        'field': 'status',
-        'old_value': None,
-        'new_value': item['status'],
-        'edited_by': body.get('_edited_by', 'API'),
-    }]
-
-    data['items'].append(item)
-    save_roadmap(data)
-    return jsonify({
+    item = add_new_item(data, body, edited_by=body.get('_edited_by', 'API'))
+    save_roadmap(data, changed=[item])
+    return with_etag(jsonify({
         'success': True,
-        'id': new_id,
+        'id': item['id'],
         'name': item['name'],
         'status': item['status'],
         'url': f'https://cs.dashq.io',
-    }), 201
+    }), item_etag(item)), 201
+
+
+BATCH_OPS = ('create', 'update', 'status', 'delete')
+MAX_BATCH_SIZE = 500
+
+
+def validate_operation(op):
+    """Check one batch operation's shape and input; returns an error message or None."""
+    if not isinstance(op, dict) or op.get('op') not in BATCH_OPS:
+        return f'op must be one of: {", ".join(BATCH_OPS)}'
+    if op['op'] != 'create' and (not isinstance(op.get('id'), int) or isinstance(op['id'], bool)):
+        return 'Field "id" must be an integer'
+    if op['op'] in ('create', 'update'):
+        return validate_item_input(op.get('item'))
+    if op['op'] == 'status' and str(op.get('status', '')).upper() not in VALID_STATUSES:
+        return f'Invalid status. Must be one of: {", ".join(VALID_STATUSES)}'
+    return None
+
+
+@app.route('/api/roadmap/items/batch', methods=['POST'])
+@require_api_key
+@roadmap_write
+def batch_items():
+    """Apply create/update/status/delete operations with one load, one save and one commit.
+
+    {"mode": "atomic" | "best_effort", "operations": [{"op": "create", "item": {...}},
+     {"op": "update", "id": 3, "item": {...}}, {"op": "status", "id": 3, "status": "DONE"},
+     {"op": "delete", "id": 4}]}
+
+    Every operation is checked before any is applied. "atomic" (the default)
+    applies nothing if one fails; "best_effort" applies the rest. An optional
+    "revision" on an operation must match the item's current revision. Created
+    items get consecutive new ids (returned per operation), and later operations
+    in the same batch may refer to them.
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict) or not isinstance(body.get('operations'), list):
+        return jsonify({'error': 'Request body must be {"operations": [...]}'}), 400
+    mode = body.get('mode', 'atomic')
+    if mode not in ('atomic', 'best_effort'):
+        return jsonify({'error': 'mode must be "atomic" or "best_effort"'}), 400
+    operations = body['operations']
+    if not 1 <= len(operations) <= MAX_BATCH_SIZE:
+        return jsonify({'error': f'operations must contain 1 to {MAX_BATCH_SIZE} entries'}), 400
+    edited_by = body.get('edited_by', 'API')
+
+    data = load_roadmap()
+    index = roadmap_index(data)
+    results, created, gone = [], set(), set()
+    new_id = next_id(data)  # Ids are not reused within a batch, even after its own deletes
+    for op in operations:
+        error, status = validate_operation(op), 400
+        result = {'op': op.get('op') if isinstance(op, dict) else None}
+        if error is None and op['op'] == 'create':
+            result['id'] = new_id
+            created.add(new_id)
+            new_id += 1
+        elif error is None:
+            item = index.get(op['id'])
+            if op['id'] in gone or (item is None and op['id'] not in created):
+                error, status = f'Item {op["id"]} not found', 404
+            elif item is not None and 'revision' in op and op['revision'] != item.get('revision', 0):
+                error, status = f'Item {op["id"]} was changed by someone else', 412
+            elif op['op'] == 'delete':
+                gone.add(op['id'])
+        if isinstance(op, dict) and 'id' in op and op.get('op') != 'create':
+            result['id'] = op['id']  # A create's id is always the allocated one
+        if error:
+            result.update(status=status, error=error)
+        results.append(result)
+
+    failed = sum(1 for r in results if 'error' in r)
+    if failed and mode == 'atomic':
+        for result in results:
+            if 'error' not in result:
+                result.update(status=424, error='Not applied: another operation in the batch failed')
+        return jsonify({'mode': mode, 'applied': 0, 'failed': failed, 'results': results}), 409
+
+    changed, deleted = {}, []
+    for op, result in zip(operations, results):
+        if 'error' in result:
+            continue
+        kind = op['op']
+        if kind == 'create':
+            item = add_new_item(data, op['item'], result['id'],
+                                edited_by=op['item'].get('_edited_by', edited_by))
+            result['status'] = 201
+        elif kind == 'update':
+            idx, existing = find_item(data, op['id'])
+            item = replace_item(data, idx, existing, op['item'], op['item'].get('_edited_by', edited_by))
+            result['status'] = 200
+        elif kind == 'status':
+            item = set_item_status(index.get(op['id']), op['status'].upper(), edited_by)
+            result['status'] = 200
+        else:
+            remove_item(data, op['id'])
+            changed.pop(op['id'], None)
+            deleted.append(op['id'])
+            result['status'] = 200
+            continue
+        changed[item['id']] = item
+        result['item'] = item
+
+    if changed or deleted:
+        save_roadmap(data, changed=list(changed.values()), deleted=deleted)
+    return jsonify({
+        'mode': mode,
+        'applied': len(results) - failed,
+        'failed': failed,
+        'revision': data.get('revision', 0),
+        'results': results,
+    })
 
 
 @app.route('/api/roadmap/items/<int:item_id>', methods=['PUT'])
+@roadmap_write
 def update_item(item_id):
     body = request.get_json(silent=True)
     error = validate_item_input(body)
@@ -382,57 +1097,68 @@ def update_item(item_id):
         return jsonify({'error': error}), 400
 
     data = load_roadmap()
-    idx, existing = find_item(data['items'], item_id)
+    idx, existing = find_item(data, item_id)
     if existing is None:
         return jsonify({'error': f'Item {item_id} not found'}), 404
+    conflict = check_if_match(existing)
+    if conflict:
+        return conflict
+
+    updated = replace_item(data, idx, existing, body, body.get('_edited_by', 'Zev'))
+    save_roadmap(data, changed=[updated])
+    return with_etag(jsonify(updated), item_etag(updated))
 
-    updated = make_item(body, item_id)
-    # Preserve fields that shouldn't be overwritten on full update
-    updated['added_date'] = existing.get('added_date', today_str())
-    updated['votes'] = existing.get('votes', [])
-    updated['vote_count'] = existing.get('vote_count', 0)
-    updated['comments'] = existing.get('comments', [])
-    # Carry forward existing dates unless explicitly provided
-    if 'start_date' not in body:
-        updated['start_date'] = existing.get('start_date')
-    if 'completed_date' not in body:
-        updated['completed_date'] = existing.get('completed_date')
-    if 'expected_delivery' not in body:
-        updated['expected_delivery'] = existing.get('expected_delivery')
-    apply_status_dates(updated, updated['status'])
-    # Track edit history
-    history = list(existing.get('edit_history', []))
-    edited_by = body.get('_edited_by', 'Zev')
-    now_ts = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-    for field in TRACKED_FIELDS:
-        old_val = existing.get(field)
-        new_val = updated.get(field)
-        if (old_val or None) != (new_val or None):
-            history.append({
-                'timestamp': now_ts,
-                'field': field,
-                'old_value': old_val,
-                'new_value': new_val,
-                'edited_by': edited_by,
-            })
-    updated['edit_history'] = history
-    data['items'][idx] = updated
-    save_roadmap(data)
-    return jsonify(updated)
+
+@app.route('/api/roadmap/items/<int:item_id>', methods=['PATCH'])
+@roadmap_write
+def patch_item_fields(item_id):
+    """Partial update: send only the fields to change.
+
+    Responds with just {id, revision, changed: {field: value}, history: [new
+    edit history entries]}. Fields that end up unchanged are not logged, and a
+    PATCH that changes nothing does not save.
+    """
+    body = request.get_json(silent=True)
+    error = validate_patch_input(body)
+    if error:
+        return jsonify({'error': error}), 400
+
+    data = load_roadmap()
+    _, item = find_item(data, item_id)
+    if item is None:
+        return jsonify({'error': f'Item {item_id} not found'}), 404
+    conflict = check_if_match(item)
+    if conflict:
+        return conflict
+
+    changed, entries = patch_item(item, body, body.get('_edited_by', 'Zev'))
+    if changed:
+        save_roadmap(data, changed=[item])
+    return with_etag(jsonify({
+        'id': item_id,
+        'revision': item.get('revision', 0),
+        'changed': changed,
+        'history': entries,
+    }), item_etag(item))
 
 
 @app.route('/api/roadmap/items/<int:item_id>', methods=['DELETE'])
+@roadmap_write
 def delete_item(item_id):
     data = load_roadmap()
-    idx, existing = find_item(data['items'], item_id)
+    idx, existing = find_item(data, item_id)
     if existing is None:
         return jsonify({'error': f'Item {item_id} not found'}), 404
-    data['items'].pop(idx)
-    save_roadmap(data)
+    conflict = check_if_match(existing)
+    if conflict:
+        return conflict
+    remove_item(data, item_id)
+    save_roadmap(data, deleted=[item_id])
     return jsonify({'deleted': item_id})
 
 
 @app.route('/api/roadmap/items/<int:item_id>/status', methods=['PUT'])
+@roadmap_write
 def update_status(item_id):
     body = request.get_json(silent=True)
     if not body or 'status' not in body:
@@ -442,27 +1168,16 @@ def update_status(item_id):
         return jsonify({'error': f'Invalid status. Must be one of: {", ".join(VALID_STATUSES)}'}), 400
 
     data = load_roadmap()
-    idx, item = find_item(data['items'], item_id)
+    idx, item = find_item(data, item_id)
     if item is None:
         return jsonify({'error': f'Item {item_id} not found'}), 404
+    conflict = check_if_match(item)
+    if conflict:
+        return conflict
 
-    old_status = item['status']
-    item['status'] = new_status
-    apply_status_dates(item, new_status)
-    # Track status change in edit history
-    history = list(item.get('edit_history', []))
-    if old_status != new_status:
-        history.append({
-            'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
-            'field': 'status',
-            'old_value': old_status,
-            'new_value': new_status,
-            'edited_by': body.get('_edited_by', 'Zev'),
-        })
-    item['edit_history'] = history
-    data['items'][idx] = item
-    save_roadmap(data)
-    return jsonify(item)
+    set_item_status(item, new_status, body.get('_edited_by', 'Zev'))
+    save_roadmap(data, changed=[item])
+    return with_etag(jsonify(item), item_etag(item))
 
 
 # --- Backlog (Phase 2/3 stubs) ---
@@ -482,78 +1197,70 @@ def submit_backlog():
 
 @app.route('/api/roadmap/items/<int:item_id>/vote', methods=['POST'])
 @login_required
+@roadmap_write
 def vote_item(item_id):
-    """Vote on a roadmap item (upvote/downvote toggle)."""
+    """Vote on a roadmap item (upvote/downvote toggle).
+
+    Updates the item's vote map and tally in place and logs the click to the
+    vote log; votes are not recorded in edit history.
+    """
     body = request.get_json(silent=True)
     vote_type = (body or {}).get('vote', 'up')
     if vote_type not in ('up', 'down'):
         return jsonify({'error': 'vote must be "up" or "down"'}), 400
 
     data = load_roadmap()
-    idx, item = find_item(data['items'], item_id)
+    _, item = find_item(data, item_id)
     if item is None:
         return jsonify({'error': f'Item {item_id} not found'}), 404
+    conflict = check_if_match(item)
+    if conflict:
+        return conflict
 
-    votes = item.get('votes', [])
-    user_vote = next((v for v in votes if v.get('user_id') == current_user.id), None)
+    current_vote, delta = cast_vote(item, current_user.id, current_user.username, vote_type)
     now_ts = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    roadmap_votes().append(now_ts, item_id, current_user.id, current_vote, delta)
+    save_roadmap(data, changed=[item])
 
-    if user_vote:
-        if user_vote['vote'] == vote_type:
-            # Un-vote (toggle off)
-            votes = [v for v in votes if v.get('user_id') != current_user.id]
-        else:
-            # Change vote direction
-            user_vote['vote'] = vote_type
-    else:
-        votes.append({
-            'user_id': current_user.id,
-            'username': current_user.username,
-            'vote': vote_type,
-            'timestamp': now_ts,
-        })
-
-    item['votes'] = votes
-    item['vote_count'] = sum(1 if v['vote'] == 'up' else -1 for v in votes)
-
-    # Track in edit history
-    history = list(item.get('edit_history', []))
-    history.append({
-        'timestamp': now_ts,
-        'field': 'votes',
-        'old_value': None,
-        'new_value': f'{current_user.username} voted {vote_type}',
-        'edited_by': current_user.username,
-    })
-    item['edit_history'] = history
-    data['items'][idx] = item
-    save_roadmap(data)
-
-    current_vote = next(
-        (v['vote'] for v in item['votes'] if v.get('user_id') == current_user.id),
-        None,
-    )
-    return jsonify({
+    return with_etag(jsonify({
         'success': True,
         'vote_count': item['vote_count'],
         'user_vote': current_vote,
-    })
+    }), item_etag(item))
 
 
 # --- Comments ---
 
+COMMENTS_PAGE_SIZE = 20
+
+
 @app.route('/api/roadmap/items/<int:item_id>/comments', methods=['GET'])
-def get_comments(item_id):
-    """Get comments for a roadmap item (public read)."""
-    data = load_roadmap()
-    _, item = find_item(data['items'], item_id)
+def get_comments_page(item_id):
+    """Comments on a roadmap item, newest first (public read).
+
+    ?limit= (default 20), ?before= the id of the oldest comment already shown.
+    `next_before` is null on the last page.
+    """
+    limit = request.args.get('limit', COMMENTS_PAGE_SIZE, type=int)
+    before = request.args.get('before', type=int)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    if 'before' in request.args and before is None:
+        return jsonify({'error': 'before must be a comment id'}), 400
+    item = roadmap_store().get_item(item_id)
     if item is None:
         return jsonify({'error': f'Item {item_id} not found'}), 404
-    return jsonify({'comments': item.get('comments', [])})
+    total, comments, more = roadmap_comments().page(item, limit, before)
+    return jsonify({
+        'comments': comments,
+        'total': total,
+        'next_before': comments[-1]['id'] if more else None,
+    })
 
 
 @app.route('/api/roadmap/items/<int:item_id>/comments', methods=['POST'])
 @login_required
+@roadmap_write
 def add_comment(item_id):
     """Add a comment to a roadmap item."""
     body = request.get_json(silent=True)
@@ -566,52 +1273,45 @@ def add_comment(item_id):
         return jsonify({'error': 'Comment too long (max 5000 chars)'}), 400
 
     data = load_roadmap()
-    idx, item = find_item(data['items'], item_id)
+    _, item = find_item(data, item_id)
     if item is None:
         return jsonify({'error': f'Item {item_id} not found'}), 404
+    conflict = check_if_match(item)
+    if conflict:
+        return conflict
 
-    comments = item.get('comments', [])
-    comment_id = max((c.get('id', 0) for c in comments), default=0) + 1
     now_ts = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-
-    new_comment = {
-        'id': comment_id,
+    new_comment = roadmap_comments().add(item, {
         'user_id': current_user.id,
         'username': current_user.username,
         'comment': comment_text,
         'timestamp': now_ts,
         'replies': [],
-    }
-    comments.append(new_comment)
-    item['comments'] = comments
+    })
 
     # Track in edit history
-    history = list(item.get('edit_history', []))
-    history.append({
-        'timestamp': now_ts,
-        'field': 'comments',
-        'old_value': None,
-        'new_value': f'{current_user.username} added comment',
-        'edited_by': current_user.username,
-    })
-    item['edit_history'] = history
-    data['items'][idx] = item
-    save_roadmap(data)
+    record_history(item, [history_entry('comments', None, f'{current_user.username} added comment',
+                                        current_user.username, now_ts)])
+    save_roadmap(data, changed=[item])
 
-    return jsonify({'success': True, 'comment': new_comment}), 201
+    return with_etag(jsonify({'success': True, 'comment': new_comment}), item_etag(item)), 201
 
 
 @app.route('/api/roadmap/items/<int:item_id>/comments/<int:comment_id>', methods=['PUT', 'DELETE'])
 @login_required
+@roadmap_write
 def manage_comment(item_id, comment_id):
     """Edit or delete a comment."""
     data = load_roadmap()
-    idx, item = find_item(data['items'], item_id)
+    _, item = find_item(data, item_id)
     if item is None:
         return jsonify({'error': f'Item {item_id} not found'}), 404
+    conflict = check_if_match(item)
+    if conflict:
+        return conflict
 
-    comments = item.get('comments', [])
-    comment = next((c for c in comments if c.get('id') == comment_id), None)
+    comments = roadmap_comments()
+    comment = comments.get(item, comment_id)
     if comment is None:
         return jsonify({'error': f'Comment {comment_id} not found'}), 404
 
@@ -620,6 +1320,7 @@ def manage_comment(item_id, comment_id):
         return jsonify({'error': 'Permission denied'}), 403
 
     now_ts = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    inline = 'comments' in item  # Moved out of the document by this write
 
     if request.method == 'PUT':
         body = request.get_json(silent=True)
@@ -628,18 +1329,20 @@ def manage_comment(item_id, comment_id):
             return jsonify({'error': 'Comment text required'}), 400
         if len(new_text) > 5000:
             return jsonify({'error': 'Comment too long (max 5000 chars)'}), 400
-        comment['comment'] = new_text
-        comment['edited'] = True
-        comment['edited_at'] = now_ts
-        data['items'][idx] = item
-        save_roadmap(data)
-        return jsonify({'success': True, 'comment': comment})
+        comment = comments.update(item, comment_id, comment=new_text, edited=True, edited_at=now_ts)
+        if inline:
+            save_roadmap(data, changed=[item])
+        else:
+            # Only the comment file changed: re-index its text and commit it
+            roadmap_index(data).record_changes([item], [])
+            if Config.GIT_AUTO_COMMIT:
+                git_queue.notify([item_id])
+        return with_etag(jsonify({'success': True, 'comment': comment}), item_etag(item))
 
     # DELETE
-    item['comments'] = [c for c in comments if c.get('id') != comment_id]
-    data['items'][idx] = item
-    save_roadmap(data)
-    return jsonify({'success': True})
+    comments.delete(item, comment_id)
+    save_roadmap(data, changed=[item])
+    return with_etag(jsonify({'success': True}), item_etag(item))
 
 
 # --- Error handlers (always return JSON for API clients) ---
@@ -722,4 +1425,8 @@ def server_error(e):
 
 
 if __name__ == '__main__':
+    import signal
+    import sys
+    # systemd stops us with SIGTERM; exit normally so atexit flushes the git queue
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
     app.run(debug=Config.DEBUG, host='0.0.0.0', port=Config.PORT)
@@ -0,0 +1,118 @@
+"""Recent roadmap mutations by revision — the source for delta sync and live updates."""
+
+import threading
+from collections import deque
+
+from storage import encode_compact
+
+
+class ChangeLog:
+    """The last `capacity` saves as (revision, changed ids, deleted ids, event).
+
+    Answers "what changed since revision N" for any N >= `floor`. The log only
+    knows about saves made through record(); when the store reloads the document
+    from disk (another process, a hand edit, a restart) the log is reset and
+    `floor` moves up to the reloaded revision, so older clients get a snapshot.
+
+    Each save also becomes a compact JSON event for the live stream, carrying
+    only the fields that changed. Changes are found by comparing each field's
+    encoding with the one remembered from the item's previous event; an item's
+    first event after a reset carries all of its fields.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.floor = None
+        self.generation = None
+        self._entries = deque()
+        self._fingerprints = {}
+        self._cond = threading.Condition()
+
+    def _reset(self, revision, generation):
+        moved = self.floor != revision
+        self._entries.clear()
+        self._fingerprints.clear()
+        self.floor = revision
+        self.generation = generation
+        if moved:  # Waiters behind the new floor must resync
+            self._cond.notify_all()
+
+    def sync(self, revision, generation):
+        """Align with the store before answering; a generation we didn't record resets the log."""
+        with self._cond:
+            if generation != self.generation:
+                self._reset(revision, generation)
+
+    def _changed_fields(self, item):
+        old = self._fingerprints.get(item['id'], {})
+        new = {field: encode_compact(value) for field, value in item.items()}
+        self._fingerprints[item['id']] = new
+        return {field: item[field] for field, encoded in new.items() if old.get(field) != encoded}
+
+    def record(self, revision, changed, deleted_ids, before, after, metadata=None):
+        """Log one save of the `changed` items and `deleted_ids`.
+
+        `before` / `after` are the store generations around the save.
+        """
+        with self._cond:
+            if before != self.generation:
+                self._reset(revision - 1, before)
+            for item_id in deleted_ids:
+                self._fingerprints.pop(item_id, None)
+            event = {
+                'revision': revision,
+                'changed': [{'id': item['id'], 'fields': self._changed_fields(item)} for item in changed],
+                'deleted': list(deleted_ids),
+                'metadata': metadata,
+            }
+            self._entries.append((
+                revision,
+                tuple(item['id'] for item in changed),
+                tuple(deleted_ids),
+                encode_compact(event).decode('utf-8'),
+            ))
+            self.generation = after
+            while len(self._entries) > self.capacity:
+                self.floor = self._entries.popleft()[0]
+            self._cond.notify_all()
+
+    def _tail(self, revision):
+        """Entries after `revision`, oldest first."""
+        tail = []
+        for entry in reversed(self._entries):
+            if entry[0] <= revision:
+                break
+            tail.append(entry)
+        tail.reverse()
+        return tail
+
+    def _behind(self, revision):
+        return self.floor is None or revision < self.floor
+
+    def since(self, revision):
+        """Return ({id: revision} changed, {id: revision} deleted) after `revision`,
+        or None if the log cannot answer that far back."""
+        with self._cond:
+            if self._behind(revision):
+                return None
+            changed, deleted = {}, {}
+            for rev, changed_ids, deleted_ids, _ in self._tail(revision):
+                for item_id in changed_ids:
+                    changed[item_id] = rev
+                    deleted.pop(item_id, None)
+                for item_id in deleted_ids:
+                    deleted[item_id] = rev
+                    changed.pop(item_id, None)
+            return changed, deleted
+
+    def wait(self, revision, timeout):
+        """Block up to `timeout` seconds for saves after `revision`.
+
+        Returns [(revision, event json)] (empty on timeout), or None if the log
+        cannot answer that far back and the client must resync.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._behind(revision) or self._tail(revision), timeout)
+            if self._behind(revision):
+                return None
+            return [(rev, event) for rev, _, _, event in self._tail(revision)]
@@ -0,0 +1,142 @@
+"""Per-item comment files with an in-memory (item id, comment id) index."""
+
+import os
+import threading
+from itertools import islice
+
+from storage import export_json, read_json
+
+
+class CommentStore:
+    """comments/<item id>.json next to roadmap.json: one item's comments as a
+    JSON list, oldest first.
+
+    Each file is indexed in memory as {comment id: comment} (insertion order =
+    id order, so the next id is the last one + 1) and re-read only when its
+    stat changes, so lookups, id allocation and newest-first pages don't scan. A comment write rewrites just that one
+    file; the roadmap document keeps only the item's `comment_count`.
+
+    Items still holding an inline `comments` list (documents written before
+    the split) are served from it until their next comment write moves it here,
+    or `manage.py split-comments` moves them all.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._cache = {}  # item id -> (file key, {comment id: comment})
+
+    @property
+    def paths(self):
+        """Files to stage when auto-committing to git."""
+        return [self.directory]
+
+    def _path(self, item_id):
+        return os.path.join(self.directory, f'{item_id}.json')
+
+    def _index(self, item_id):
+        path = self._path(item_id)
+        try:
+            st = os.stat(path)
+            key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            key = None
+        cached = self._cache.get(item_id)
+        if cached is None or cached[0] != key:
+            comments = {c['id']: c for c in read_json(path)} if key else {}
+            cached = self._cache[item_id] = (key, comments)
+        return cached[1]
+
+    def _comments(self, item):
+        if 'comments' in item:  # Not moved out of the document yet
+            return {c['id']: c for c in item['comments'] if 'id' in c}
+        with self._lock:
+            return self._index(item['id'])
+
+    def _write(self, item_id, comments):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(item_id)
+        export_json(list(comments.values()), path)
+        st = os.stat(path)
+        self._cache[item_id] = ((st.st_ino, st.st_mtime_ns, st.st_size), comments)
+
+    def _adopt(self, item):
+        """The item's comment index, moving an inline list out of the document first."""
+        legacy = item.pop('comments', None)
+        if legacy is not None:
+            legacy = sorted((c for c in legacy if 'id' in c), key=lambda c: c['id'])
+            self._write(item['id'], {c['id']: c for c in legacy})
+        comments = self._index(item['id'])
+        item['comment_count'] = len(comments)
+        return comments
+
+    def split(self, item):
+        """Move an item's inline `comments` list (if any) into its file."""
+        with self._lock:
+            self._adopt(item)
+
+    # --- Reads ---
+
+    def all(self, item):
+        """Every comment on the item, oldest first."""
+        return list(self._comments(item).values())
+
+    def get(self, item, comment_id):
+        return self._comments(item).get(comment_id)
+
+    def page(self, item, limit, before=None):
+        """Return (total, comments newest first, more) for comment ids < `before`."""
+        comments = self._comments(item)
+        newer_first = (cid for cid in reversed(comments) if before is None or cid < before)
+        ids = list(islice(newer_first, limit + 1))
+        return len(comments), [comments[cid] for cid in ids[:limit]], len(ids) > limit
+
+    # --- Writes (the caller saves the item when comment_count changes) ---
+
+    def add(self, item, comment):
+        """Store `comment` under the item's next comment id and return it."""
+        with self._lock:
+            comments = self._adopt(item)
+            next_id = next(reversed(comments), 0) + 1
+            comment = {'id': next_id, **comment}
+            comments = {**comments, next_id: comment}
+            self._write(item['id'], comments)
+            item['comment_count'] = len(comments)
+            return comment
+
+    def update(self, item, comment_id, **fields):
+        with self._lock:
+            comments = self._adopt(item)
+            comment = {**comments[comment_id], **fields}
+            self._write(item['id'], {**comments, comment_id: comment})
+            return comment
+
+    def delete(self, item, comment_id):
+        with self._lock:
+            comments = self._adopt(item)
+            comments = {cid: c for cid, c in comments.items() if cid != comment_id}
+            self._write(item['id'], comments)
+            item['comment_count'] = len(comments)
+
+    def drop(self, item_id):
+        """Remove an item's comments (the item was deleted)."""
+        with self._lock:
+            self._cache.pop(item_id, None)
+            try:
+                os.remove(self._path(item_id))
+            except FileNotFoundError:
+                pass
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_comments(path):
+    """Return the shared CommentStore for the roadmap at `path`."""
+    directory = os.path.join(os.path.dirname(os.path.abspath(path)), 'comments')
+    with _stores_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = _stores[directory] = CommentStore(directory)
+        return store
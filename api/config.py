@@ -12,7 +12,38 @@ class Config:
     ROADMAP_API_KEY = os.getenv('ROADMAP_API_KEY')
     DATA_DIR = os.getenv('DATA_DIR', os.path.join(os.path.dirname(__file__), '..', 'data'))
     ROADMAP_FILE = os.path.join(DATA_DIR, 'roadmap.json')
+    # Serve reads from the parsed roadmap kept in memory (re-read when the file changes)
+    ROADMAP_CACHE = os.getenv('ROADMAP_CACHE', 'true').lower() == 'true'
+    # Storage backend: 'json' rewrites roadmap.json on every change, 'oplog' appends to
+    # roadmap.oplog, 'sqlite' keeps indexed tables in roadmap.db (exported to roadmap.json for git),
+    # 'sharded' writes one file per item under data/items/
+    ROADMAP_STORAGE = os.getenv('ROADMAP_STORAGE', 'json').lower()
+    OPLOG_COMPACT_EVERY = int(os.getenv('OPLOG_COMPACT_EVERY', 1000))
+    # Group commit: saves arriving within this many milliseconds of each other are written
+    # together (sooner once MAX_BATCH are waiting); each request returns after that write.
+    # 0 writes every save on its own.
+    GROUP_COMMIT_WINDOW_MS = float(os.getenv('GROUP_COMMIT_WINDOW_MS', 5))
+    GROUP_COMMIT_MAX_BATCH = int(os.getenv('GROUP_COMMIT_MAX_BATCH', 64))
+    # Saves remembered for GET /api/roadmap/changes; clients further behind get a full snapshot
+    CHANGES_LOG_SIZE = int(os.getenv('CHANGES_LOG_SIZE', 1000))
+    # Time travel (GET /api/roadmap?as_of=): a full checkpoint every N saves bounds the replay
+    # behind any past read; the last TIMELINE_CACHE_SIZE rebuilt states are kept in memory
+    TIMELINE_CHECKPOINT_EVERY = int(os.getenv('TIMELINE_CHECKPOINT_EVERY', 100))
+    TIMELINE_CACHE_SIZE = int(os.getenv('TIMELINE_CACHE_SIZE', 16))
+    # Checkpoints (with the saves logged after each) kept on disk; older ones are pruned. 0 = all
+    TIMELINE_KEEP_CHECKPOINTS = int(os.getenv('TIMELINE_KEEP_CHECKPOINTS', 200))
+    # Live updates (GET /api/roadmap/stream): heartbeat interval, and how long one stream
+    # lasts before the browser reconnects (freeing the server thread), both in seconds
+    STREAM_HEARTBEAT = float(os.getenv('STREAM_HEARTBEAT', 15))
+    STREAM_MAX_SECONDS = float(os.getenv('STREAM_MAX_SECONDS', 300))
+    STREAM_RETRY_MS = int(os.getenv('STREAM_RETRY_MS', 2000))
+    # On-disk JSON encoding: 'compact' (no whitespace), 'orjson' (compact via orjson when
+    # installed) or 'pretty' (indent=2). Use `manage.py pretty` for a human-readable copy.
+    ROADMAP_JSON = os.getenv('ROADMAP_JSON', 'compact').lower()
     GIT_AUTO_COMMIT = os.getenv('GIT_AUTO_COMMIT', 'true').lower() == 'true'
+    # Auto-commits are batched: at most one per window, sooner once this many saves are pending
+    GIT_COMMIT_WINDOW = float(os.getenv('GIT_COMMIT_WINDOW', 30))
+    GIT_COMMIT_MAX_CHANGES = int(os.getenv('GIT_COMMIT_MAX_CHANGES', 50))
     DEBUG = os.getenv('FLASK_DEBUG', 'false').lower() == 'true'
     PORT = int(os.getenv('PORT', 5000))
 
@@ -0,0 +1,69 @@
+"""Streamed CSV / NDJSON bodies for GET /api/roadmap/export."""
+
+import csv
+import io
+
+from storage import encode_compact
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# CSV columns when ?fields= isn't given: one flat value per cell (scores as numbers,
+# dates as stored, blank when unset). Nested fields (votes, voter_names, n8n_workflows,
+# last_edit) can still be asked for by name and come out as JSON text.
+CSV_COLUMNS = [
+    'id', 'name', 'category', 'status', 'owner', 'phase',
+    'impact_score', 'ease_score', 'priority_score', 'vote_count', 'comment_count',
+    'build_time', 'dependencies', 'added_date', 'start_date', 'expected_delivery', 'completed_date',
+    'description', 'business_impact', 'outcome', 'success_metric',
+]
+ROWS_PER_CHUNK = 200
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def csv_columns(fields=None, exclude=None):
+    """Header for a CSV export: `fields` as asked (id first), else CSV_COLUMNS less `exclude`."""
+    if fields:
+        return ['id'] + [f for f in fields if f != 'id']
+    drop = set(exclude or ()) - {'id'}
+    return [c for c in CSV_COLUMNS if c not in drop]
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return encode_compact(value).decode('utf-8')
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value  # Spreadsheets would run it as a formula
+    return value
+
+
+def csv_chunks(items, columns):
+    """CSV text for `items` (any iterable), ROWS_PER_CHUNK rows per yielded chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    rows = 0
+    for item in items:
+        writer.writerow([_cell(item.get(column)) for column in columns])
+        rows += 1
+        if rows % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_chunks(items):
+    """One compact JSON object per line, ROWS_PER_CHUNK lines per yielded chunk."""
+    lines = []
+    for item in items:
+        lines.append(encode_compact(item))
+        if len(lines) == ROWS_PER_CHUNK:
+            yield b'\n'.join(lines) + b'\n'
+            lines = []
+    if lines:
+        yield b'\n'.join(lines) + b'\n'
@@ -0,0 +1,90 @@
+"""Background git auto-commit — batches roadmap saves into periodic commits."""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class GitCommitQueue:
+    """Collects "roadmap changed" notifications and commits them off the request path.
+
+    notify() only records the changed item ids. A daemon thread commits at most
+    once per `window` seconds, or as soon as `max_changes` notifications are
+    pending, by calling `commit(item_ids)`. flush() commits synchronously and is
+    registered to run at interpreter exit so pending changes are not lost on a
+    clean shutdown.
+    """
+
+    def __init__(self, commit, window=30.0, max_changes=50):
+        self.commit = commit
+        self.window = window
+        self.max_changes = max_changes
+        self.commits = 0
+        self.failures = 0
+        self.last_commit_at = None
+        self.last_commit_ms = None
+        self._cond = threading.Condition()
+        self._commit_lock = threading.Lock()
+        self._pending = 0
+        self._item_ids = set()
+        self._first_pending_at = None
+        self._thread = None
+
+    def notify(self, item_ids=()):
+        with self._cond:
+            if self._pending == 0:
+                self._first_pending_at = time.monotonic()
+            self._pending += 1
+            self._item_ids.update(item_ids)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='git-commit-queue', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _due_in(self):
+        """Seconds until pending changes should be committed (0 = now, None = idle)."""
+        if self._pending == 0:
+            return None
+        if self._pending >= self.max_changes:
+            return 0
+        return max(0.0, self._first_pending_at + self.window - time.monotonic())
+
+    def _run(self):
+        while True:
+            with self._cond:
+                due = self._due_in()
+                while due is None or due > 0:
+                    self._cond.wait(timeout=due)
+                    due = self._due_in()
+            self.flush()
+
+    def flush(self):
+        """Commit everything pending now. Returns True if a commit was attempted."""
+        with self._commit_lock:
+            with self._cond:
+                if self._pending == 0:
+                    return False
+                item_ids = sorted(self._item_ids)
+                self._pending = 0
+                self._item_ids = set()
+                self._first_pending_at = None
+            start = time.perf_counter()
+            try:
+                self.commit(item_ids)
+                self.commits += 1
+            except Exception:
+                self.failures += 1
+            self.last_commit_ms = round((time.perf_counter() - start) * 1000, 1)
+            self.last_commit_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+            return True
+
+    def stats(self):
+        with self._cond:
+            return {
+                'queue_depth': self._pending,
+                'pending_items': len(self._item_ids),
+                'commits': self.commits,
+                'failures': self.failures,
+                'last_commit_ms': self.last_commit_ms,
+                'last_commit_at': self.last_commit_at,
+            }
@@ -0,0 +1,259 @@
+"""Dependency graph over items, parsed from their free-text `dependencies` field."""
+
+import re
+import threading
+from collections import deque
+
+REF_RE = re.compile(r'#(\d+)')
+DURATION_RE = re.compile(
+    r'(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\s*(h|hrs?|hours?|m|mins?|minutes?)\b', re.I)
+
+
+def parse_refs(item):
+    """Ids the item depends on: every `#<id>` in its dependencies text, in order,
+    without repeats or a reference to itself."""
+    text = item.get('dependencies')
+    if not isinstance(text, str):
+        return ()
+    refs = dict.fromkeys(int(m) for m in REF_RE.findall(text))
+    refs.pop(item['id'], None)
+    return tuple(refs)
+
+
+def build_hours(text):
+    """Hours for a build_time like '3-4 hrs' or '45 minutes' (a range counts
+    as its midpoint); 0.0 when there is none or it can't be read."""
+    m = DURATION_RE.search(text) if isinstance(text, str) else None
+    if m is None:
+        return 0.0
+    low = float(m.group(1))
+    high = float(m.group(2)) if m.group(2) else low
+    hours = (low + high) / 2
+    return hours / 60 if m.group(3).lower().startswith('m') else hours
+
+
+class DependencyGraph:
+    """Item id -> blocker ids (parsed with parse_refs) and the reverse edges.
+
+    An item is blocked while any blocker that exists is not DONE; the count
+    of such open blockers is kept per item, so blocked() reads a maintained
+    set rather than recomputing it. References to ids with no
+    item are kept as edges (the item may be created later) and reported as
+    unknown.
+
+    Like QueryIndex it remembers what it recorded per item, so update() and
+    remove() touch only that item and its direct dependents. Cycles and the
+    build_time-weighted longest chains are computed on first use after a
+    change and cached.
+    """
+
+    def __init__(self, items):
+        self._lock = threading.Lock()
+        self._entries = {}     # id -> (blocker ids, done, hours)
+        self.dependents = {}   # id -> ids that list it as a blocker
+        self._open = {}        # id -> number of existing blockers not DONE
+        self._blocked = set()
+        self._cycles = None
+        self._chains = None
+        for item in items:
+            self._add(item['id'], self._entry(item))
+
+    @staticmethod
+    def _entry(item):
+        return (parse_refs(item), item.get('status') == 'DONE', build_hours(item.get('build_time')))
+
+    def _set_open(self, item_id, count):
+        self._open[item_id] = count
+        if count:
+            self._blocked.add(item_id)
+        else:
+            self._blocked.discard(item_id)
+
+    def _add(self, item_id, entry):
+        refs, done, _ = entry
+        self._entries[item_id] = entry
+        for ref in refs:
+            self.dependents.setdefault(ref, set()).add(item_id)
+        self._set_open(item_id, sum(1 for ref in refs
+                                    if ref in self._entries and not self._entries[ref][1]))
+        if not done:
+            for dependent in self.dependents.get(item_id, ()):
+                self._set_open(dependent, self._open[dependent] + 1)
+
+    def _discard(self, item_id):
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return
+        refs, done, _ = entry
+        if not done:
+            for dependent in self.dependents.get(item_id, ()):
+                self._set_open(dependent, self._open[dependent] - 1)
+        for ref in refs:
+            ids = self.dependents[ref]
+            ids.discard(item_id)
+            if not ids:
+                del self.dependents[ref]
+        self._set_open(item_id, 0)
+        del self._open[item_id]
+
+    def update(self, item):
+        entry = self._entry(item)
+        with self._lock:
+            old = self._entries.get(item['id'])
+            if old == entry:
+                return
+            self._discard(item['id'])
+            self._add(item['id'], entry)
+            if old is None or old[0] != entry[0]:
+                self._cycles = None
+            self._chains = None
+
+    def remove(self, item_id):
+        with self._lock:
+            if item_id in self._entries:
+                self._discard(item_id)
+                self._cycles = self._chains = None
+
+    # --- Lookups ---
+
+    def __contains__(self, item_id):
+        return item_id in self._entries
+
+    def blockers(self, item_id):
+        """(existing blocker ids, unknown ids) listed by the item, in text order."""
+        refs = self._entries[item_id][0]
+        return ([r for r in refs if r in self._entries], [r for r in refs if r not in self._entries])
+
+    def open_blockers(self, item_id):
+        return self._open.get(item_id, 0)
+
+    def blocked(self):
+        """Ids of items with at least one open blocker."""
+        with self._lock:
+            return set(self._blocked)
+
+    def walk(self, item_id, reverse=False, transitive=True):
+        """[(id, depth)] of the item's blockers (or its dependents with `reverse`),
+        nearest first; only depth 1 unless `transitive`. Stops at cycles."""
+        with self._lock:
+            seen = {item_id}
+            found = []
+            queue = deque([(item_id, 0)])
+            while queue:
+                current, depth = queue.popleft()
+                if depth and not transitive:
+                    break
+                edges = (self.dependents.get(current, ()) if reverse
+                         else self._entries[current][0])
+                for nxt in sorted(edges):
+                    if nxt in seen or nxt not in self._entries:
+                        continue
+                    seen.add(nxt)
+                    found.append((nxt, depth + 1))
+                    queue.append((nxt, depth + 1))
+            return found
+
+    def cycles(self):
+        """Groups of items that (transitively) depend on each other, as sorted id lists."""
+        with self._lock:
+            return self._cycle_groups()
+
+    def _cycle_groups(self):
+        if self._cycles is None:
+            self._cycles = self._strongly_connected()
+        return self._cycles
+
+    def _strongly_connected(self):
+        """Tarjan's algorithm, iterative; components with more than one item."""
+        index, low, on_stack, stack, found = {}, {}, set(), [], []
+        counter = 0
+        for root in self._entries:
+            if root in index:
+                continue
+            work = [(root, iter(self._entries[root][0]))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, edges = work[-1]
+                for nxt in edges:
+                    if nxt not in self._entries:
+                        continue
+                    if nxt not in index:
+                        index[nxt] = low[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack.add(nxt)
+                        work.append((nxt, iter(self._entries[nxt][0])))
+                        break
+                    if nxt in on_stack:
+                        low[node] = min(low[node], index[nxt])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1:
+                            found.append(sorted(component))
+        found.sort()
+        return found
+
+    def _chains_by_item(self):
+        """{id: (hours, previous id, length)}: the heaviest chain of blockers ending at each
+        item. Items count their build_time hours unless DONE; edges inside a
+        cycle are ignored so every chain is finite."""
+        if self._chains is None:
+            cycle_of = {}
+            for n, component in enumerate(self._cycle_groups()):
+                for member in component:
+                    cycle_of[member] = n
+            chains = {}
+            for root in self._entries:
+                if root in chains:
+                    continue
+                work = [root]
+                while work:
+                    node = work[-1]
+                    refs = [r for r in self._entries[node][0] if r in self._entries
+                            and not (node in cycle_of and cycle_of.get(r) == cycle_of[node])]
+                    pending = [r for r in refs if r not in chains]
+                    if pending:
+                        work.extend(pending)
+                        continue
+                    work.pop()
+                    if node in chains:
+                        continue
+                    best, prev = (0.0, 0), None
+                    for r in refs:
+                        if prev is None or chains[r][::2] > best:
+                            best, prev = chains[r][::2], r
+                    entry = self._entries[node]
+                    chains[node] = (best[0] + (0.0 if entry[1] else entry[2]), prev, best[1] + 1)
+            self._chains = chains
+        return self._chains
+
+    def critical_path(self, item_id=None):
+        """(hours, [ids]) of the heaviest dependency chain, first prerequisite
+        first: the one ending at `item_id`, or the heaviest on the board (the
+        longest of equally heavy ones)."""
+        with self._lock:
+            chains = self._chains_by_item()
+            if item_id is None:
+                if not chains:
+                    return 0.0, []
+                item_id = max(chains, key=lambda i: (chains[i][0], chains[i][2], -i))
+            hours, path = chains[item_id][0], []
+            while item_id is not None:
+                path.append(item_id)
+                item_id = chains[item_id][1]
+            path.reverse()
+            return round(hours, 2), path
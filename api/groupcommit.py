@@ -0,0 +1,168 @@
+"""Group commit — coalesces roadmap saves that arrive close together into one write."""
+
+import threading
+import time
+from bisect import bisect_left
+
+BATCH_SIZE_BOUNDS = (1, 2, 4, 8, 16, 32, 64, 128)
+FLUSH_MS_BOUNDS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class BatchDiscarded(RuntimeError):
+    """The pending batch was dropped, unwritten, along with the cached document it was applied to."""
+
+
+class Histogram:
+    """Observation counts per bucket: one bucket per upper bound, plus one above them all."""
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = value if self.max is None else max(self.max, value)
+
+    def stats(self):
+        buckets = {f'<={bound:g}': n for bound, n in zip(self.bounds, self.counts)}
+        buckets[f'>{self.bounds[-1]:g}'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else None,
+            'max': round(self.max, 3) if self.max is not None else None,
+            'buckets': buckets,
+        }
+
+
+class WriteBatch:
+    """The saves waiting for one flush, merged into a single (changed, deleted) write.
+
+    `changed` keeps the latest state per item id; a delete drops the item's
+    pending put. A save with neither changed items nor deleted ids asks for
+    the whole document to be written, and so does the batch.
+    """
+
+    def __init__(self):
+        self.changed = {}
+        self.deleted = set()
+        self.full = False
+        self.saves = 0
+        self.opened_at = time.monotonic()
+        self.error = None
+        self._done = threading.Event()
+
+    def add(self, changed, deleted):
+        self.saves += 1
+        if not changed and not deleted:
+            self.full = True
+        for item_id in deleted:
+            self.changed.pop(item_id, None)
+            self.deleted.add(item_id)
+        for item in changed:
+            self.changed[item['id']] = item
+
+    def conflicts(self, changed):
+        """True if `changed` re-creates an id this batch deletes; backends apply
+        a write's puts and deletes in their own order, so that needs its own write."""
+        return any(item['id'] in self.deleted for item in changed)
+
+    def finish(self, error=None):
+        self.error = error
+        self._done.set()
+
+    def wait(self):
+        """Block until the batch is flushed; re-raise the flush's error, if any."""
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+
+
+class GroupCommit:
+    """Schedules flushes of the pending WriteBatch.
+
+    Saves join the open batch; a daemon thread calls `flush()` once the batch
+    has been open `window` seconds, or as soon as it holds `max_batch` saves.
+    Each save's request waits on its batch, so it is acknowledged only after
+    the shared write is on disk. Batch sizes and flush latencies are kept as
+    histograms for /api/health.
+    """
+
+    def __init__(self, flush, window=0.005, max_batch=64):
+        self.flush = flush
+        self.window = window
+        self.max_batch = max_batch
+        self.flushes = 0
+        self.failures = 0
+        self.batch_sizes = Histogram(BATCH_SIZE_BOUNDS)
+        self.flush_ms = Histogram(FLUSH_MS_BOUNDS)
+        self.pending = None
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def add(self, changed, deleted):
+        """Add a save to the open batch (the caller holds the store's write lock)."""
+        with self._cond:
+            if self.pending is None:
+                self.pending = WriteBatch()
+            batch = self.pending
+            batch.add(changed, deleted)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return batch
+
+    def take(self):
+        """Close the open batch and return it (None if there is none)."""
+        with self._cond:
+            batch, self.pending = self.pending, None
+            return batch
+
+    def discard(self, reason):
+        """Close the open batch without writing it; its requests get BatchDiscarded."""
+        batch = self.take()
+        if batch is not None:
+            self.record(batch, 0.0, BatchDiscarded(reason))
+
+    def record(self, batch, seconds, error=None):
+        with self._cond:
+            self.flushes += 1
+            if error is not None:
+                self.failures += 1
+            self.batch_sizes.observe(batch.saves)
+            self.flush_ms.observe(seconds * 1000)
+        batch.finish(error)
+
+    def _due_in(self):
+        """Seconds until the open batch should be flushed (0 = now, None = idle)."""
+        if self.pending is None:
+            return None
+        if self.pending.saves >= self.max_batch:
+            return 0
+        return max(0.0, self.pending.opened_at + self.window - time.monotonic())
+
+    def _run(self):
+        while True:
+            with self._cond:
+                due = self._due_in()
+                while due is None or due > 0:
+                    self._cond.wait(timeout=due)
+                    due = self._due_in()
+            self.flush()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'window_ms': self.window * 1000,
+                'max_batch': self.max_batch,
+                'flushes': self.flushes,
+                'failures': self.failures,
+                'pending': self.pending.saves if self.pending else 0,
+                'batch_size': self.batch_sizes.stats(),
+                'flush_ms': self.flush_ms.stats(),
+            }
@@ -0,0 +1,108 @@
+"""Per-item edit history, kept out of the roadmap document in append-only logs."""
+
+import os
+import threading
+
+from storage import decode, encode_compact
+
+
+class HistoryStore:
+    """history/<item id>.jsonl next to roadmap.json: one edit_history entry per
+    line, oldest first.
+
+    Items in the roadmap document carry only `history_count` and `last_edit`
+    (the newest entry), so the document every GET ships and every save writes
+    no longer grows with each edit. The full trail is read a page at a time.
+
+    An item still holding an inline `edit_history` list (documents written
+    before the split) is moved into its log on its next append(), or all at
+    once by `manage.py split-history`; until then page() serves the inline list.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    @property
+    def paths(self):
+        """Files to stage when auto-committing to git."""
+        return [self.directory]
+
+    def _path(self, item_id):
+        return os.path.join(self.directory, f'{item_id}.jsonl')
+
+    def read(self, item_id):
+        """Every entry in the item's log, oldest first."""
+        try:
+            f = open(self._path(item_id), 'rb')
+        except FileNotFoundError:
+            return []
+        entries = []
+        with f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Torn write from a crash; ignore the partial entry
+                try:
+                    entries.append(decode(line))
+                except ValueError:
+                    continue
+        return entries
+
+    def append(self, item, entries):
+        """Append `entries` to the item's log and update its history_count / last_edit."""
+        legacy = item.pop('edit_history', None)
+        entries = list(legacy or []) + list(entries)
+        if legacy is not None and 'history_count' not in item:
+            self.delete(item['id'])  # Any log left under a reused id is not this item's
+        if entries:
+            with self._lock:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(self._path(item['id']), 'ab') as f:
+                    f.write(b''.join(encode_compact(e) + b'\n' for e in entries))
+            item['last_edit'] = entries[-1]
+        item['history_count'] = item.get('history_count', 0) + len(entries)
+        item.setdefault('last_edit', None)
+
+    def reset(self, item, entries=()):
+        """Start a new item's log: ids freed by a delete may be reused."""
+        self.delete(item['id'])
+        item.pop('edit_history', None)
+        item['history_count'] = 0
+        item['last_edit'] = None
+        self.append(item, entries)
+
+    def delete(self, item_id):
+        try:
+            os.remove(self._path(item_id))
+        except FileNotFoundError:
+            pass
+
+    def page(self, item, limit, before=None, field=None):
+        """Return (total, entries, more) for `item`, entries newest first.
+
+        Entries carry `seq`, their 1-based position in the log; pass the last
+        one as `before` for the next page. `field` keeps only that field's entries
+        (and `total` counts only those). `more` says older entries remain.
+        """
+        entries = item['edit_history'] if 'edit_history' in item else self.read(item['id'])
+        numbered = [(seq, entry) for seq, entry in enumerate(entries, 1)
+                    if field is None or entry.get('field') == field]
+        total = len(numbered)
+        if before is not None:
+            numbered = [(seq, entry) for seq, entry in numbered if seq < before]
+        page = [dict(entry, seq=seq) for seq, entry in reversed(numbered[-limit:])]
+        return total, page, len(numbered) > limit
+
+
+_histories = {}
+_histories_lock = threading.Lock()
+
+
+def get_history(path):
+    """Return the shared HistoryStore for the roadmap at `path`."""
+    directory = os.path.join(os.path.dirname(os.path.abspath(path)), 'history')
+    with _histories_lock:
+        history = _histories.get(directory)
+        if history is None:
+            history = _histories[directory] = HistoryStore(directory)
+        return history
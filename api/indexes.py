@@ -0,0 +1,237 @@
+"""In-memory indexes over the cached roadmap document."""
+
+import threading
+from collections import Counter
+from itertools import islice
+
+from graph import DependencyGraph
+from query import ItemQuery, QueryIndex
+from search import SearchIndex
+from stats import GroupStats
+
+SCORE_FIELDS = ('impact_score', 'ease_score', 'priority_score')
+SCORE_BUCKETS = 10  # [0,1) [1,2) ... [9,10]
+
+
+class RoadmapIndex:
+    """Hash indexes over one roadmap document's item list.
+
+    Keeps id -> position and a running max id, so item lookup and id
+    allocation are O(1). Items must be added and removed through add() and
+    remove() for those to stay current; replacing an item in place at the same
+    position (data['items'][idx] = updated) needs no bookkeeping.
+
+    The derived indexes `counters` (RoadmapCounters), `search` (SearchIndex),
+    `queries` (QueryIndex), `graph` (DependencyGraph) and `stats` (GroupStats)
+    are built on first use; save_roadmap() passes each save's changed
+    and deleted items to record_changes() to keep them current. Comments live
+    outside the document, so `comment_source(item)` (CommentStore.all) supplies
+    their text to the search index.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.items = data['items']
+        self._rebuild()
+        self.comment_source = None
+        self._counters = None
+        self._search = None
+        self._queries = None
+        self._graph = None
+        self._stats = None
+
+    def _rebuild(self):
+        self.positions = {item['id']: i for i, item in enumerate(self.items)}
+        self._max_id = max(self.positions, default=0)
+
+    def is_current(self, data):
+        return self.data is data and self.items is data['items']
+
+    # --- Items ---
+
+    def find(self, item_id):
+        """Return (position, item), or (None, None) if there is no such item."""
+        idx = self.positions.get(item_id)
+        if idx is not None and idx < len(self.items) and self.items[idx]['id'] == item_id:
+            return idx, self.items[idx]
+        if idx is not None or len(self.positions) != len(self.items):
+            # The list was changed behind our back; fall back to a full rebuild
+            self._rebuild()
+            idx = self.positions.get(item_id)
+            if idx is not None:
+                return idx, self.items[idx]
+        return None, None
+
+    def get(self, item_id):
+        return self.find(item_id)[1]
+
+    def next_id(self):
+        if self._max_id is None:
+            self._max_id = max(self.positions, default=0)
+        return self._max_id + 1
+
+    def add(self, item):
+        self.positions[item['id']] = len(self.items)
+        self.items.append(item)
+        if self._max_id is not None:
+            self._max_id = max(self._max_id, item['id'])
+
+    def remove(self, item_id):
+        idx, item = self.find(item_id)
+        if item is None:
+            return None
+        self.items.pop(idx)
+        del self.positions[item_id]
+        for pos in range(idx, len(self.items)):
+            self.positions[self.items[pos]['id']] = pos
+        if item_id == self._max_id:
+            self._max_id = None  # Recomputed on the next next_id()
+        return item
+
+    def query(self, query=None, after=None, limit=None):
+        """Up to `limit` items matching ItemQuery `query`, past cursor key `after`.
+
+        Items come in query.sort order; without one, in board order, or in id
+        order when paginating.
+        """
+        query = query or ItemQuery()
+        ids = self.queries.select(query)
+        if query.blocked is not None:
+            blocked = self.graph.blocked()
+            if ids is None:
+                ids = set(blocked) if query.blocked else set(self.positions).difference(blocked)
+            else:
+                ids = ids & blocked if query.blocked else ids - blocked
+        if query.sort is None and after is None and limit is None:
+            if ids is None:
+                return list(self.items)
+            return [self.items[pos] for pos in sorted(self.positions[i] for i in ids)]
+        ordered = self.queries.ordered(query.sort or 'id', query.descending, ids, after)
+        return [self.get(item_id) for item_id in islice(ordered, limit)]
+
+    @property
+    def counters(self):
+        """RoadmapCounters over the items, built on first use."""
+        if self._counters is None:
+            self._counters = RoadmapCounters(self.items)
+        return self._counters
+
+    @property
+    def search(self):
+        """SearchIndex over the items, built on first use."""
+        if self._search is None:
+            self._search = SearchIndex(self.items, self.comment_source)
+        return self._search
+
+    @property
+    def queries(self):
+        """QueryIndex over the items, built on first use."""
+        if self._queries is None:
+            self._queries = QueryIndex(self.items)
+        return self._queries
+
+    @property
+    def graph(self):
+        """DependencyGraph over the items, built on first use."""
+        if self._graph is None:
+            self._graph = DependencyGraph(self.items)
+        return self._graph
+
+    @property
+    def stats(self):
+        """GroupStats over the items, built on first use."""
+        if self._stats is None:
+            self._stats = GroupStats(self.items)
+        return self._stats
+
+    def record_changes(self, changed, deleted):
+        """Update the derived indexes built so far. With neither argument (a save
+        that doesn't say what changed) they are dropped and rebuilt on next use."""
+        if not changed and not deleted:
+            self._counters = self._search = self._queries = self._graph = self._stats = None
+            return
+        for derived in (self._counters, self._search, self._queries, self._graph, self._stats):
+            if derived is None:
+                continue
+            for item in changed:
+                derived.update(item)
+            for item_id in deleted:
+                derived.remove(item_id)
+
+
+def _score_bucket(score):
+    if isinstance(score, bool) or not isinstance(score, (int, float)):
+        return None
+    return min(max(int(score), 0), SCORE_BUCKETS - 1)
+
+
+class RoadmapCounters:
+    """Per-category, per-status and per-owner counts plus score histograms.
+
+    Remembers what each item last contributed, so update() needs only the
+    item as it is now, not its previous values. Every mutation must be
+    reported through update() / remove() (save_roadmap() does this).
+    """
+
+    def __init__(self, items):
+        self.total = 0
+        self.by_category = Counter()
+        self.by_status = Counter()
+        self.by_owner = Counter()
+        self.histograms = {field: [0] * SCORE_BUCKETS for field in SCORE_FIELDS}
+        self._counted = {}
+        self._lock = threading.Lock()
+        for item in items:
+            self.update(item)
+
+    @staticmethod
+    def _key(item):
+        return (
+            item.get('category', 'Uncategorized'),
+            item.get('status'),
+            item.get('owner') or 'Unassigned',
+            tuple(_score_bucket(item.get(field)) for field in SCORE_FIELDS),
+        )
+
+    def _apply(self, key, delta):
+        category, status, owner, buckets = key
+        self.total += delta
+        for counter, value in ((self.by_category, category), (self.by_status, status),
+                               (self.by_owner, owner)):
+            counter[value] += delta
+            if not counter[value]:
+                del counter[value]
+        for field, bucket in zip(SCORE_FIELDS, buckets):
+            if bucket is not None:
+                self.histograms[field][bucket] += delta
+
+    def update(self, item):
+        key = self._key(item)
+        with self._lock:
+            old = self._counted.get(item['id'])
+            if old == key:
+                return
+            if old is not None:
+                self._apply(old, -1)
+            self._apply(key, 1)
+            self._counted[item['id']] = key
+
+    def remove(self, item_id):
+        with self._lock:
+            old = self._counted.pop(item_id, None)
+            if old is not None:
+                self._apply(old, -1)
+
+    def categories(self):
+        with self._lock:
+            return sorted(self.by_category)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'total_items': self.total,
+                'by_category': dict(self.by_category),
+                'by_status': dict(self.by_status),
+                'by_owner': dict(self.by_owner),
+                'score_histograms': {field: list(h) for field, h in self.histograms.items()},
+            }
@@ -0,0 +1,92 @@
+"""Maintenance commands for the roadmap data files.
+
+    python api/manage.py migrate --to sqlite     # roadmap.json -> roadmap.db
+    python api/manage.py migrate --to json       # roadmap.db   -> roadmap.json
+    python api/manage.py pretty                  # current roadmap, indented, to stdout
+    python api/manage.py pretty FILE [--out OUT] # pretty-print any JSON file (git textconv)
+    python api/manage.py split-history           # move inline edit_history lists to data/history/
+    python api/manage.py split-comments          # move inline comments lists to data/comments/
+"""
+
+import argparse
+import sys
+
+from comments import get_comments
+from config import Config
+from history import get_history
+from storage import STORAGE_BACKENDS, encode, get_store, migrate, read_json
+
+
+def cmd_migrate(args):
+    source = args.source or ('sqlite' if args.target == 'json' else 'json')
+    count = migrate(args.file, source, args.target)
+    print(f'Migrated {count} items from {source} to {args.target} ({args.file})')
+
+
+def cmd_pretty(args):
+    data = read_json(args.path) if args.path else get_store(args.file).load()
+    text = encode(data, 'pretty')
+    if args.out:
+        with open(args.out, 'wb') as f:
+            f.write(text + b'\n')
+    else:
+        sys.stdout.buffer.write(text + b'\n')
+
+
+def cmd_split_history(args):
+    store = get_store(args.file)
+    history = get_history(args.file)
+    with store.write_lock():
+        data = store.load()
+        moved = [item for item in data['items'] if 'edit_history' in item]
+        for item in moved:
+            history.append(item, [])
+        if moved:
+            store.save(data, changed=moved)
+    print(f'Moved edit history of {len(moved)} items to {history.directory}')
+
+
+def cmd_split_comments(args):
+    store = get_store(args.file)
+    comments = get_comments(args.file)
+    with store.write_lock():
+        data = store.load()
+        moved = [item for item in data['items']
+                 if 'comments' in item or 'comment_count' not in item]
+        for item in moved:
+            comments.split(item)
+        if moved:
+            store.save(data, changed=moved)
+    print(f'Moved comments of {len(moved)} items to {comments.directory}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', default=Config.ROADMAP_FILE,
+                        help='roadmap.json path; other backends keep their files next to it')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('migrate', help='Copy the roadmap from one storage backend into another')
+    p.add_argument('--from', dest='source', choices=STORAGE_BACKENDS,
+                   help='Defaults to json, or sqlite when migrating --to json')
+    p.add_argument('--to', dest='target', choices=STORAGE_BACKENDS, required=True)
+    p.set_defaults(func=cmd_migrate)
+
+    p = sub.add_parser('pretty', help='Pretty-print the roadmap for review or diffs')
+    p.add_argument('path', nargs='?',
+                   help='JSON file to format; defaults to the roadmap from the configured backend')
+    p.add_argument('--out', help='Write to this file instead of stdout')
+    p.set_defaults(func=cmd_pretty)
+
+    p = sub.add_parser('split-history', help='Move inline edit_history lists into per-item history logs')
+    p.set_defaults(func=cmd_split_history)
+
+    p = sub.add_parser('split-comments', help='Move inline comments lists into per-item comment files')
+    p.set_defaults(func=cmd_split_comments)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+"""Multi-predicate item queries and the secondary indexes that answer them."""
+
+import base64
+import json
+import math
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+SCORE_PARAMS = {'impact': 'impact_score', 'ease': 'ease_score', 'priority': 'priority_score'}
+DATE_FIELDS = ('added_date', 'start_date', 'completed_date', 'expected_delivery')
+SORT_FIELDS = ('id',) + tuple(SCORE_PARAMS.values()) + DATE_FIELDS
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+class QueryError(ValueError):
+    """A malformed query parameter (reported to the client as a 400)."""
+
+
+def _value(item, field):
+    """The sortable value of `field`, or None when the item has none."""
+    value = item.get(field)
+    if field in DATE_FIELDS:
+        return value if isinstance(value, str) and value else None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value if field == 'id' else float(value)
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, sort=None):
+    """The (value, id) key in `token`, checked against the type of the `sort` field's values."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except ValueError:
+        raise QueryError('Invalid cursor')
+    if not (isinstance(key, list) and len(key) == 2
+            and isinstance(key[1], int) and not isinstance(key[1], bool)):
+        raise QueryError('Invalid cursor')
+    value, field = key[0], sort or 'id'
+    if field == 'id':
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    elif field in DATE_FIELDS:
+        valid = value is None or isinstance(value, str)
+    else:
+        valid = value is None or (isinstance(value, (int, float)) and not isinstance(value, bool)
+                                  and math.isfinite(value))
+    if not valid:
+        raise QueryError('Invalid cursor')
+    return tuple(key)
+
+
+def _list_arg(args, name):
+    """?name=a,b and/or ?name=a&name=b as a list, or None when absent."""
+    values = [v.strip() for raw in args.getlist(name) for v in raw.split(',') if v.strip()]
+    return values or None
+
+
+def _bool_arg(args, name):
+    value = args.get(name)
+    if value is None:
+        return None
+    if value.lower() not in ('true', 'false'):
+        raise QueryError(f'{name} must be true or false')
+    return value.lower() == 'true'
+
+
+class ItemQuery:
+    """Filters for /api/roadmap/items; every given predicate must hold.
+
+    statuses / categories / owners are IN-lists (categories and owners compare
+    case-insensitively), `ranges` maps a score or date field to inclusive
+    (low, high) bounds (either may be None), and `sort` is one of SORT_FIELDS.
+    `blocked` keeps only items with (True) or without (False) an open blocker
+    in the dependency graph.
+    """
+
+    def __init__(self, statuses=None, categories=None, owners=None, ranges=None,
+                 has_votes=None, sort=None, descending=False, blocked=None):
+        self.statuses = {s.upper() for s in statuses} if statuses else None
+        self.categories = {c.lower() for c in categories} if categories else None
+        self.owners = {o.lower() for o in owners} if owners else None
+        self.ranges = ranges or {}
+        self.has_votes = has_votes
+        self.sort = sort
+        self.descending = descending
+        self.blocked = blocked
+
+    @classmethod
+    def from_args(cls, args):
+        """Parse request args: status/category/owner (comma lists), impact_min,
+        priority_max, ..., <date field>_from/_to, has_votes, blocked and sort (-field = descending)."""
+        ranges = {}
+        for param, field in SCORE_PARAMS.items():
+            bounds = []
+            for suffix in ('min', 'max'):
+                raw = args.get(f'{param}_{suffix}')
+                try:
+                    bounds.append(float(raw) if raw not in (None, '') else None)
+                except ValueError:
+                    raise QueryError(f'{param}_{suffix} must be a number')
+            if bounds != [None, None]:
+                ranges[field] = tuple(bounds)
+        for field in DATE_FIELDS:
+            bounds = []
+            for suffix in ('from', 'to'):
+                raw = args.get(f'{field}_{suffix}') or None
+                if raw is not None and not DATE_RE.match(raw):
+                    raise QueryError(f'{field}_{suffix} must be a YYYY-MM-DD date')
+                bounds.append(raw)
+            if bounds != [None, None]:
+                ranges[field] = tuple(bounds)
+
+        has_votes, blocked = (_bool_arg(args, name) for name in ('has_votes', 'blocked'))
+
+        sort = args.get('sort') or None
+        descending = bool(sort) and sort.startswith('-')
+        if sort:
+            sort = sort.lstrip('-')
+            if sort not in SORT_FIELDS:
+                raise QueryError(f'sort must be one of: {", ".join(SORT_FIELDS)} (prefix - for descending)')
+
+        return cls(
+            statuses=_list_arg(args, 'status'),
+            categories=_list_arg(args, 'category'),
+            owners=_list_arg(args, 'owner'),
+            ranges=ranges,
+            has_votes=has_votes,
+            sort=sort,
+            descending=descending,
+            blocked=blocked,
+        )
+
+    @property
+    def is_simple(self):
+        """Only IN-list filters and board/id order (what the SQLite backend answers in SQL)."""
+        return not self.ranges and self.has_votes is None and self.blocked is None \
+            and self.sort in (None, 'id') and not self.descending
+
+    def cursor_key(self, item):
+        """Position of `item` in this query's order, for encode_cursor()."""
+        return (_value(item, self.sort or 'id'), item['id'])
+
+
+class QueryIndex:
+    """Secondary indexes over the items: status / category / owner -> ids, items
+    with votes, and (value, id) arrays sorted per SORT_FIELDS field.
+
+    Like RoadmapCounters it remembers what it recorded per item, so update()
+    and remove() touch only that item's entries.
+    """
+
+    def __init__(self, items):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.by_status = {}
+        self.by_category = {}
+        self.by_owner = {}
+        self.with_votes = set()
+        self.sorted = {field: [] for field in SORT_FIELDS}
+        self.missing = {field: [] for field in SORT_FIELDS}  # Sorted ids without a value
+        for item in items:
+            self._add(self._entry(item), sort_later=True)
+        for arrays in (self.sorted, self.missing):
+            for array in arrays.values():
+                array.sort()
+
+    @staticmethod
+    def _entry(item):
+        return (
+            item['id'],
+            item.get('status'),
+            str(item.get('category') or '').lower(),
+            str(item.get('owner') or '').lower(),
+            bool(item.get('votes')),
+            tuple(_value(item, field) for field in SORT_FIELDS),
+        )
+
+    def _add(self, entry, sort_later=False):
+        item_id, status, category, owner, has_votes, values = entry
+        self._entries[item_id] = entry
+        for mapping, key in ((self.by_status, status), (self.by_category, category),
+                             (self.by_owner, owner)):
+            mapping.setdefault(key, set()).add(item_id)
+        if has_votes:
+            self.with_votes.add(item_id)
+        for field, value in zip(SORT_FIELDS, values):
+            array, element = ((self.sorted[field], (value, item_id)) if value is not None
+                              else (self.missing[field], item_id))
+            if sort_later:
+                array.append(element)
+            else:
+                insort(array, element)
+
+    def _discard(self, item_id):
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return
+        _, status, category, owner, _, values = entry
+        for mapping, key in ((self.by_status, status), (self.by_category, category),
+                             (self.by_owner, owner)):
+            ids = mapping[key]
+            ids.discard(item_id)
+            if not ids:
+                del mapping[key]
+        self.with_votes.discard(item_id)
+        for field, value in zip(SORT_FIELDS, values):
+            array, element = ((self.sorted[field], (value, item_id)) if value is not None
+                              else (self.missing[field], item_id))
+            del array[bisect_left(array, element)]
+
+    def update(self, item):
+        entry = self._entry(item)
+        with self._lock:
+            if self._entries.get(item['id']) == entry:
+                return
+            self._discard(item['id'])
+            self._add(entry)
+
+    def remove(self, item_id):
+        with self._lock:
+            self._discard(item_id)
+
+    def _range(self, field, low, high):
+        array = self.sorted[field]
+        start = bisect_left(array, (low,)) if low is not None else 0
+        end = bisect_right(array, (high, math.inf)) if high is not None else len(array)
+        return {item_id for _, item_id in array[start:end]}
+
+    def select(self, query):
+        """The set of ids matching `query`, or None when it has no filters (all items)."""
+        with self._lock:
+            sets = []
+            for mapping, wanted in ((self.by_status, query.statuses),
+                                    (self.by_category, query.categories),
+                                    (self.by_owner, query.owners)):
+                if wanted is not None:
+                    sets.append(set().union(*(mapping.get(key, ()) for key in wanted)))
+            for field, (low, high) in query.ranges.items():
+                sets.append(self._range(field, low, high))
+            if query.has_votes is not None:
+                sets.append(self.with_votes if query.has_votes
+                            else set(self._entries).difference(self.with_votes))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def ordered(self, field, descending=False, ids=None, after=None):
+        """Ids (restricted to `ids` if given) in (value, id) order of `field`, after
+        cursor key `after`. Items without a value come last in either direction."""
+        with self._lock:
+            if ids is not None and len(ids) * 4 < len(self._entries):
+                # A small candidate set: sorting it beats walking the whole array
+                k = SORT_FIELDS.index(field)
+                keyed = [(self._entries[i][5][k], i) for i in ids if i in self._entries]
+                array = sorted(pair for pair in keyed if pair[0] is not None)
+                missing = sorted(i for value, i in keyed if value is None)
+                ids = None
+            else:
+                array, missing = self.sorted[field], self.missing[field]
+            if after is not None and after[0] is None:
+                array, missing = [], missing[bisect_right(missing, after[1]):]
+            elif after is not None and descending:
+                array = array[:bisect_left(array, after)]
+            elif after is not None:
+                array = array[bisect_right(array, after):]
+            else:
+                array = array[:]
+            missing = missing[:]
+        if descending:
+            array.reverse()
+        for _, item_id in array:
+            if ids is None or item_id in ids:
+                yield item_id
+        for item_id in missing:
+            if ids is None or item_id in ids:
+                yield item_id
@@ -0,0 +1,90 @@
+"""Pre-serialized, pre-compressed response bodies for the large GET endpoints."""
+
+import gzip
+import hashlib
+import threading
+
+try:
+    import brotli
+except ImportError:  # Optional; clients are offered gzip only
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # Well past gzip's ratio at a fraction of quality 11's cost
+
+ENCODINGS = (['br'] if brotli is not None else []) + ['gzip', 'identity']
+
+
+def _compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return body
+
+
+class EncodedBody:
+    """One serialized body, its strong ETag, and compressed variants built on first use."""
+
+    def __init__(self, key, body):
+        self.key = key
+        self.etag = hashlib.blake2b(body, digest_size=10).hexdigest()
+        self._variants = {'identity': body}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding):
+        """The body in `encoding`, compressed on first request and kept."""
+        body = self._variants.get(encoding)
+        if body is None:
+            with self._lock:
+                body = self._variants.get(encoding)
+                if body is None:
+                    body = self._variants[encoding] = _compress(self._variants['identity'], encoding)
+        return body
+
+    def etag_for(self, encoding):
+        """Each encoding is a distinct representation, so it gets its own strong ETag."""
+        return self.etag if encoding == 'identity' else f'{self.etag}-{encoding}'
+
+    def etags(self):
+        return [self.etag_for(e) for e in ENCODINGS]
+
+
+class ResponseCache:
+    """Holds the EncodedBody for the latest key (e.g. store generation).
+
+    A key change replaces the entry with a single reference swap, so a reader
+    sees either the old body or the new one, never a mix.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.builds = 0
+        self._entry = None
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the EncodedBody for `key`, calling build() -> bytes on a miss."""
+        entry = self._entry
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        with self._lock:
+            entry = self._entry
+            if entry is None or entry.key != key:
+                entry = self._entry = EncodedBody(key, build())
+                self.builds += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def invalidate(self):
+        self._entry = None
+
+    def stats(self):
+        entry = self._entry
+        return {
+            'hits': self.hits,
+            'builds': self.builds,
+            'bytes': len(entry.encoded('identity')) if entry is not None else 0,
+        }
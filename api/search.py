@@ -0,0 +1,164 @@
+"""Inverted index for GET /api/roadmap/search — ranked, prefix-matching, with highlights."""
+
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left, insort
+
+TOKEN_RE = re.compile(r'\w+')
+
+# Searched item fields and how much a match in each counts toward the score
+SEARCH_FIELDS = {
+    'name': 3.0,
+    'category': 2.0,
+    'description': 1.0,
+    'business_impact': 1.0,
+    'dependencies': 1.0,
+}
+COMMENT_WEIGHT = 1.0
+PREFIX_FACTOR = 0.5    # A prefix-only match scores half an exact one
+MAX_EXPANSIONS = 200   # Vocabulary terms one query prefix may expand to
+
+
+def tokenize(text):
+    return [t.lower() for t in TOKEN_RE.findall(text)] if isinstance(text, str) else []
+
+
+def _inline_comments(item):
+    return item.get('comments') or []
+
+
+def _texts(item, comments=_inline_comments):
+    """(field, comment id or None, text) for every searched piece of an item."""
+    for field in SEARCH_FIELDS:
+        yield field, None, item.get(field)
+    for comment in comments(item):
+        yield 'comments', comment.get('id'), comment.get('comment')
+
+
+class SearchIndex:
+    """term -> {item id -> weight} postings over SEARCH_FIELDS and comments.
+
+    Like RoadmapCounters it remembers each item's terms, so update() and
+    remove() touch only that item's postings. The vocabulary is kept sorted
+    for prefix lookups. `comments(item)` returns an item's comments (by default
+    its inline `comments` list).
+    """
+
+    def __init__(self, items, comments=None):
+        self._comments = comments or _inline_comments
+        self._postings = {}
+        self._terms = {}
+        self._vocab = []
+        self._lock = threading.Lock()
+        for item in items:
+            self.update(item)
+
+    def _weights(self, item):
+        weights = {}
+        for field, _, text in _texts(item, self._comments):
+            weight = SEARCH_FIELDS.get(field, COMMENT_WEIGHT)
+            for term in tokenize(text):
+                weights[term] = weights.get(term, 0.0) + weight
+        return weights
+
+    def _unindex(self, item_id):
+        for term in self._terms.pop(item_id, ()):
+            posting = self._postings[term]
+            del posting[item_id]
+            if not posting:
+                del self._postings[term]
+                del self._vocab[bisect_left(self._vocab, term)]
+
+    def update(self, item):
+        weights = self._weights(item)
+        with self._lock:
+            self._unindex(item['id'])
+            for term, weight in weights.items():
+                posting = self._postings.get(term)
+                if posting is None:
+                    posting = self._postings[term] = {}
+                    insort(self._vocab, term)
+                posting[item['id']] = weight
+            self._terms[item['id']] = tuple(weights)
+
+    def remove(self, item_id):
+        with self._lock:
+            self._unindex(item_id)
+
+    def _expand(self, token):
+        """Vocabulary terms starting with `token`, the exact term first."""
+        start = bisect_left(self._vocab, token)
+        terms = []
+        for k in range(start, min(start + MAX_EXPANSIONS, len(self._vocab))):
+            if not self._vocab[k].startswith(token):
+                break
+            terms.append(self._vocab[k])
+        return terms
+
+    def search(self, query, limit=20):
+        """Return (total matches, [(item id, score)] best first).
+
+        Every query token must match (as a whole term or a prefix of one).
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return 0, []
+        with self._lock:
+            n_items = len(self._terms) or 1
+            per_token = []  # ({item id: weight}, factor) for each query token
+            for token in tokens:
+                terms = self._expand(token)
+                if not terms:
+                    return 0, []
+                if len(terms) == 1:
+                    posting = self._postings[terms[0]]
+                    factor = math.log(1 + n_items / len(posting))
+                    per_token.append((posting, factor if terms[0] == token else factor * PREFIX_FACTOR))
+                    continue
+                merged = {}
+                for term in terms:
+                    posting = self._postings[term]
+                    factor = math.log(1 + n_items / len(posting))
+                    if term != token:
+                        factor *= PREFIX_FACTOR
+                    for item_id, weight in posting.items():
+                        score = weight * factor
+                        if score > merged.get(item_id, 0.0):
+                            merged[item_id] = score
+                per_token.append((merged, 1.0))
+            per_token.sort(key=lambda p: len(p[0]))
+            if len(per_token) == 1:
+                weights, factor = per_token[0]
+                total = len(weights)
+                top = heapq.nlargest(limit, weights, key=weights.get)
+                return total, [(item_id, round(weights[item_id] * factor, 4)) for item_id in top]
+            candidates = per_token[0][0].keys()
+            for weights, _ in per_token[1:]:
+                candidates = candidates & weights.keys()
+            weights, factor = per_token[0]
+            scores = {item_id: weights[item_id] * factor for item_id in candidates}
+            for weights, factor in per_token[1:]:
+                for item_id in scores:
+                    scores[item_id] += weights[item_id] * factor
+        top = heapq.nlargest(limit, scores, key=scores.get)
+        return len(scores), [(item_id, round(scores[item_id], 4)) for item_id in top]
+
+
+def highlights(item, query, comments=None):
+    """{field: [[start, end], ...]} (comments: {comment id: [...]}) for terms the query matched."""
+    tokens = tokenize(query)
+    found = {}
+    for field, comment_id, text in _texts(item, comments or _inline_comments):
+        if not isinstance(text, str):
+            continue
+        spans = [[m.start(), m.end()] for m in TOKEN_RE.finditer(text)
+                 if any(m.group().lower().startswith(t) for t in tokens)]
+        if not spans:
+            continue
+        if comment_id is None:
+            found[field] = spans
+        else:
+            found.setdefault('comments', {})[str(comment_id)] = spans
+    return found
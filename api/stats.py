@@ -0,0 +1,163 @@
+"""Group-by aggregates for GET /api/roadmap/stats, maintained incrementally."""
+
+import threading
+
+GROUP_FIELDS = ('category', 'status', 'owner', 'phase')
+METRIC_FIELDS = ('impact_score', 'ease_score', 'priority_score', 'vote_count', 'comment_count')
+INTEGER_FIELDS = ('vote_count', 'comment_count')
+AGGREGATES = ('sum', 'avg')
+MAX_CACHED_RESULTS = 64
+
+
+class StatsError(ValueError):
+    """A malformed group_by / metrics parameter (reported to the client as a 400)."""
+
+
+def parse_group_by(names):
+    """Validate a group_by list (possibly empty) and return it as a tuple."""
+    for name in names:
+        if name not in GROUP_FIELDS:
+            raise StatsError(f'group_by fields must be among: {", ".join(GROUP_FIELDS)}')
+    if len(set(names)) != len(names):
+        raise StatsError('group_by lists a field twice')
+    return tuple(names)
+
+
+def parse_metrics(names):
+    """Validate metrics ('count', '<sum|avg>:<field>') and return them as a tuple."""
+    for name in names:
+        if name == 'count':
+            continue
+        aggregate, _, field = name.partition(':')
+        if aggregate not in AGGREGATES or field not in METRIC_FIELDS:
+            raise StatsError(f'metrics must be count or <{"|".join(AGGREGATES)}>:<field> '
+                             f'with field one of: {", ".join(METRIC_FIELDS)}')
+    return tuple(dict.fromkeys(names))
+
+
+def _group_value(item, field):
+    value = item.get(field)
+    if field == 'category':
+        return value or 'Uncategorized'
+    if field == 'owner':
+        return value or 'Unassigned'
+    return value or None
+
+
+def _metric_value(item, field):
+    value = item.get(field)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+def _sort_key(key):
+    return tuple((value is None, str(value)) for value in key)
+
+
+class GroupStats:
+    """Count and per-field sum / value count for each group of items.
+
+    A grouping (a set of GROUP_FIELDS) is built the first time it is asked
+    for and from then on kept current: like RoadmapCounters it remembers each
+    item's group values and metrics, so update() and remove() move one item
+    between groups in every grouping built so far. Answers are cached until
+    the next change, so repeated dashboard polls between saves cost a lookup.
+    """
+
+    def __init__(self, items):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._groupings = {}  # Sorted GROUP_FIELDS positions -> {key: [count, sums, counts]}
+        self._results = {}
+        for item in items:
+            self._entries[item['id']] = self._entry(item)
+
+    @staticmethod
+    def _entry(item):
+        return (tuple(_group_value(item, f) for f in GROUP_FIELDS),
+                tuple(_metric_value(item, f) for f in METRIC_FIELDS))
+
+    @staticmethod
+    def _apply(grouping, positions, entry, delta):
+        groups, values = entry
+        key = tuple(groups[p] for p in positions)
+        totals = grouping.get(key)
+        if totals is None:
+            totals = grouping[key] = [0, [0] * len(METRIC_FIELDS), [0] * len(METRIC_FIELDS)]
+        totals[0] += delta
+        for k, value in enumerate(values):
+            if value is not None:
+                totals[1][k] += delta * value
+                totals[2][k] += delta
+        if not totals[0]:
+            del grouping[key]
+
+    def _grouping(self, positions):
+        grouping = self._groupings.get(positions)
+        if grouping is None:
+            grouping = self._groupings[positions] = {}
+            for entry in self._entries.values():
+                self._apply(grouping, positions, entry, 1)
+        return grouping
+
+    def update(self, item):
+        entry = self._entry(item)
+        with self._lock:
+            old = self._entries.get(item['id'])
+            if old == entry:
+                return
+            for positions, grouping in self._groupings.items():
+                if old is not None:
+                    self._apply(grouping, positions, old, -1)
+                self._apply(grouping, positions, entry, 1)
+            self._entries[item['id']] = entry
+            self._results.clear()
+
+    def remove(self, item_id):
+        with self._lock:
+            old = self._entries.pop(item_id, None)
+            if old is None:
+                return
+            for positions, grouping in self._groupings.items():
+                self._apply(grouping, positions, old, -1)
+            self._results.clear()
+
+    @staticmethod
+    def _metrics(totals, metrics):
+        count, sums, counts = totals
+        row = {}
+        for name in metrics:
+            if name == 'count':
+                row[name] = count
+                continue
+            aggregate, _, field = name.partition(':')
+            k = METRIC_FIELDS.index(field)
+            if aggregate == 'sum':
+                value = sums[k] if field in INTEGER_FIELDS else round(sums[k], 4)
+            else:
+                value = round(sums[k] / counts[k], 4) if counts[k] else None
+            row[name] = value
+        return row
+
+    def query(self, group_by=(), metrics=('count',)):
+        """{'groups': [{<group field>: value, ..., <metric>: value}], 'totals': {...}},
+        groups sorted by their values (missing values last)."""
+        cache_key = (group_by, metrics)
+        with self._lock:
+            result = self._results.get(cache_key)
+            if result is not None:
+                return result
+            positions = tuple(sorted(GROUP_FIELDS.index(f) for f in group_by))
+            order = [positions.index(GROUP_FIELDS.index(f)) for f in group_by]
+            groups = []
+            for key, totals in self._grouping(positions).items():
+                key = tuple(key[i] for i in order)
+                groups.append((key, {**dict(zip(group_by, key)), **self._metrics(totals, metrics)}))
+            groups.sort(key=lambda pair: _sort_key(pair[0]))
+            overall = self._grouping(()).get((), [0, [0] * len(METRIC_FIELDS), [0] * len(METRIC_FIELDS)])
+            result = {'groups': [row for _, row in groups], 'totals': self._metrics(overall, metrics)}
+            if len(self._results) >= MAX_CACHED_RESULTS:
+                self._results.clear()
+            self._results[cache_key] = result
+            return result
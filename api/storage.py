@@ -0,0 +1,875 @@
+"""Roadmap persistence — roadmap.json I/O behind a parsed-document cache."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from config import Config
+from groupcommit import BatchDiscarded, GroupCommit
+from indexes import RoadmapIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes: the write lock is per-process only
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator; the stdlib encoder is the fallback
+    orjson = None
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
+
+JSON_FORMATS = ('compact', 'orjson', 'pretty')
+
+
+def encode(data, fmt=None):
+    """Serialize to UTF-8 JSON bytes in ROADMAP_JSON format.
+
+    'orjson' falls back to 'compact' when orjson is not installed. 'pretty'
+    (indent=2) is for people; use manage.py pretty rather than storing it.
+    """
+    fmt = fmt or Config.ROADMAP_JSON
+    if fmt == 'pretty':
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    if fmt == 'orjson' and orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def encode_compact(data):
+    """Fastest single-line encoding available, for internal records never read by people."""
+    return encode(data, 'orjson' if orjson is not None else 'compact')
+
+
+def decode(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def read_json(path):
+    with open(path, 'rb') as f:
+        return decode(f.read())
+
+
+def _file_key(path):
+    """(inode, mtime, size) of `path`, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _write_snapshot(path, data):
+    """Atomically replace `path` with `data` encoded in ROADMAP_JSON format."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(encode(data))
+    os.replace(tmp_path, path)
+
+
+# ---------------------------------------------------------------------------
+# Repository interface
+# ---------------------------------------------------------------------------
+
+def item_projector(fields=None, exclude=None):
+    """A function copying just `fields`, or every field but `exclude`, of an item
+    (`id` is always kept); with neither it returns the item itself."""
+    if fields:
+        keep = ['id'] + [f for f in fields if f != 'id']
+        return lambda item: {k: item[k] for k in keep if k in item}
+    if exclude:
+        drop = set(exclude) - {'id'}
+        return lambda item: {k: v for k, v in item.items() if k not in drop}
+    return lambda item: item
+
+
+def project_items(items, fields=None, exclude=None):
+    """Copy just `fields`, or every field but `exclude`, of each item. `id` is always kept."""
+    if not fields and not exclude:
+        return items
+    project = item_projector(fields, exclude)
+    return [project(item) for item in items]
+
+
+class RoadmapStore:
+    """Base class for roadmap storage backends, with a parsed-document cache.
+
+    `path` is the configured roadmap.json; backends keep their own files next
+    to it. Reads are served from memory while the backing files are unchanged
+    (per _stat_key()), so a hand edit, a `git checkout` or another process
+    writing is picked up on the next read. `generation` increases every time
+    the cached document changes, whether through save() or an external edit;
+    it is local to this process, unlike the document's persisted `revision`
+    that save_roadmap() bumps.
+
+    The cached dict is shared: handlers mutate it in place and then call
+    save(), holding write_lock() across the read-modify-write. If a request
+    dies between the two, invalidate() drops the copy so the next read goes
+    back to storage.
+
+    With enable_group_commit(), save() applies the change to the cached
+    document at once but defers the write: saves arriving within the window
+    are merged and written by one flush(), and wait_for_flush() blocks a
+    request until its save is on disk. While a batch is pending this process
+    keeps the cross-process file lock, so no other worker reads around it.
+
+    Subclasses implement _stat_key(), _refresh() and _write(), and may override
+    get_item()/list_items() with something cheaper than scanning load().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = os.path.splitext(path)[0] + '.lock'
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._write_lock = threading.RLock()
+        self._lock_file = None
+        self._lock_depth = 0
+        self._key = None
+        self._data = None
+        self._index = None
+        self.group_commit = None
+        self._local = threading.local()
+
+    @property
+    def paths(self):
+        """Files to stage when auto-committing to git."""
+        return [self.path]
+
+    def _stat_key(self):
+        """A value that changes whenever the stored roadmap changes."""
+        raise NotImplementedError
+
+    def _refresh(self, key):
+        """Bring self._data up to date with the storage state behind `key`."""
+        raise NotImplementedError
+
+    def _write(self, data, changed, deleted):
+        raise NotImplementedError
+
+    def load(self):
+        with self._lock:
+            if (self.group_commit is not None and self.group_commit.pending is not None
+                    and self._data is not None):
+                self.hits += 1
+                return self._data  # Ahead of storage until the pending batch is flushed
+            key = self._stat_key()
+            if Config.ROADMAP_CACHE and self._data is not None and key == self._key:
+                self.hits += 1
+                return self._data
+            self.misses += 1
+            if not Config.ROADMAP_CACHE:
+                self._data = None
+            self._refresh(key)
+            self._index = None
+            self._key = key
+            self.generation += 1
+            return self._data
+
+    def save(self, data, changed=(), deleted=()):
+        """Persist `data`. `changed` items / `deleted` ids describe the mutation;
+        with neither, the whole document is written."""
+        if self.group_commit is not None:
+            self._defer(data, changed, deleted)
+            return
+        with self._lock:
+            try:
+                self._write(data, changed, deleted)
+            except Exception:
+                self.invalidate()
+                raise
+            self._key = self._stat_key()
+            self._data = data
+            self.generation += 1
+
+    # --- Group commit ---
+
+    def enable_group_commit(self, window, max_batch):
+        """Coalesce saves: flush at most once per `window` seconds or `max_batch` saves."""
+        with self._lock:
+            if self.group_commit is None:
+                self.group_commit = GroupCommit(self.flush, window, max_batch)
+
+    def _defer(self, data, changed, deleted):
+        with self.write_lock():
+            pending = self.group_commit.pending
+            if pending is not None and pending.conflicts(changed):
+                self._flush_pending()
+            with self._lock:
+                self._data = data
+                self.generation += 1
+            self._local.batch = self.group_commit.add(changed, deleted)
+
+    def _flush_pending(self):
+        batch = self.group_commit.take()
+        if batch is None:
+            return
+        started = time.perf_counter()
+        error = None
+        with self._lock:
+            if self._data is None:  # Dropped by invalidate(); never write a missing document
+                self.group_commit.record(batch, 0.0, BatchDiscarded('roadmap cache was invalidated'))
+                return
+            try:
+                if batch.full:
+                    self._write(self._data, (), ())
+                else:
+                    self._write(self._data, list(batch.changed.values()), batch.deleted)
+                self._key = self._stat_key()
+            except Exception as exc:
+                self.invalidate()
+                error = exc
+        self.group_commit.record(batch, time.perf_counter() - started, error)
+
+    def flush(self):
+        """Write the pending batch now (no-op without group commit or pending saves)."""
+        if self.group_commit is None or self.group_commit.pending is None:
+            return  # No lock-file I/O, e.g. from the atexit hook after the data dir is gone
+        with self.write_lock():
+            self._flush_pending()  # Takes the batch under the lock; None if already flushed
+
+    def wait_for_flush(self):
+        """Block until this thread's last deferred save is written; re-raises its error."""
+        batch = getattr(self._local, 'batch', None)
+        if batch is not None:
+            self._local.batch = None
+            batch.wait()
+
+    def _batch_pending(self):
+        """True while saves applied to the cached document still wait for their write;
+        backends that read their own storage must read the document instead."""
+        return self.group_commit is not None and self.group_commit.pending is not None
+
+    @contextmanager
+    def write_lock(self):
+        """Serialize read-modify-write cycles across threads and processes.
+
+        Load inside the lock: load() re-checks storage, so a change committed
+        by another worker process is seen before this one mutates.
+        """
+        with self._write_lock:
+            self._lock_depth += 1
+            try:
+                if fcntl is not None and self._lock_file is None:
+                    self._lock_file = open(self.lock_path, 'a')
+                    fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and self._lock_file is not None and not self._batch_pending():
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def index(self, data):
+        """The RoadmapIndex for `data` (a document returned by load())."""
+        with self._lock:
+            if self._index is None or not self._index.is_current(data):
+                self._index = RoadmapIndex(data)
+            return self._index
+
+    def get_item(self, item_id):
+        return self.index(self.load()).get(item_id)
+
+    def list_items(self, query=None, after=None, limit=None, fields=None, exclude=None):
+        """Items matching ItemQuery `query`, projected, past cursor key `after`
+        (see RoadmapIndex.query() for the order)."""
+        data = self.load()
+        items = self.index(data).query(query, after, limit)
+        return project_items(items, fields, exclude)
+
+    def iter_items(self, query=None, fields=None, exclude=None):
+        """All items matching `query`, in list_items() order, projected one at a
+        time as the caller asks for them (for streamed responses)."""
+        project = item_projector(fields, exclude)
+        data = self.load()
+        for item in self.index(data).query(query):
+            yield project(item)
+
+    def checkpoint(self):
+        """Bring the git-tracked files in `paths` up to date."""
+
+    def invalidate(self):
+        """Drop the cached document. A pending group-commit batch lives only in
+        that document (possibly next to a crashed request's half-applied
+        change), so it is discarded too: its requests fail rather than being
+        acknowledged for a write that never happens."""
+        with self.write_lock(), self._lock:
+            if self.group_commit is not None:
+                self.group_commit.discard('roadmap cache was invalidated before the batch was written')
+            self._key = None
+            self._data = None
+            self._index = None
+
+    def stats(self):
+        return {
+            'enabled': Config.ROADMAP_CACHE,
+            'generation': self.generation,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Single JSON file
+# ---------------------------------------------------------------------------
+
+class JsonStore(RoadmapStore):
+    """The whole roadmap in roadmap.json, rewritten on every save."""
+
+    def _stat_key(self):
+        key = _file_key(self.path)
+        if key is None:
+            raise FileNotFoundError(self.path)
+        return key
+
+    def _read(self):
+        return read_json(self.path)
+
+    def _refresh(self, key):
+        self._data = self._read()
+
+    def _write(self, data, changed, deleted):
+        _write_snapshot(self.path, data)
+
+
+# ---------------------------------------------------------------------------
+# Append-only operation log
+# ---------------------------------------------------------------------------
+
+class OpLogStore(JsonStore):
+    """roadmap.json as a checkpoint plus an append-only log of mutations.
+
+    Each save() appends one compact JSON line to roadmap.oplog holding the
+    items it wrote and the ids it removed, so write cost follows the size of
+    the change rather than the size of the board. The live document is the
+    snapshot with the log replayed on top. Once the log holds
+    OPLOG_COMPACT_EVERY records it is folded into a fresh roadmap.json and
+    truncated.
+
+    Records are idempotent (put replaces by id, del ignores missing ids), so a
+    crash between writing the snapshot and truncating the log only replays
+    operations that are already in the snapshot.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.log_path = os.path.splitext(path)[0] + '.oplog'
+        self.log_records = 0
+        self._log_offset = 0
+
+    @property
+    def paths(self):
+        return [self.path, self.log_path]
+
+    def _stat_key(self):
+        return (super()._stat_key(), _file_key(self.log_path))
+
+    def _refresh(self, key):
+        snapshot_key, log_key = key
+        old = self._key
+        tail_only = (
+            self._data is not None and old is not None and old[0] == snapshot_key
+            and old[1] is not None and log_key is not None
+            and old[1][0] == log_key[0] and log_key[2] >= self._log_offset
+        )
+        if not tail_only:
+            self._data = self._read()
+            self._log_offset = 0
+            self.log_records = 0
+        self._replay(self._data)
+
+    def _replay(self, data):
+        """Apply log records past the current offset to `data`."""
+        try:
+            f = open(self.log_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(self._log_offset)
+            positions = {item['id']: i for i, item in enumerate(data['items'])}
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Torn write from a crash; ignore the partial record
+                self._log_offset += len(line)
+                try:
+                    record = decode(line)
+                except ValueError:
+                    continue
+                self._apply(data, record, positions)
+                self.log_records += 1
+
+    @staticmethod
+    def _apply(data, record, positions):
+        items = data['items']
+        for item in record.get('put', []):
+            idx = positions.get(item['id'])
+            if idx is None:
+                positions[item['id']] = len(items)
+                items.append(item)
+            else:
+                items[idx] = item
+        removed = set(record.get('del', []))
+        if removed and any(i in positions for i in removed):
+            data['items'] = items = [i for i in items if i['id'] not in removed]
+            positions.clear()
+            positions.update((item['id'], i) for i, item in enumerate(items))
+        for key in ('revision', 'last_updated', 'metadata'):
+            if record.get(key) is not None:
+                data[key] = record[key]
+
+    def _write(self, data, changed, deleted):
+        if (not changed and not deleted) or self.log_records + 1 >= Config.OPLOG_COMPACT_EVERY:
+            self.compact(data)
+            return
+        record = {
+            'put': list(changed),
+            'del': list(deleted),
+            'revision': data.get('revision'),
+            'last_updated': data.get('last_updated'),
+            'metadata': data.get('metadata'),
+        }
+        line = encode_compact(record) + b'\n'
+        with open(self.log_path, 'ab') as f:
+            f.write(line)
+            self._log_offset = f.tell()
+        self.log_records += 1
+
+    def compact(self, data=None):
+        """Fold the log into a new roadmap.json snapshot and start an empty log."""
+        with self._lock:
+            if data is None:
+                data = self.load()
+            _write_snapshot(self.path, data)
+            tmp_path = f'{self.log_path}.tmp'
+            open(tmp_path, 'wb').close()
+            os.replace(tmp_path, self.log_path)
+            self._log_offset = 0
+            self.log_records = 0
+
+    def stats(self):
+        stats = super().stats()
+        stats['log_records'] = self.log_records
+        return stats
+
+
+# ---------------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------------
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    id       INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    status   TEXT,
+    category TEXT,
+    owner    TEXT,
+    doc      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_position ON items (position);
+CREATE INDEX IF NOT EXISTS items_status ON items (status);
+CREATE INDEX IF NOT EXISTS items_category ON items (category COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS items_owner ON items (owner);
+CREATE TABLE IF NOT EXISTS votes (
+    item_id INTEGER NOT NULL,
+    seq     INTEGER NOT NULL,
+    user_id INTEGER,
+    vote    TEXT,
+    doc     TEXT NOT NULL,
+    PRIMARY KEY (item_id, seq)
+);
+CREATE TABLE IF NOT EXISTS comments (
+    item_id    INTEGER NOT NULL,
+    seq        INTEGER NOT NULL,
+    comment_id INTEGER,
+    user_id    INTEGER,
+    doc        TEXT NOT NULL,
+    PRIMARY KEY (item_id, seq)
+);
+CREATE TABLE IF NOT EXISTS edit_history (
+    item_id   INTEGER NOT NULL,
+    seq       INTEGER NOT NULL,
+    timestamp TEXT,
+    field     TEXT,
+    doc       TEXT NOT NULL,
+    PRIMARY KEY (item_id, seq)
+);
+"""
+
+# Per-item lists kept in their own tables: key -> (table, extra columns)
+CHILD_TABLES = {
+    'votes': ('votes', {'user_id': 'user_id', 'vote': 'vote'}),
+    'comments': ('comments', {'comment_id': 'id', 'user_id': 'user_id'}),
+    'edit_history': ('edit_history', {'timestamp': 'timestamp', 'field': 'field'}),
+}
+
+
+def _dumps(value):
+    return encode_compact(value).decode('utf-8')
+
+
+ITER_BATCH = 500  # Rows per query when streaming items out of SQLite
+
+
+class SqliteStore(RoadmapStore):
+    """Items, votes, comments and edit_history in indexed SQLite tables.
+
+    The database lives next to roadmap.json as roadmap.db and is created from
+    roadmap.json on first use. Item lookups and the status/category filters
+    run as indexed queries; save() only rewrites the rows of changed items.
+    roadmap.json stays the git-tracked format: checkpoint() exports to it.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.db_path = os.path.splitext(path)[0] + '.db'
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            bootstrap = not os.path.exists(self.db_path)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SQLITE_SCHEMA)
+            self._conn = conn
+            if bootstrap and os.path.exists(self.path):
+                self._write(read_json(self.path), (), ())
+        return self._conn
+
+    def _meta(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return decode(row[0]) if row else default
+
+    def _stat_key(self):
+        return self._meta('_saves', 0)
+
+    # --- Rows <-> items ---
+
+    def _item_rows(self, where='', params=(), order='position', limit=None, children=CHILD_TABLES):
+        """Items matching `where`, with only the `children` lists filled in."""
+        tail = f'ORDER BY {order}'
+        if limit is not None:
+            tail += ' LIMIT ?'
+            params = (*params, limit)
+        rows = self.conn.execute(f'SELECT id, doc FROM items {where} {tail}', params).fetchall()
+        items = [decode(doc) for _, doc in rows]
+        if not items:
+            return items
+        by_id = {item['id']: item for item in items}
+        ids_sql = f'SELECT id FROM items {where} {tail}'
+        for key in children:
+            table = CHILD_TABLES[key][0]
+            for item in items:
+                if key in item:
+                    item[key] = []
+            child_rows = self.conn.execute(
+                f'SELECT item_id, doc FROM {table} WHERE item_id IN ({ids_sql}) ORDER BY item_id, seq',
+                params,
+            )
+            for item_id, doc in child_rows:
+                item = by_id.get(item_id)
+                if item is not None:
+                    item.setdefault(key, []).append(decode(doc))
+        if 'votes' in children:
+            for item in items:
+                if isinstance(item.get('votes'), list):  # Rows back to {user id: vote}
+                    item['votes'] = {str(v['user_id']): v['vote'] for v in item['votes']}
+        return items
+
+    def _put_item(self, item, position):
+        conn = self.conn
+        item_id = item['id']
+        doc = {k: (None if k in CHILD_TABLES else v) for k, v in item.items()}
+        conn.execute(
+            'INSERT OR REPLACE INTO items (id, position, status, category, owner, doc) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (item_id, position, item.get('status'), item.get('category'),
+             item.get('owner'), _dumps(doc)),
+        )
+        for key, (table, columns) in CHILD_TABLES.items():
+            conn.execute(f'DELETE FROM {table} WHERE item_id = ?', (item_id,))
+            entries = item.get(key) or []
+            if isinstance(entries, dict):  # The votes map: one row per voter
+                entries = [{'user_id': int(uid), 'vote': vote} for uid, vote in entries.items()]
+            if not entries:
+                continue
+            cols = ', '.join(columns)
+            marks = ', '.join('?' for _ in columns)
+            conn.executemany(
+                f'INSERT INTO {table} (item_id, seq, {cols}, doc) VALUES (?, ?, {marks}, ?)',
+                [(item_id, seq, *(e.get(src) for src in columns.values()), _dumps(e))
+                 for seq, e in enumerate(entries)],
+            )
+
+    def _delete_item(self, item_id):
+        self.conn.execute('DELETE FROM items WHERE id = ?', (item_id,))
+        for table, _ in CHILD_TABLES.values():
+            self.conn.execute(f'DELETE FROM {table} WHERE item_id = ?', (item_id,))
+
+    # --- RoadmapStore hooks ---
+
+    def _refresh(self, key):
+        data = {}
+        for k, v in self.conn.execute('SELECT key, value FROM meta WHERE key != ?', ('_saves',)):
+            data[k] = decode(v)
+        order = data.pop('_key_order', None) or list(data) + ['items']
+        data['items'] = self._item_rows()
+        self._data = {k: data[k] for k in order if k in data}
+
+    def _write(self, data, changed, deleted):
+        conn = self.conn
+        with conn:
+            saves = self._meta('_saves', 0) + 1
+            if not changed and not deleted:
+                conn.execute('DELETE FROM meta')
+                conn.execute('DELETE FROM items')
+                for table, _ in CHILD_TABLES.values():
+                    conn.execute(f'DELETE FROM {table}')
+                for position, item in enumerate(data['items']):
+                    self._put_item(item, position)
+            else:
+                for item_id in deleted:
+                    self._delete_item(item_id)
+                for item in changed:
+                    row = conn.execute('SELECT position FROM items WHERE id = ?', (item['id'],)).fetchone()
+                    if row is None:
+                        row = conn.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM items').fetchone()
+                    self._put_item(item, row[0])
+            meta = {k: v for k, v in data.items() if k != 'items'}
+            meta['_key_order'] = list(data)
+            meta['_saves'] = saves
+            conn.executemany(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                [(k, _dumps(v)) for k, v in meta.items()],
+            )
+
+    # --- Indexed reads ---
+
+    def get_item(self, item_id):
+        if self._batch_pending():
+            return super().get_item(item_id)
+        with self._lock:
+            items = self._item_rows('WHERE id = ?', (item_id,))
+        return items[0] if items else None
+
+    @staticmethod
+    def _filters(query):
+        """SQL conditions and parameters for a simple ItemQuery's list filters."""
+        clauses, params = [], []
+        for column, values, collate in (('status', query and query.statuses, ''),
+                                        ('category', query and query.categories, ' COLLATE NOCASE'),
+                                        ('owner', query and query.owners, ' COLLATE NOCASE')):
+            if values:
+                clauses.append(f'{column}{collate} IN ({", ".join("?" * len(values))})')
+                params.extend(sorted(values))
+        return clauses, params
+
+    @staticmethod
+    def _children(fields, exclude):
+        """Child tables the projection keeps; the others are not read at all."""
+        return [k for k in CHILD_TABLES if (k in fields if fields else k not in (exclude or ()))]
+
+    def list_items(self, query=None, after=None, limit=None, fields=None, exclude=None):
+        if (query is not None and not query.is_simple) or self._batch_pending():
+            # Ranges, has_votes and sorts use the in-memory secondary indexes, as do
+            # reads while the tables lag a pending group-commit batch
+            return super().list_items(query, after, limit, fields, exclude)
+        clauses, params = self._filters(query)
+        if after is not None:
+            clauses.append('id > ?')
+            params.append(after[1])
+        where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+        board_order = after is None and limit is None and (query is None or query.sort is None)
+        order = 'position' if board_order else 'id'
+        with self._lock:
+            items = self._item_rows(where, tuple(params), order, limit, self._children(fields, exclude))
+        return project_items(items, fields, exclude)
+
+    def iter_items(self, query=None, fields=None, exclude=None):
+        """Unsorted simple queries are read from the tables ITER_BATCH items at a
+        time, in board order, without loading the document; later batches see
+        saves made while earlier ones were streamed."""
+        if (query is not None and (not query.is_simple or query.sort)) or self._batch_pending():
+            yield from super().iter_items(query, fields, exclude)
+            return
+        clauses, params = self._filters(query)
+        where = f'WHERE {" AND ".join([*clauses, "position > ?"])}'
+        children = self._children(fields, exclude)
+        project = item_projector(fields, exclude)
+        position = -1
+        while True:
+            with self._lock:
+                items = self._item_rows(where, (*params, position), 'position', ITER_BATCH, children)
+                if items:
+                    row = self.conn.execute('SELECT position FROM items WHERE id = ?',
+                                            (items[-1]['id'],)).fetchone()
+            for item in items:
+                yield project(item)
+            if len(items) < ITER_BATCH or row is None:
+                return
+            position = row[0]
+
+    def checkpoint(self):
+        export_json(self.load(), self.path)
+
+
+# ---------------------------------------------------------------------------
+# One file per item
+# ---------------------------------------------------------------------------
+
+class ShardedStore(RoadmapStore):
+    """Each item in data/items/<id>.json, with data/items/manifest.json holding
+    the item order and the top-level fields (version, metadata, backlog, ...).
+
+    A mutation rewrites only the shards it touched plus the small manifest, so
+    git diffs are per item. get_item() on a cold cache reads a single shard,
+    and when another process writes, only shards whose stat changed are
+    re-read. Created from roadmap.json on first use.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.items_dir = os.path.join(os.path.dirname(path), 'items')
+        self.manifest_path = os.path.join(self.items_dir, self.MANIFEST)
+        self._shard_keys = {}
+        self._shards = {}
+
+    @property
+    def paths(self):
+        return [self.items_dir]
+
+    def _shard_path(self, item_id):
+        return os.path.join(self.items_dir, f'{item_id}.json')
+
+    def _bootstrap(self):
+        if not os.path.exists(self.manifest_path) and os.path.exists(self.path):
+            os.makedirs(self.items_dir, exist_ok=True)
+            self._write(read_json(self.path), (), ())
+
+    def _stat_key(self):
+        self._bootstrap()
+        manifest_key = _file_key(self.manifest_path)
+        if manifest_key is None:
+            raise FileNotFoundError(self.manifest_path)
+        # Shard writes are rename-based, so the directory mtime moves with them
+        return (manifest_key, os.stat(self.items_dir).st_mtime_ns)
+
+    def _refresh(self, key):
+        manifest = read_json(self.manifest_path)
+        order = manifest.pop('order')
+        key_order = manifest.pop('keys', None) or list(manifest) + ['items']
+        if self._data is None:
+            self._shard_keys = {}
+            self._shards = {}
+        items = []
+        for item_id in order:
+            path = self._shard_path(item_id)
+            shard_key = _file_key(path)
+            if shard_key is None:
+                continue
+            if self._shard_keys.get(item_id) != shard_key:
+                self._shards[item_id] = read_json(path)
+                self._shard_keys[item_id] = shard_key
+            items.append(self._shards[item_id])
+        manifest['items'] = items
+        self._data = {k: manifest[k] for k in key_order if k in manifest}
+
+    def _write_shard(self, item):
+        path = self._shard_path(item['id'])
+        _write_snapshot(path, item)
+        self._shard_keys[item['id']] = _file_key(path)
+        self._shards[item['id']] = item
+
+    def _remove_shard(self, item_id):
+        try:
+            os.remove(self._shard_path(item_id))
+        except FileNotFoundError:
+            pass
+        self._shard_keys.pop(item_id, None)
+        self._shards.pop(item_id, None)
+
+    def _write(self, data, changed, deleted):
+        os.makedirs(self.items_dir, exist_ok=True)
+        if not changed and not deleted:
+            keep = {item['id'] for item in data['items']}
+            for name in os.listdir(self.items_dir):
+                stem = name[:-len('.json')]
+                if name.endswith('.json') and stem.isdigit() and int(stem) not in keep:
+                    self._remove_shard(int(stem))
+            changed = data['items']
+        for item_id in deleted:
+            self._remove_shard(item_id)
+        for item in changed:
+            self._write_shard(item)
+        manifest = {k: v for k, v in data.items() if k != 'items'}
+        manifest['keys'] = list(data)
+        manifest['order'] = [item['id'] for item in data['items']]
+        _write_snapshot(self.manifest_path, manifest)
+
+    def get_item(self, item_id):
+        with self._lock:
+            if self._data is not None and self._key == self._stat_key():
+                return self.index(self._data).get(item_id)
+            self._bootstrap()  # A cold start may not have split roadmap.json yet
+            path = self._shard_path(item_id)
+            if _file_key(path) is None:
+                return None
+            return read_json(path)
+
+
+# ---------------------------------------------------------------------------
+# Backend selection, migration and export
+# ---------------------------------------------------------------------------
+
+STORAGE_BACKENDS = {
+    'json': JsonStore,
+    'oplog': OpLogStore,
+    'sqlite': SqliteStore,
+    'sharded': ShardedStore,
+}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path, backend=None):
+    """Return the shared store for `path` (backend defaults to ROADMAP_STORAGE)."""
+    backend = backend or Config.ROADMAP_STORAGE
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f'Unknown ROADMAP_STORAGE {backend!r}. Must be one of: {", ".join(STORAGE_BACKENDS)}')
+    key = (backend, os.path.abspath(path))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = STORAGE_BACKENDS[backend](key[1])
+        return store
+
+
+def export_json(data, path):
+    """Write `data` in the roadmap.json format."""
+    _write_snapshot(path, data)
+
+
+def migrate(path, source, target):
+    """Copy the roadmap for `path` from one backend into another, replacing it."""
+    data = get_store(path, source).load()
+    get_store(path, target).save(data)
+    return len(data['items'])
@@ -0,0 +1,250 @@
+"""Point-in-time roadmap reads, rebuilt from periodic checkpoints plus a log of saves."""
+
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from respcache import EncodedBody
+from storage import decode, encode_compact
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'  # last_updated's format, so strings compare in time order
+
+
+def parse_timestamp(value):
+    """An ISO 8601 date or datetime as a UTC timestamp in last_updated format.
+
+    A bare date means midnight UTC, as does a datetime without an offset.
+    Raises ValueError for anything else.
+    """
+    moment = datetime.fromisoformat(value.strip())
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def _stamp(ts):
+    return ts.replace(':', '')
+
+
+def _unstamp(stamp):
+    return f'{stamp[:13]}:{stamp[13:15]}:{stamp[15:]}'
+
+
+class Timeline:
+    """timeline/ next to roadmap.json: checkpoints of the whole document and,
+    after each, a log of the saves that followed it.
+
+    <revision>-<last_updated>.json is the document as saved at that revision;
+    <revision>.jsonl holds one line per later save (its revision, timestamp,
+    changed items, deleted ids and metadata) until the next checkpoint. A new
+    checkpoint is taken every `interval` saves, on a full-document save, and
+    whenever the store generation isn't the one this process last recorded (a
+    restart, a hand edit, a save from another worker), so the log never
+    replays onto a document it didn't see. Reading any moment replays at most
+    `interval` lines on top of one checkpoint. Only the newest `keep`
+    checkpoints (0 = all) and their logs are kept; older moments read as 404.
+
+    Rebuilt documents are kept as EncodedBody objects, keyed by the checkpoint
+    and the number of lines replayed, for the `cache_size` most recently read
+    states. Timestamps that fall between the same two saves share an entry.
+    """
+
+    def __init__(self, directory, interval=100, cache_size=16, keep=0):
+        self.directory = directory
+        self.interval = interval
+        self.cache_size = cache_size
+        self.keep = keep
+        self.generation = None
+        self._lock = threading.Lock()
+        self._segment = None   # Revision of the checkpoint the log appends after
+        self._count = 0
+        self._listing = None   # (directory mtime, [(revision, timestamp)] by revision)
+        self._times = {}       # Checkpoint revision -> (log size, timestamps of its lines)
+        self._bodies = OrderedDict()
+        self.hits = 0
+        self.builds = 0
+
+    def _checkpoint_path(self, revision, ts):
+        return os.path.join(self.directory, f'{revision:010d}-{_stamp(ts)}.json')
+
+    def _log_path(self, revision):
+        return os.path.join(self.directory, f'{revision:010d}.jsonl')
+
+    def checkpoints(self):
+        """[(revision, timestamp)] of the checkpoints on disk, oldest first."""
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        listing = self._listing
+        if listing is None or listing[0] != mtime:
+            found = []
+            for name in os.listdir(self.directory):
+                base, ext = os.path.splitext(name)
+                revision, _, stamp = base.partition('-')
+                if ext == '.json' and stamp and revision.isdigit():
+                    found.append((int(revision), _unstamp(stamp)))
+            found.sort()
+            listing = self._listing = (mtime, found)
+        return listing[1]
+
+    def _read_log(self, revision):
+        """Every complete line of the log after checkpoint `revision`, oldest first."""
+        try:
+            f = open(self._log_path(revision), 'rb')
+        except FileNotFoundError:
+            return []
+        records = []
+        with f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Torn write from a crash; ignore the partial line
+                records.append(decode(line))
+        return records
+
+    # --- Writing ---
+
+    def _checkpoint(self, data):
+        revision = data.get('revision', 0)
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._checkpoint_path(revision, data['last_updated'])
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(encode_compact(data))
+        os.replace(tmp_path, path)
+        self._segment, self._count = revision, 0
+        if self.keep:
+            self._prune()
+
+    def _prune(self):
+        """Remove all but the newest `keep` checkpoints, each with its log."""
+        for revision, ts in self.checkpoints()[:-self.keep]:
+            for path in (self._checkpoint_path(revision, ts), self._log_path(revision)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # Pruned by another worker
+            self._times.pop(revision, None)
+
+    def record(self, data, changed, deleted, before, after):
+        """Log one save (call under the roadmap write lock, after store.save).
+
+        `before` / `after` are the store generations around the save; a
+        generation we didn't record means the log may have missed a change.
+        """
+        with self._lock:
+            if (before != self.generation or self._segment is None
+                    or self._count >= self.interval or not (changed or deleted)):
+                self._checkpoint(data)
+            else:
+                line = encode_compact({
+                    'revision': data.get('revision', 0),
+                    'ts': data['last_updated'],
+                    'items': list(changed),
+                    'deleted': list(deleted),
+                    'metadata': data.get('metadata', {}),
+                })
+                with open(self._log_path(self._segment), 'ab') as f:
+                    f.write(line + b'\n')
+                self._count += 1
+            self.generation = after
+
+    # --- Reading ---
+
+    def _log_times(self, revision):
+        """Timestamps of the log lines after checkpoint `revision`, re-read only
+        when the log has grown."""
+        try:
+            size = os.path.getsize(self._log_path(revision))
+        except FileNotFoundError:
+            return []
+        cached = self._times.get(revision)
+        if cached is None or cached[0] != size:
+            cached = self._times[revision] = (size, [r['ts'] for r in self._read_log(revision)])
+        return cached[1]
+
+    def _rebuild(self, checkpoint, replay):
+        """The `checkpoint` (revision, timestamp) document with its first `replay` log lines applied."""
+        revision, ts = checkpoint
+        try:
+            with open(self._checkpoint_path(revision, ts), 'rb') as f:
+                data = decode(f.read())
+        except FileNotFoundError:
+            return None
+        items = data['items']
+        positions = {item['id']: n for n, item in enumerate(items)}
+        for record in self._read_log(revision)[:replay]:
+            for item in record['items']:
+                n = positions.get(item['id'])
+                if n is None:
+                    positions[item['id']] = len(items)
+                    items.append(item)
+                else:
+                    items[n] = item
+            if record['deleted']:
+                gone = set(record['deleted'])
+                items[:] = [item for item in items if item['id'] not in gone]
+                positions = {item['id']: n for n, item in enumerate(items)}
+            data['revision'] = record['revision']
+            data['last_updated'] = record['ts']
+            data['metadata'] = record['metadata']
+        return data
+
+    def body_at(self, ts):
+        """EncodedBody of the roadmap as it stood at timestamp `ts` (last_updated
+        format), or None if that is before the earliest checkpoint."""
+        checkpoints = self.checkpoints()
+        for n in range(len(checkpoints) - 1, -1, -1):
+            if checkpoints[n][1] <= ts:
+                break
+        else:
+            return None
+        checkpoint = checkpoints[n]
+        replay = bisect_right(self._log_times(checkpoint[0]), ts)
+        key = (checkpoint[0], replay)
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is not None:
+                self._bodies.move_to_end(key)
+                self.hits += 1
+                return body
+        data = self._rebuild(checkpoint, replay)
+        if data is None:
+            return None  # Checkpoint removed since the listing was read
+        body = EncodedBody(key, encode_compact(data))
+        with self._lock:
+            self.builds += 1
+            self._bodies[key] = body
+            while len(self._bodies) > self.cache_size:
+                self._bodies.popitem(last=False)
+        return body
+
+    def earliest(self):
+        checkpoints = self.checkpoints()
+        return checkpoints[0][1] if checkpoints else None
+
+    def stats(self):
+        return {
+            'checkpoints': len(self.checkpoints()),
+            'interval': self.interval,
+            'keep': self.keep,
+            'cached': len(self._bodies),
+            'hits': self.hits,
+            'builds': self.builds,
+        }
+
+
+_timelines = {}
+_timelines_lock = threading.Lock()
+
+
+def get_timeline(path, interval=100, cache_size=16, keep=0):
+    """Return the shared Timeline for the roadmap at `path`."""
+    directory = os.path.join(os.path.dirname(os.path.abspath(path)), 'timeline')
+    with _timelines_lock:
+        timeline = _timelines.get(directory)
+        if timeline is None:
+            timeline = _timelines[directory] = Timeline(directory, interval, cache_size, keep)
+        return timeline
@@ -0,0 +1,111 @@
+"""Per-item vote maps with running tallies, and the append-only vote log."""
+
+import os
+import threading
+
+from storage import decode, encode_compact
+
+VOTE_DELTA = {'up': 1, 'down': -1, None: 0}
+
+
+def vote_map(item):
+    """The item's votes as {user id (str): 'up' | 'down'}.
+
+    Items written before the map carry a list of vote dicts; it is converted
+    in place (with `voter_names` and a recounted `vote_count`) on first use.
+    """
+    votes = item.get('votes')
+    if isinstance(votes, dict):
+        return votes
+    votes = votes or []
+    item['votes'] = {str(v['user_id']): v['vote'] for v in votes if 'user_id' in v}
+    item['voter_names'] = {str(v['user_id']): v.get('username') for v in votes if 'user_id' in v}
+    item['vote_count'] = sum(VOTE_DELTA.get(d, 0) for d in item['votes'].values())
+    return item['votes']
+
+
+def cast_vote(item, user_id, username, direction):
+    """Toggle `user_id`'s vote on `item` and return (current vote, tally delta).
+
+    Voting the same way again withdraws the vote; the other way switches it.
+    `vote_count` is adjusted by the difference instead of being recounted.
+    """
+    votes = vote_map(item)
+    key = str(user_id)
+    previous = votes.get(key)
+    current = None if previous == direction else direction
+    names = item.setdefault('voter_names', {})
+    if current is None:
+        votes.pop(key, None)
+        names.pop(key, None)
+    else:
+        votes[key] = current
+        names[key] = username
+    delta = VOTE_DELTA[current] - VOTE_DELTA[previous]
+    item['vote_count'] = item.get('vote_count', 0) + delta
+    return current, delta
+
+
+class VoteLog:
+    """votes.log next to roadmap.json: one compact line per vote event,
+    [timestamp, item id, user id, vote or null, tally delta].
+
+    Vote clicks are recorded here instead of in an item's edit history, so
+    voting never touches the history logs. Summing the deltas per item
+    reproduces the `vote_count` tallies (for votes cast since the log began).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @property
+    def paths(self):
+        """Files to stage when auto-committing to git."""
+        return [self.path]
+
+    def append(self, timestamp, item_id, user_id, vote, delta):
+        line = encode_compact([timestamp, item_id, user_id, vote, delta]) + b'\n'
+        with self._lock:
+            with open(self.path, 'ab') as f:
+                f.write(line)
+
+    def read(self, item_id=None):
+        """Logged events (optionally for one item), oldest first."""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return []
+        events = []
+        with f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Torn write from a crash; ignore the partial event
+                try:
+                    event = decode(line)
+                except ValueError:
+                    continue
+                if item_id is None or event[1] == item_id:
+                    events.append(event)
+        return events
+
+    def tallies(self):
+        """{item id: net vote count} summed from the log."""
+        totals = {}
+        for _, item_id, _, _, delta in self.read():
+            totals[item_id] = totals.get(item_id, 0) + delta
+        return totals
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def get_vote_log(path):
+    """Return the shared VoteLog for the roadmap at `path`."""
+    log_path = os.path.join(os.path.dirname(os.path.abspath(path)), 'votes.log')
+    with _logs_lock:
+        log = _logs.get(log_path)
+        if log is None:
+            log = _logs[log_path] = VoteLog(log_path)
+        return log
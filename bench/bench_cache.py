@@ -0,0 +1,41 @@
+"""GET latency with and without the parsed-roadmap cache.
+
+    python bench/bench_cache.py
+"""
+
+import json
+import os
+import tempfile
+
+from common import make_roadmap, timeit
+
+ENDPOINTS = ['/api/roadmap', '/api/roadmap/items?status=DONE', '/api/roadmap/items/1', '/api/health']
+
+
+def run(n, repeat=20):
+    import config
+    import app as app_module
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'roadmap.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(make_roadmap(n), f, indent=2)
+        app_module.ROADMAP_FILE = path
+        client = app_module.app.test_client()
+        print(f'\n{n} items')
+        print(f'  {"endpoint":<34} {"uncached ms":>12} {"cached ms":>10}')
+        for url in ENDPOINTS:
+            config.Config.ROADMAP_CACHE = False
+            cold = timeit(lambda: client.get(url), repeat)
+            config.Config.ROADMAP_CACHE = True
+            client.get(url)
+            warm = timeit(lambda: client.get(url), repeat)
+            print(f'  {url:<34} {cold:>12.2f} {warm:>10.2f}')
+
+
+if __name__ == '__main__':
+    os.environ['GIT_AUTO_COMMIT'] = 'false'
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ['DATA_DIR'] = data_dir  # app's import writes users.json there, not in data/
+        for size in (1_000, 10_000):
+            run(size)
@@ -0,0 +1,46 @@
+"""Export: peak memory and time of a streamed CSV / NDJSON body vs encoding every item at once.
+
+    python bench/bench_export.py
+"""
+
+import time
+import tracemalloc
+
+from common import make_roadmap
+
+from export import csv_chunks, csv_columns, ndjson_chunks
+from storage import encode_compact, item_projector
+
+
+def measure(build):
+    """(peak MB allocated, ms) while build() produces and drops its output; times
+    include tracemalloc's overhead, so compare them only with each other."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    build()
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6, elapsed
+
+
+def drain(chunks):
+    return sum(len(chunk) for chunk in chunks)
+
+
+def run(n):
+    items = make_roadmap(n)['items']
+    columns = csv_columns()
+    project = item_projector(columns)
+    results = {
+        'whole JSON': measure(lambda: len(encode_compact(items))),
+        'streamed NDJSON': measure(lambda: drain(ndjson_chunks(iter(items)))),
+        'streamed CSV': measure(lambda: drain(csv_chunks((project(i) for i in items), columns))),
+    }
+    print(f'{n:>7} items: ' + ', '.join(f'{label} {mb:6.1f} MB peak {ms:6.0f} ms'
+                                        for label, (mb, ms) in results.items()))
+
+
+if __name__ == '__main__':
+    for size in (1_000, 10_000, 50_000):
+        run(size)
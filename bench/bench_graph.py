@@ -0,0 +1,41 @@
+"""Dependency graph: blocked lookups kept current incrementally vs recomputed per request.
+
+    python bench/bench_graph.py
+"""
+
+from common import make_roadmap, timeit
+
+from graph import DependencyGraph, parse_refs
+
+
+def recompute_blocked(items):
+    """What a client would do without the index: parse every item's refs."""
+    done = {i['id'] for i in items if i['status'] == 'DONE'}
+    ids = {i['id'] for i in items}
+    return {i['id'] for i in items
+            if any(r in ids and r not in done for r in parse_refs(i))}
+
+
+def run(n, repeat=20):
+    data = make_roadmap(n)
+    items = data['items']
+    build = timeit(lambda: DependencyGraph(items), 1)
+    graph = DependencyGraph(items)
+    assert graph.blocked() == recompute_blocked(items)
+    item = items[n // 2]
+
+    def toggle():
+        item['status'] = 'DONE' if item['status'] != 'DONE' else 'NEXT'
+        graph.update(item)
+
+    update = timeit(toggle, repeat)
+    lookup = timeit(graph.blocked, repeat)
+    full = timeit(lambda: recompute_blocked(items), repeat)
+    path = timeit(lambda: (toggle(), graph.critical_path()), 5)
+    print(f'{n:>7} items: build {build:7.1f} ms, update {update:.3f} ms, blocked() {lookup:.3f} ms'
+          f' vs recompute {full:.1f} ms, critical path after a change {path:.1f} ms')
+
+
+if __name__ == '__main__':
+    for size in (1_000, 10_000, 50_000):
+        run(size)
@@ -0,0 +1,57 @@
+"""Concurrent saves: one write per save vs group commit, json backend.
+
+    python bench/bench_group_commit.py
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from common import make_roadmap
+
+from storage import JsonStore
+
+WRITERS = 16
+SAVES_PER_WRITER = 10
+
+
+def run(n, window_ms):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'roadmap.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(make_roadmap(n), f)
+        store = JsonStore(path)
+        if window_ms:
+            store.enable_group_commit(window_ms / 1000, max_batch=64)
+        store.load()
+
+        def writer(w):
+            for k in range(SAVES_PER_WRITER):
+                with store.write_lock():
+                    data = store.load()
+                    item = data['items'][(w * SAVES_PER_WRITER + k) % n]
+                    item['vote_count'] += 1
+                    store.save(data, changed=[item])
+                store.wait_for_flush()
+
+        threads = [threading.Thread(target=writer, args=(w,)) for w in range(WRITERS)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        saves = WRITERS * SAVES_PER_WRITER
+        writes = store.group_commit.flushes if window_ms else saves
+        label = f'{window_ms} ms window' if window_ms else 'no batching'
+        print(f'  {label:<14} {saves / elapsed:>8.0f} saves/s {writes:>6} writes'
+              f' {elapsed * 1000 / saves:>8.2f} ms/save')
+
+
+if __name__ == '__main__':
+    for size in (1_000, 10_000):
+        print(f'\n{size} items, {WRITERS} writers x {SAVES_PER_WRITER} saves')
+        for window in (0, 2, 5, 20):
+            run(size, window)
@@ -0,0 +1,52 @@
+"""Filtered /items queries: secondary indexes vs a full scan of the item list.
+
+    python bench/bench_query.py
+"""
+
+from common import make_roadmap, timeit
+
+from indexes import RoadmapIndex
+from query import ItemQuery
+
+QUERIES = {
+    'status=DONE': ItemQuery(statuses=['DONE']),
+    'status+category': ItemQuery(statuses=['NEXT', 'DONE'], categories=['devops']),
+    'priority>=9.5': ItemQuery(ranges={'priority_score': (9.5, None)}),
+    'ranges+sort': ItemQuery(ranges={'impact_score': (8, None), 'ease_score': (None, 2)},
+                             sort='priority_score', descending=True),
+}
+
+
+def scan(items, query):
+    """What get_items() did before: list comprehensions over every item."""
+    out = items
+    if query.statuses:
+        out = [i for i in out if i['status'] in query.statuses]
+    if query.categories:
+        out = [i for i in out if i['category'].lower() in query.categories]
+    for field, (low, high) in query.ranges.items():
+        out = [i for i in out if (low is None or i[field] >= low) and (high is None or i[field] <= high)]
+    if query.sort:
+        out = sorted(out, key=lambda i: (i[query.sort], i['id']), reverse=query.descending)
+    return out
+
+
+def run(n, repeat=20):
+    data = make_roadmap(n)
+    index = RoadmapIndex(data)
+    build = timeit(lambda: RoadmapIndex(data).queries, 1)
+    index.queries
+    update = timeit(lambda: index.record_changes([data['items'][n // 2]], []), repeat)
+    print(f'\n{n} items: build {build:.0f} ms, update one item {update:.3f} ms')
+    print(f'  {"query":<18} {"matches":>8} {"scan ms":>8} {"index ms":>9}')
+    for name, query in QUERIES.items():
+        matches = len(index.query(query))
+        assert [i['id'] for i in index.query(query)] == [i['id'] for i in scan(data['items'], query)]
+        full = timeit(lambda: scan(data['items'], query), repeat)
+        fast = timeit(lambda: index.query(query), repeat)
+        print(f'  {name:<18} {matches:>8} {full:>8.2f} {fast:>9.2f}')
+
+
+if __name__ == '__main__':
+    for size in (1_000, 10_000, 50_000):
+        run(size)
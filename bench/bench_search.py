@@ -0,0 +1,30 @@
+"""Search index build time and query latency as the board grows.
+
+    python bench/bench_search.py
+"""
+
+from common import make_roadmap, timeit
+
+from search import SearchIndex
+
+QUERIES = ['automation 4217', 'synth', 'csm follow', 'nomatch']
+
+
+def run(n, repeat=20):
+    items = make_roadmap(n)['items']
+    for i, item in enumerate(items):
+        item['comments'] = [{'id': 1, 'comment': f'Reviewed in sprint {i % 50}'}]
+    build = timeit(lambda: SearchIndex(items), 1)
+    index = SearchIndex(items)
+    update = timeit(lambda: index.update(items[n // 2]), repeat)
+    print(f'\n{n} items: build {build:.0f} ms, update one item {update:.3f} ms')
+    print(f'  {"query":<18} {"matches":>8} {"ms":>8}')
+    for query in QUERIES:
+        total = index.search(query)[0]
+        ms = timeit(lambda: index.search(query), repeat)
+        print(f'  {query:<18} {total:>8} {ms:>8.2f}')
+
+
+if __name__ == '__main__':
+    for size in (1_000, 10_000, 50_000):
+        run(size)
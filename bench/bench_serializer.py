@@ -0,0 +1,29 @@
+"""Encode/decode time and file size per ROADMAP_JSON format as the board grows.
+
+    python bench/bench_serializer.py
+"""
+
+from common import make_roadmap, timeit
+
+import storage
+
+FORMATS = ['pretty', 'compact', 'orjson']
+
+
+def run(n, repeat=5):
+    data = make_roadmap(n)
+    print(f'\n{n} items')
+    print(f'  {"format":<8} {"encode ms":>10} {"decode ms":>10} {"size KB":>10}')
+    for fmt in FORMATS:
+        if fmt == 'orjson' and storage.orjson is None:
+            print(f'  {fmt:<8} (not installed)')
+            continue
+        raw = storage.encode(data, fmt)
+        encode = timeit(lambda: storage.encode(data, fmt), repeat)
+        decode = timeit(lambda: storage.decode(raw), repeat)
+        print(f'  {fmt:<8} {encode:>10.1f} {decode:>10.1f} {len(raw) / 1024:>10.0f}')
+
+
+if __name__ == '__main__':
+    for size in (1_000, 10_000, 100_000):
+        run(size)
@@ -0,0 +1,40 @@
+"""Roadmap stats: group aggregates kept current incrementally vs recomputed per request.
+
+    python bench/bench_stats.py
+"""
+
+from common import make_roadmap, timeit
+
+from stats import GroupStats
+
+GROUP_BY = ('category', 'status')
+METRICS = ('count', 'avg:priority_score', 'sum:vote_count')
+
+
+def recompute(items):
+    """A fresh GroupStats per request: one pass over every item."""
+    return GroupStats(items).query(GROUP_BY, METRICS)
+
+
+def run(n, repeat=20):
+    items = make_roadmap(n)['items']
+    stats = GroupStats(items)
+    stats.query(GROUP_BY, METRICS)
+    item = items[n // 2]
+
+    def change_and_query():
+        item['status'] = 'DONE' if item['status'] != 'DONE' else 'NEXT'
+        stats.update(item)
+        return stats.query(GROUP_BY, METRICS)
+
+    assert change_and_query() == recompute(items)
+    incremental = timeit(change_and_query, repeat)
+    cached = timeit(lambda: stats.query(GROUP_BY, METRICS), repeat)
+    full = timeit(lambda: recompute(items), repeat)
+    print(f'{n:>7} items: update + query {incremental:.3f} ms, cached query {cached:.4f} ms'
+          f' vs recompute {full:.1f} ms')
+
+
+if __name__ == '__main__':
+    for size in (1_000, 10_000, 50_000):
+        run(size)
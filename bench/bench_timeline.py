@@ -0,0 +1,43 @@
+"""Time-travel reads: replay cost by checkpoint spacing, cold and cached.
+
+    python bench/bench_timeline.py
+"""
+
+import tempfile
+
+from common import make_roadmap, timeit
+
+from timeline import Timeline
+
+SAVES = 1_000
+
+
+def run(n, interval):
+    data = make_roadmap(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        timeline = Timeline(tmp, interval=interval, cache_size=0)
+        data['revision'] = 0
+        data['last_updated'] = '2026-01-01T00:00:00Z'
+        timeline.record(data, [], [], 0, 0)
+        stamps = []
+        for k in range(1, SAVES + 1):
+            item = data['items'][k % n]
+            item['vote_count'] += 1
+            data['revision'] = k
+            data['last_updated'] = f'2026-01-{1 + k // 86400:02d}T{k // 3600 % 24:02d}:{k // 60 % 60:02d}:{k % 60:02d}Z'
+            stamps.append(data['last_updated'])
+            timeline.record(data, [item], [], k - 1, k)
+        worst = stamps[interval - 2] if interval <= SAVES else stamps[-1]  # Longest replay
+        cold = timeit(lambda: timeline.body_at(worst), 5)
+        timeline.cache_size = 16
+        timeline.body_at(worst)
+        cached = timeit(lambda: timeline.body_at(worst), 20)
+        label = f'every {interval}' if interval <= SAVES else 'one checkpoint'
+        print(f'{n:>7} items, {label:<15} {len(timeline.checkpoints()):>4} checkpoints:'
+              f' worst read {cold:7.1f} ms, cached {cached:.3f} ms')
+
+
+if __name__ == '__main__':
+    for size in (1_000, 10_000):
+        for spacing in (SAVES + 1, 100, 20):
+            run(size, spacing)
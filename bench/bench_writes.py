@@ -0,0 +1,42 @@
+"""Write latency by storage mode as the board grows.
+
+    python bench/bench_writes.py
+"""
+
+import json
+import os
+import tempfile
+
+from common import make_roadmap, timeit
+
+MODES = ['json', 'oplog', 'sqlite', 'sharded']
+
+
+def run(n, repeat=20):
+    import config
+    import app as app_module
+
+    print(f'\n{n} items')
+    print(f'  {"mode":<8} {"PUT status ms":>14} {"POST create ms":>15}')
+    for mode in MODES:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'roadmap.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(make_roadmap(n), f, indent=2)
+            config.Config.ROADMAP_STORAGE = mode
+            app_module.ROADMAP_FILE = path
+            client = app_module.app.test_client()
+            client.get('/api/health')
+            statuses = iter(['PLANNED', 'NEXT'] * repeat)
+            put = timeit(lambda: client.put(f'/api/roadmap/items/{n // 2}/status',
+                                            json={'status': next(statuses)}), repeat)
+            post = timeit(lambda: client.post('/api/roadmap/items', json={'name': 'Bench'}), repeat)
+            print(f'  {mode:<8} {put:>14.2f} {post:>15.2f}')
+
+
+if __name__ == '__main__':
+    os.environ['GIT_AUTO_COMMIT'] = 'false'
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ['DATA_DIR'] = data_dir  # app's import writes users.json there, not in data/
+        for size in (1_000, 10_000, 30_000):
+            run(size)
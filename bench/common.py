@@ -0,0 +1,68 @@
+"""Shared helpers for the storage benchmarks (run from the repo root)."""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+STATUSES = ['BACKLOG', 'PLANNED', 'NEXT', 'IN_PROGRESS', 'DONE']
+CATEGORIES = ['CS Intelligence', 'DevOps', 'CS Enablement', 'Reliability', 'Measurement']
+
+
+def make_roadmap(n, seed=1):
+    """Build a synthetic roadmap with `n` items shaped like data/roadmap.json."""
+    rnd = random.Random(seed)
+    items = []
+    for i in range(1, n + 1):
+        items.append({
+            'id': i,
+            'name': f'Automation {i}',
+            'category': rnd.choice(CATEGORIES),
+            'description': 'Synthetic benchmark item ' * 4,
+            'business_impact': 'Saves CSM time on manual follow-ups',
+            'outcome': 'TBD - define after initial build',
+            'success_metric': 'TBD',
+            'impact_score': round(rnd.uniform(0, 10), 1),
+            'ease_score': round(rnd.uniform(0, 10), 1),
+            'priority_score': round(rnd.uniform(0, 10), 1),
+            'build_time': '2-3 hrs',
+            'phase': 'Week 1',
+            'expected_delivery': None,
+            'status': rnd.choice(STATUSES),
+            'start_date': None,
+            'completed_date': None,
+            'dependencies': f'Automation {max(1, i - 1)} (#{max(1, i - 1)})',
+            'votes': [],
+            'vote_count': 0,
+            'comments': [],
+            'n8n_workflows': [],
+            'owner': 'Zev',
+            'added_date': '2026-01-01',
+            'edit_history': [{
+                'timestamp': '2026-01-01T00:00:00Z',
+                'field': 'status',
+                'old_value': None,
+                'new_value': 'BACKLOG',
+                'edited_by': 'API',
+            }],
+        })
+    return {
+        'version': '1.0',
+        'last_updated': '2026-01-01T00:00:00Z',
+        'items': items,
+        'backlog': [],
+        'metadata': {'total_items': n, 'categories': CATEGORIES, 'statuses': STATUSES},
+    }
+
+
+def timeit(fn, repeat):
+    """Return the median wall time of `fn()` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
@@ -207,6 +207,16 @@ async function fetchRoadmap() {
   return res.json();
 }
 
+// Items changed/deleted after `since`, or a full snapshot if the server's log doesn't reach back
+async function fetchChanges(since) {
+  const res = await fetch(`${API}/roadmap/changes?since=${since}`);
+  if (!res.ok) {
+    const json = await res.json().catch(() => ({}));
+    handleApiError(res, json);
+  }
+  return res.json();
+}
+
 async function apiCreateItem(data) {
   const res = await fetch(`${API}/roadmap/items`, {
     method: 'POST',
@@ -218,21 +228,29 @@ async function apiCreateItem(data) {
   return json;
 }
 
-async function apiUpdateItem(id, data) {
+// If-Match header so the server rejects (412) edits based on a stale copy
+function revisionHeaders(id, revision) {
+  const headers = { 'Content-Type': 'application/json' };
+  if (revision !== undefined) headers['If-Match'] = `"${id}.${revision}"`;
+  return headers;
+}
+
+// Partial update: responds with {id, revision, changed, history}
+async function apiPatchItem(id, fields, revision) {
   const res = await fetch(`${API}/roadmap/items/${id}`, {
-    method: 'PUT',
-    headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify(data),
+    method: 'PATCH',
+    headers: revisionHeaders(id, revision),
+    body: JSON.stringify(fields),
   });
   const json = await res.json();
   if (!res.ok) handleApiError(res, json);
   return json;
 }
 
-async function apiUpdateStatus(id, status) {
+async function apiUpdateStatus(id, status, revision) {
   const res = await fetch(`${API}/roadmap/items/${id}/status`, {
     method: 'PUT',
-    headers: { 'Content-Type': 'application/json' },
+    headers: revisionHeaders(id, revision),
     body: JSON.stringify({ status }),
   });
   const json = await res.json();
@@ -354,6 +372,20 @@ function getInitials(name) {
   return name.split(' ').map(w => w[0]).join('').toUpperCase().slice(0, 2);
 }
 
+// Votes are a {user id: 'up' | 'down'} map; older data has a list of vote objects
+function voteMap(item) {
+  if (Array.isArray(item.votes)) {
+    item.voter_names = Object.fromEntries(item.votes.map(v => [v.user_id, v.username]));
+    item.votes = Object.fromEntries(item.votes.map(v => [v.user_id, v.vote]));
+  }
+  if (!item.votes) item.votes = {};
+  return item.votes;
+}
+
+function voterName(item, userId) {
+  return (item.voter_names || {})[userId];
+}
+
 function getCategoryStyle(category) {
   const isDark = document.body.classList.contains('dark');
   if (category === 'Infrastructure')
@@ -418,12 +450,49 @@ function statusOptions(selected) {
 }
 
 // ───── Filtering & Sorting ─────
+// Large boards search on the server's inverted index instead of scanning every item per keystroke
+const SERVER_SEARCH_MIN_ITEMS = 2000;
+let serverMatches = null;  // Ids matching the current query, or null to match locally
+let searchTimer = null;
+
+async function fetchSearchMatches(query) {
+  const res = await fetch(`${API}/roadmap/search?q=${encodeURIComponent(query)}&limit=1000&fields=id`);
+  if (!res.ok) throw new Error(`Search failed (${res.status})`);
+  const json = await res.json();
+  // A capped page is not the whole match set; null falls back to the local filter
+  if (json.total > json.results.length) return null;
+  return new Set(json.results.map(r => r.id));
+}
+
+function onSearchInput() {
+  const query = searchInput.value.trim();
+  clearTimeout(searchTimer);
+  if (!query || allItems.length < SERVER_SEARCH_MIN_ITEMS) {
+    serverMatches = null;
+    applyFilters();
+    return;
+  }
+  searchTimer = setTimeout(async () => {
+    let matches = null;
+    try {
+      matches = await fetchSearchMatches(query);
+    } catch (err) {
+      console.error('Search error:', err);
+    }
+    if (searchInput.value.trim() !== query) return;  // A newer keystroke owns the results
+    serverMatches = matches;
+    applyFilters();
+  }, 150);
+}
+
 function applyFilters() {
   const query = searchInput.value.toLowerCase().trim();
 
   filteredItems = allItems.filter(item => {
     if (selectedCategories.size > 0 && !selectedCategories.has(item.category)) return false;
-    if (query) {
+    if (query && serverMatches) {
+      if (!serverMatches.has(item.id)) return false;
+    } else if (query) {
       const searchable = `${item.name} ${item.description} ${item.category} ${item.business_impact} ${item.dependencies}`.toLowerCase();
       if (!searchable.includes(query)) return false;
     }
@@ -504,17 +573,17 @@ function createCard(item) {
 
   // Votes + comments meta row
   const voteCount = item.vote_count || 0;
-  const votes = item.votes || [];
-  const commentCount = (item.comments || []).length;
-  const hasUserVote = currentUser && votes.some(v => v.user_id === currentUser.id);
+  const votes = voteMap(item);
+  const commentCount = item.comment_count ?? (item.comments || []).length;
+  const hasUserVote = currentUser && currentUser.id in votes;
   let metaHtml = '';
   if (voteCount > 0 || commentCount > 0) {
-    const voterInitials = votes
-      .filter(v => v.vote === 'up')
+    const upVoters = Object.keys(votes).filter(id => votes[id] === 'up');
+    const voterInitials = upVoters
       .slice(0, 3)
-      .map(v => `<span class="card__voter">${getInitials(v.username)}</span>`)
+      .map(id => `<span class="card__voter">${getInitials(voterName(item, id))}</span>`)
       .join('');
-    const extraVoters = votes.filter(v => v.vote === 'up').length - 3;
+    const extraVoters = upVoters.length - 3;
     const votersHtml = voterInitials
       ? `<span class="card__voters">${voterInitials}${extraVoters > 0 ? `<span class="card__voter card__voter--more">+${extraVoters}</span>` : ''}</span>`
       : '';
@@ -697,7 +766,7 @@ async function handleDrop(item, newStatus) {
   }
 
   try {
-    const updated = await apiUpdateStatus(item.id, newStatus);
+    const updated = await apiUpdateStatus(item.id, newStatus, item.revision);
     syncItemInList(updated);
     // Re-render to pick up any server-side date changes
     applyFilters();
@@ -838,15 +907,11 @@ function renderDetailView(item) {
   // Smart context chips
   const chips = [];
 
-  // Time in current status
-  const history = item.edit_history || [];
-  const lastStatusChange = [...history].reverse().find(h => h.field === 'status');
-  const statusSince = lastStatusChange ? lastStatusChange.timestamp : (item.added_date ? item.added_date + 'T12:00:00Z' : null);
+  // Time in current status (refined by loadAndRenderActivity once the last status change is fetched)
+  const lastEdit = item.last_edit || null;
+  const statusSince = lastEdit && lastEdit.field === 'status' ? lastEdit.timestamp : (item.added_date ? item.added_date + 'T12:00:00Z' : null);
   if (statusSince) {
-    const days = Math.floor((new Date() - new Date(statusSince)) / 86400000);
-    const statusLabel = STATUS_LABELS[item.status] || item.status;
-    const durStr = days === 0 ? 'today' : days === 1 ? '1 day' : `${days} days`;
-    chips.push(`<span class="detail__chip"><span class="detail__chip-icon">\u23F1\uFE0F</span>${escapeHtml(statusLabel)} for ${durStr}</span>`);
+    chips.push(`<span class="detail__chip" id="statusSinceChip">${statusSinceHtml(item, statusSince)}</span>`);
   }
 
   // Owner
@@ -870,7 +935,6 @@ function renderDetailView(item) {
   }
 
   // Last activity
-  const lastEdit = history.length > 0 ? history[history.length - 1] : null;
   if (lastEdit) {
     chips.push(`<span class="detail__chip detail__chip--muted"><span class="detail__chip-icon">\u270F\uFE0F</span>Edited ${relativeTime(lastEdit.timestamp)}</span>`);
   }
@@ -973,7 +1037,7 @@ function renderDetailView(item) {
 
   // Voting controls
   const voteCount = item.vote_count || 0;
-  const userVote = item.user_vote || null;
+  const userVote = (currentUser && voteMap(item)[currentUser.id]) || null;
   const votingHtml = `<div class="vote-controls" id="voteControls">
     <button class="vote-btn${userVote === 'up' ? ' vote-btn--active' : ''}" data-vote="up" title="Upvote" aria-label="Upvote">&#9650;</button>
     <span class="vote-count" id="voteCount">${voteCount}</span>
@@ -1009,33 +1073,7 @@ function renderDetailView(item) {
   attachAlertActions(item);
   attachVoteHandlers(item);
   loadAndRenderComments(item.id);
-  // "View all" in activity log
-  const showAllBtn = detailBody.querySelector('#activityShowAll');
-  if (showAllBtn) {
-    showAllBtn.addEventListener('click', () => {
-      const logEl = detailBody.querySelector('.detail__activity-log');
-      if (!logEl) return;
-      const history = item.edit_history || [];
-      const entries = [];
-      history.forEach(h => {
-        if (h.field === 'status') {
-          entries.push({ type: 'status_change', user: h.edited_by || 'Zev', timestamp: h.timestamp, from_status: h.old_value, to_status: h.new_value });
-        } else {
-          entries.push({ type: 'field_change', user: h.edited_by || 'Zev', timestamp: h.timestamp, field: h.field, old_value: h.old_value, new_value: h.new_value });
-        }
-      });
-      if (item.added_date) entries.push({ type: 'created', user: item.owner || 'Zev', timestamp: item.added_date + 'T12:00:00Z' });
-      entries.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp));
-      logEl.innerHTML = entries.map(e => {
-        const time = relativeTime(e.timestamp);
-        let actionText = '', detailText = '';
-        if (e.type === 'created') { actionText = 'created this item'; }
-        else if (e.type === 'status_change') { actionText = `moved to ${STATUS_LABELS[e.to_status] || e.to_status}`; detailText = `From: ${STATUS_LABELS[e.from_status] || e.from_status}`; }
-        else { const fl = (e.field || '').replace(/_/g, ' '); actionText = `changed ${fl}`; const os = e.old_value != null ? String(e.old_value) : '—'; const ns = e.new_value != null ? String(e.new_value) : '—'; detailText = `${os.length > 40 ? os.slice(0,40)+'...' : os} → ${ns.length > 40 ? ns.slice(0,40)+'...' : ns}`; }
-        return `<div class="detail__activity-entry"><span class="detail__activity-user">${escapeHtml(e.user)}</span> ${escapeHtml(actionText)} <span class="detail__activity-time">• ${escapeHtml(time)}</span>${detailText ? `<div class="detail__activity-detail">${escapeHtml(detailText)}</div>` : ''}</div>`;
-      }).join('');
-    });
-  }
+  loadAndRenderActivity(item);
 }
 
 // ───── Vote Handlers ─────
@@ -1059,7 +1097,15 @@ function attachVoteHandlers(item) {
         }
         // Update the item in local data
         item.vote_count = result.vote_count;
-        item.user_vote = result.user_vote;
+        const votes = voteMap(item);
+        const names = item.voter_names = item.voter_names || {};
+        if (result.user_vote) {
+          votes[currentUser.id] = result.user_vote;
+          names[currentUser.id] = currentUser.username;
+        } else {
+          delete votes[currentUser.id];
+          delete names[currentUser.id];
+        }
       } catch (err) {
         showToast(err.message, 'error');
       }
@@ -1105,139 +1151,159 @@ async function loadAndRenderComments(itemId) {
   }
 
   try {
-    const comments = await loadComments(itemId);
-    if (comments.length === 0) {
+    const page = await loadComments(itemId);
+    if (page.comments.length === 0) {
       listEl.innerHTML = '<span class="detail__field-value--muted" style="font-size:13px">No notes yet</span>';
       return;
     }
-    listEl.innerHTML = comments.map(c => {
-      const author = c.username || c.author || 'Unknown';
-      const timestamp = c.timestamp || c.created_at;
-      const initial = author.charAt(0).toUpperCase();
-      const canDelete = currentUser && (currentUser.username === author || currentUser.role === 'admin');
-      const dateStr = timestamp ? new Date(timestamp).toLocaleDateString('en-US', { month: 'short', day: 'numeric', year: 'numeric' }) : '';
-      const timeStr = timestamp ? new Date(timestamp).toLocaleTimeString('en-US', { hour: 'numeric', minute: '2-digit' }) : '';
-      return `<div class="comment">
-        <div class="comment__header">
-          <span class="comment__avatar">${initial}</span>
-          <div class="comment__meta">
-            <span class="comment__author">${escapeHtml(author)}</span>
-            <span class="comment__time">${dateStr}${dateStr && timeStr ? ' at ' : ''}${timeStr}</span>
-          </div>
-          ${canDelete ? `<button class="comment__delete" data-comment-id="${c.id}" title="Delete note">&times;</button>` : ''}
-        </div>
-        <div class="comment__text">${escapeHtml(c.comment)}</div>
-      </div>`;
-    }).join('');
-
-    // Attach delete handlers
-    listEl.querySelectorAll('.comment__delete').forEach(btn => {
-      btn.addEventListener('click', async () => {
-        const commentId = btn.dataset.commentId;
-        try {
-          await deleteComment(itemId, commentId);
-          await loadAndRenderComments(itemId);
-          showToast('Note deleted');
-        } catch (err) {
-          showToast(err.message, 'error');
-        }
-      });
-    });
+    listEl.innerHTML = '';
+    appendComments(listEl, itemId, page);
   } catch (err) {
     listEl.innerHTML = '<span class="detail__field-value--muted" style="font-size:13px">Failed to load notes</span>';
   }
 }
 
-function renderActivityLog(item) {
-  const history = item.edit_history || [];
-
-  // Build entries from edit_history + creation
-  const entries = [];
+function commentHtml(c) {
+  const author = c.username || c.author || 'Unknown';
+  const timestamp = c.timestamp || c.created_at;
+  const initial = author.charAt(0).toUpperCase();
+  const canDelete = currentUser && (currentUser.username === author || currentUser.role === 'admin');
+  const dateStr = timestamp ? new Date(timestamp).toLocaleDateString('en-US', { month: 'short', day: 'numeric', year: 'numeric' }) : '';
+  const timeStr = timestamp ? new Date(timestamp).toLocaleTimeString('en-US', { hour: 'numeric', minute: '2-digit' }) : '';
+  return `<div class="comment">
+    <div class="comment__header">
+      <span class="comment__avatar">${initial}</span>
+      <div class="comment__meta">
+        <span class="comment__author">${escapeHtml(author)}</span>
+        <span class="comment__time">${dateStr}${dateStr && timeStr ? ' at ' : ''}${timeStr}</span>
+      </div>
+      ${canDelete ? `<button class="comment__delete" data-comment-id="${c.id}" title="Delete note">&times;</button>` : ''}
+    </div>
+    <div class="comment__text">${escapeHtml(c.comment)}</div>
+  </div>`;
+}
 
-  // Add creation entry
-  if (item.added_date) {
-    entries.push({
-      type: 'created',
-      user: item.owner || 'Zev',
-      timestamp: item.added_date + 'T09:00:00Z',
+// Notes come a page at a time, newest first; "Show older" fetches the next page
+function appendComments(listEl, itemId, page) {
+  listEl.querySelector('.comments-more')?.remove();
+  const batch = document.createElement('div');
+  batch.innerHTML = page.comments.map(commentHtml).join('');
+  batch.querySelectorAll('.comment__delete').forEach(btn => {
+    btn.addEventListener('click', async () => {
+      try {
+        await deleteComment(itemId, btn.dataset.commentId);
+        await loadAndRenderComments(itemId);
+        showToast('Note deleted');
+      } catch (err) {
+        showToast(err.message, 'error');
+      }
     });
-  }
-
-  // Add edit_history entries
-  history.forEach(h => {
-    if (h.field === 'status') {
-      entries.push({
-        type: 'status_change',
-        user: h.edited_by || 'Unknown',
-        timestamp: h.timestamp,
-        from_status: h.old_value,
-        to_status: h.new_value,
-      });
-    } else {
-      entries.push({
-        type: 'field_update',
-        user: h.edited_by || 'Unknown',
-        timestamp: h.timestamp,
-        field: h.field,
-        old_value: h.old_value,
-        new_value: h.new_value,
-      });
-    }
   });
-
-  // Sort reverse chronological
-  entries.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp));
-
-  const totalCount = entries.length;
-  const showLimit = 10;
-  const visible = entries.slice(0, showLimit);
-
-  let entriesHtml = '';
-  if (visible.length === 0) {
-    entriesHtml = '<div class="detail__activity-empty">No activity yet</div>';
-  } else {
-    entriesHtml = visible.map(e => {
-      const time = relativeTime(e.timestamp);
-      let actionText = '';
-      let detailText = '';
-
-      if (e.type === 'created') {
-        actionText = 'created this item';
-      } else if (e.type === 'status_change') {
-        const label = STATUS_LABELS[e.to_status] || e.to_status;
-        actionText = `moved to ${label}`;
-        detailText = `From: ${STATUS_LABELS[e.from_status] || e.from_status}`;
-      } else {
-        const fieldLabel = (e.field || '').replace(/_/g, ' ');
-        actionText = `changed ${fieldLabel}`;
-        const oldStr = e.old_value != null ? String(e.old_value) : '—';
-        const newStr = e.new_value != null ? String(e.new_value) : '—';
-        const oldTrunc = oldStr.length > 40 ? oldStr.slice(0, 40) + '...' : oldStr;
-        const newTrunc = newStr.length > 40 ? newStr.slice(0, 40) + '...' : newStr;
-        detailText = `${oldTrunc} \u2192 ${newTrunc}`;
+  listEl.append(...batch.children);
+
+  if (page.next_before !== null) {
+    const shown = listEl.querySelectorAll('.comment').length;
+    const more = document.createElement('button');
+    more.className = 'detail__activity-more comments-more';
+    more.textContent = `Show older notes (${page.total - shown})`;
+    more.addEventListener('click', async () => {
+      try {
+        appendComments(listEl, itemId, await loadComments(itemId, page.next_before));
+      } catch (err) {
+        showToast(err.message, 'error');
       }
-
-      return `<div class="detail__activity-entry">
-        <span class="detail__activity-user">${escapeHtml(e.user)}</span> ${escapeHtml(actionText)}
-        <span class="detail__activity-time">\u2022 ${escapeHtml(time)}</span>
-        ${detailText ? `<div class="detail__activity-detail">${escapeHtml(detailText)}</div>` : ''}
-      </div>`;
-    }).join('');
+    });
+    listEl.append(more);
   }
+}
 
-  const moreHtml = totalCount > showLimit
-    ? `<button class="detail__activity-more" id="activityShowAll">View all (${totalCount})</button>`
-    : '';
+function statusSinceHtml(item, since) {
+  const days = Math.floor((new Date() - new Date(since)) / 86400000);
+  const statusLabel = STATUS_LABELS[item.status] || item.status;
+  const durStr = days === 0 ? 'today' : days === 1 ? '1 day' : `${days} days`;
+  return `<span class="detail__chip-icon">\u23F1\uFE0F</span>${escapeHtml(statusLabel)} for ${durStr}`;
+}
 
+function renderActivityLog(item) {
   return `<div class="detail__activity">
     <div class="detail__activity-header">\u{1F4DD} Activity</div>
-    <div class="detail__activity-log">
-      ${entriesHtml}
-      ${moreHtml}
+    <div class="detail__activity-log" id="activityLog">
+      <div class="detail__activity-empty">Loading activity...</div>
     </div>
   </div>`;
 }
 
+async function fetchHistory(itemId, params) {
+  const res = await fetch(`${API}/roadmap/items/${itemId}/history?${new URLSearchParams(params)}`);
+  if (!res.ok) throw new Error(`Failed to load history (${res.status})`);
+  return res.json();
+}
+
+function activityEntryHtml(e) {
+  const time = relativeTime(e.timestamp);
+  let actionText = '';
+  let detailText = '';
+
+  if (e.type === 'created') {
+    actionText = 'created this item';
+  } else if (e.field === 'status') {
+    const label = STATUS_LABELS[e.new_value] || e.new_value;
+    actionText = `moved to ${label}`;
+    detailText = `From: ${STATUS_LABELS[e.old_value] || e.old_value}`;
+  } else {
+    const fieldLabel = (e.field || '').replace(/_/g, ' ');
+    actionText = `changed ${fieldLabel}`;
+    const oldStr = e.old_value != null ? String(e.old_value) : '—';
+    const newStr = e.new_value != null ? String(e.new_value) : '—';
+    const oldTrunc = oldStr.length > 40 ? oldStr.slice(0, 40) + '...' : oldStr;
+    const newTrunc = newStr.length > 40 ? newStr.slice(0, 40) + '...' : newStr;
+    detailText = `${oldTrunc} \u2192 ${newTrunc}`;
+  }
+
+  return `<div class="detail__activity-entry">
+    <span class="detail__activity-user">${escapeHtml(e.edited_by || 'Unknown')}</span> ${escapeHtml(actionText)}
+    <span class="detail__activity-time">\u2022 ${escapeHtml(time)}</span>
+    ${detailText ? `<div class="detail__activity-detail">${escapeHtml(detailText)}</div>` : ''}
+  </div>`;
+}
+
+// Edit history is paged from the server, newest first; the creation entry closes the last page
+async function loadAndRenderActivity(item, before = null) {
+  const logEl = document.getElementById('activityLog');
+  if (!logEl) return;
+  const pageSize = before === null ? 10 : 50;
+  try {
+    const page = await fetchHistory(item.id, before === null ? { limit: pageSize } : { limit: pageSize, before });
+    if (document.getElementById('activityLog') !== logEl) return; // Modal moved on
+    logEl.querySelector('.detail__activity-empty')?.remove();
+    logEl.querySelector('#activityShowAll')?.remove();
+
+    let html = page.entries.map(activityEntryHtml).join('');
+    if (page.next_before === null && item.added_date) {
+      html += activityEntryHtml({ type: 'created', edited_by: item.owner || 'Zev', timestamp: item.added_date + 'T09:00:00Z' });
+    }
+    if (!html && before === null) html = '<div class="detail__activity-empty">No activity yet</div>';
+    logEl.insertAdjacentHTML('beforeend', html);
+
+    if (page.next_before !== null) {
+      const shown = logEl.querySelectorAll('.detail__activity-entry').length;
+      logEl.insertAdjacentHTML('beforeend',
+        `<button class="detail__activity-more" id="activityShowAll">View more (${page.total - shown} older)</button>`);
+      logEl.querySelector('#activityShowAll').addEventListener('click', () => loadAndRenderActivity(item, page.next_before));
+    }
+
+    // The newest status change may be older than the last edit
+    if (before === null && !(item.last_edit && item.last_edit.field === 'status')) {
+      const statusPage = await fetchHistory(item.id, { limit: 1, field: 'status' });
+      const chip = document.getElementById('statusSinceChip');
+      if (chip && statusPage.entries.length) chip.innerHTML = statusSinceHtml(item, statusPage.entries[0].timestamp);
+    }
+  } catch (err) {
+    if (before === null) logEl.innerHTML = '<div class="detail__activity-empty">Failed to load activity</div>';
+    else showToast(err.message, 'error');
+  }
+}
+
 function attachCollapsibleHandlers(itemId) {
   detailBody.querySelectorAll('.detail__collapsible').forEach(el => {
     const section = el.dataset.section;
@@ -1416,13 +1482,16 @@ async function executeInlineSave(wrapperEl, fieldName, newValue, oldValue) {
   // Convert number fields
   const numFields = ['impact_score', 'ease_score', 'priority_score'];
   const saveValue = numFields.includes(fieldName) ? parseFloat(newValue) || 0 : (newValue || null);
+  const revision = currentDetailItem.revision;
   currentDetailItem[fieldName] = saveValue;
 
   try {
-    const payload = { ...currentDetailItem, _edited_by: 'Zev' };
-    delete payload.edit_history;
-
-    const updated = await apiUpdateItem(currentDetailItem.id, payload);
+    const patch = await apiPatchItem(currentDetailItem.id, { [fieldName]: saveValue, _edited_by: 'Zev' }, revision);
+    const updated = {
+      ...currentDetailItem,
+      ...patch.changed,
+      revision: patch.revision,
+    };
     syncItemInList(updated);
     currentDetailItem = updated;
 
@@ -1603,6 +1672,7 @@ function populateCategories(categories) {
     label.className = 'filter-menu__option';
     label.innerHTML = `<input type="checkbox" value="${escapeHtml(cat)}"><span class="filter-menu__option-swatch" style="background:${swatchBg}"></span><span>${escapeHtml(cat)}</span>`;
     const checkbox = label.querySelector('input');
+    checkbox.checked = selectedCategories.has(cat);  // Kept across re-population by sync
     checkbox.addEventListener('change', () => {
       if (checkbox.checked) {
         selectedCategories.add(cat);
@@ -1677,24 +1747,98 @@ document.querySelectorAll('#filterSort input[type="radio"]').forEach(radio => {
 // Clear all filters button
 $('filterClear').addEventListener('click', clearAllFilters);
 
+// ───── Sync ─────
+function showLastUpdated(timestamp) {
+  if (!timestamp) return;
+  const d = new Date(timestamp);
+  lastUpdated.textContent = `Updated ${d.toLocaleDateString('en-US', { month: 'short', day: 'numeric', year: 'numeric' })}`;
+}
+
+function applySnapshot(data) {
+  roadmapData = data;
+  allItems = roadmapData.items || [];
+  filteredItems = [...allItems];
+  populateCategories(roadmapData.metadata?.categories || []);
+  showLastUpdated(roadmapData.last_updated);
+}
+
+function applyChanges(delta) {
+  if (delta.snapshot) {
+    applySnapshot(delta.roadmap);
+    return;
+  }
+  delta.items.forEach(item => {
+    if (allItems.some(i => i.id === item.id)) syncItemInList(item);
+    else allItems.push(item);
+  });
+  delta.deleted.forEach(tombstone => removeItemFromList(tombstone.id));
+  const categories = delta.metadata?.categories || [];
+  if (categories.join('\n') !== getCategoryList().join('\n')) populateCategories(categories);
+  roadmapData.items = allItems;
+  roadmapData.metadata = delta.metadata;
+  roadmapData.revision = delta.revision;
+  roadmapData.last_updated = delta.last_updated;
+  showLastUpdated(delta.last_updated);
+}
+
+// Catch up on edits made elsewhere when a long-lived tab comes back into view
+let syncing = false;
+async function syncRoadmap() {
+  if (!roadmapData || syncing) return;
+  syncing = true;
+  try {
+    applyChanges(await fetchChanges(roadmapData.revision || 0));
+    applyFilters();
+  } catch (err) {
+    console.error('Sync error:', err);
+  } finally {
+    syncing = false;
+  }
+}
+
+document.addEventListener('visibilitychange', () => {
+  if (!document.hidden) syncRoadmap();
+});
+
+// ───── Live updates ─────
+// One SSE `change` event per save, with only the fields that changed. EventSource
+// reconnects on its own and resumes from the last event id; `resync` means the
+// server can't replay that far back, so fall back to a delta/snapshot sync.
+function applyEvent(event) {
+  if (!roadmapData || event.revision <= (roadmapData.revision || 0)) return;
+  event.changed.forEach(change => {
+    const item = allItems.find(i => i.id === change.id);
+    if (item) Object.assign(item, change.fields);
+    else if ('id' in change.fields) allItems.push(change.fields);
+  });
+  event.deleted.forEach(id => removeItemFromList(id));
+  if (event.metadata) {
+    const categories = event.metadata.categories || [];
+    if (categories.join('\n') !== getCategoryList().join('\n')) populateCategories(categories);
+    roadmapData.metadata = event.metadata;
+  }
+  roadmapData.items = allItems;
+  roadmapData.revision = event.revision;
+  if (!draggedItem) applyFilters();  // Don't re-render the board mid-drag
+}
+
+function connectStream() {
+  if (!window.EventSource) return;
+  const stream = new EventSource(`${API}/roadmap/stream?since=${roadmapData.revision || 0}`);
+  stream.addEventListener('change', e => applyEvent(JSON.parse(e.data)));
+  stream.addEventListener('resync', () => syncRoadmap());
+}
+
 // ───── Init ─────
 async function init() {
   initTheme();
 
   try {
-    roadmapData = await fetchRoadmap();
-    allItems = roadmapData.items || [];
-    filteredItems = [...allItems];
-
-    populateCategories(roadmapData.metadata?.categories || []);
-
-    if (roadmapData.last_updated) {
-      const d = new Date(roadmapData.last_updated);
-      lastUpdated.textContent = `Updated ${d.toLocaleDateString('en-US', { month: 'short', day: 'numeric', year: 'numeric' })}`;
-    }
+    applySnapshot(await fetchRoadmap());
 
     loadingState.remove();
     applyFilters();
+    connectStream();
   } catch (err) {
     loadingState.innerHTML = `
       <div class="empty-state">
@@ -1705,6 +1849,6 @@ async function init() {
   }
 }
 
-searchInput.addEventListener('input', applyFilters);
+searchInput.addEventListener('input', onSearchInput);
 
 document.addEventListener('DOMContentLoaded', init);
@@ -217,13 +217,15 @@ async function safeJson(res) {
 }
 
 // ───── Comments ─────
-async function loadComments(itemId) {
-  const res = await fetch(`/api/roadmap/items/${itemId}/comments`, {
+// One page, newest first: {comments, total, next_before}
+async function loadComments(itemId, before = null) {
+  const query = before === null ? '' : `?before=${before}`;
+  const res = await fetch(`/api/roadmap/items/${itemId}/comments${query}`, {
     credentials: 'same-origin',
   });
   const data = await safeJson(res);
   if (!res.ok) throw new Error(data.error || 'Failed to load comments');
-  return data.comments || [];
+  return data;
 }
 
 async function addComment(itemId, text) {
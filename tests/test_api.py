@@ -2,6 +2,8 @@
 
 import json
 
+import pytest
+
 
 # ---------------------------------------------------------------------------
 # Flask starts / health
@@ -233,19 +235,53 @@ class TestEditHistory:
     def test_status_change_tracked(self, client):
         client.put('/api/roadmap/items/1/status',
                    json={'status': 'PLANNED'})
-        resp = client.get('/api/roadmap/items/1')
-        item = resp.get_json()
-        assert len(item['edit_history']) > 0
-        assert item['edit_history'][-1]['field'] == 'status'
+        history = client.get('/api/roadmap/items/1/history').get_json()
+        assert history['total'] > 0
+        assert history['entries'][0]['field'] == 'status'
+        item = client.get('/api/roadmap/items/1').get_json()
+        assert item['last_edit']['new_value'] == 'PLANNED'
+        assert item['history_count'] == history['total']
+        assert 'edit_history' not in item
 
     def test_field_update_tracked(self, client):
         client.put('/api/roadmap/items/1',
                    json={'name': 'Test Item Alpha', 'category': 'Reliability'})
-        resp = client.get('/api/roadmap/items/1')
-        item = resp.get_json()
-        history_fields = [h['field'] for h in item['edit_history']]
+        history = client.get('/api/roadmap/items/1/history').get_json()
+        history_fields = [h['field'] for h in history['entries']]
         assert 'category' in history_fields
 
+    def test_history_pages_newest_first(self, client):
+        for status in ('PLANNED', 'NEXT', 'IN_PROGRESS', 'DONE'):
+            client.put('/api/roadmap/items/1/status', json={'status': status})
+        page = client.get('/api/roadmap/items/1/history?limit=3&field=status').get_json()
+        assert [e['new_value'] for e in page['entries']] == ['DONE', 'IN_PROGRESS', 'NEXT']
+        assert page['total'] == 4
+        rest = client.get(f'/api/roadmap/items/1/history?limit=3&field=status&before={page["next_before"]}').get_json()
+        assert [e['new_value'] for e in rest['entries']] == ['PLANNED']
+        assert rest['next_before'] is None
+
+    def test_history_is_not_in_the_document(self, client, tmp_roadmap):
+        client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            item = json.load(f)['items'][0]
+        assert 'edit_history' not in item
+        assert item['history_count'] == 1
+        assert client.get('/api/roadmap/items/99/history').status_code == 404
+        assert client.get('/api/roadmap/items/1/history?before=0').status_code == 400
+
+    def test_legacy_inline_history_is_served_then_moved(self, client, tmp_roadmap):
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['items'][0]['edit_history'] = [{'timestamp': '2026-01-02T00:00:00Z', 'field': 'owner',
+                                             'old_value': None, 'new_value': 'Zev', 'edited_by': 'Zev'}]
+        with open(tmp_roadmap, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        assert client.get('/api/roadmap/items/1/history').get_json()['total'] == 1
+        client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        history = client.get('/api/roadmap/items/1/history').get_json()
+        assert [e['field'] for e in history['entries']] == ['status', 'owner']
+        assert client.get('/api/roadmap/items/1').get_json()['history_count'] == 2
+
 
 # ---------------------------------------------------------------------------
 # Authenticated API Create endpoint
@@ -291,10 +327,9 @@ class TestAPICreateEndpoint:
                            json={'name': 'History Test', 'status': 'NEXT'},
                            headers=self._auth_header())
         new_id = resp.get_json()['id']
-        item_resp = client.get(f'/api/roadmap/items/{new_id}')
-        item = item_resp.get_json()
-        assert len(item['edit_history']) == 1
-        assert item['edit_history'][0]['new_value'] == 'NEXT'
+        history = client.get(f'/api/roadmap/items/{new_id}/history').get_json()
+        assert history['total'] == 1
+        assert history['entries'][0]['new_value'] == 'NEXT'
 
     def test_create_auto_dates_done(self, client):
         resp = client.post('/api/roadmap/items/create',
@@ -304,3 +339,367 @@ class TestAPICreateEndpoint:
         item_resp = client.get(f'/api/roadmap/items/{new_id}')
         item = item_resp.get_json()
         assert item['completed_date'] is not None
+
+
+# ---------------------------------------------------------------------------
+# Revisions, ETags and If-Match
+# ---------------------------------------------------------------------------
+
+class TestOptimisticConcurrency:
+    """Prevent: concurrent edits silently overwriting each other."""
+
+    def test_roadmap_and_item_have_etags(self, client):
+        assert client.get('/api/roadmap').headers.get('ETag')
+        assert client.get('/api/roadmap/items/1').headers.get('ETag')
+
+    def test_mutation_bumps_revisions(self, client):
+        doc_before = client.get('/api/roadmap').get_json().get('revision', 0)
+        resp = client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        item = resp.get_json()
+        assert item['revision'] == doc_before + 1
+        assert client.get('/api/roadmap').get_json()['revision'] == doc_before + 1
+        assert resp.headers['ETag'] == client.get('/api/roadmap/items/1').headers['ETag']
+
+    def test_matching_if_match_succeeds(self, client):
+        etag = client.get('/api/roadmap/items/1').headers['ETag']
+        resp = client.put('/api/roadmap/items/1/status', json={'status': 'PLANNED'},
+                          headers={'If-Match': etag})
+        assert resp.status_code == 200
+
+    def test_stale_if_match_returns_412(self, client):
+        etag = client.get('/api/roadmap/items/1').headers['ETag']
+        client.put('/api/roadmap/items/1/status', json={'status': 'PLANNED'})
+        resp = client.put('/api/roadmap/items/1',
+                          json={'name': 'Overwrite'}, headers={'If-Match': etag})
+        assert resp.status_code == 412
+        assert client.get('/api/roadmap/items/1').get_json()['name'] == 'Test Item Alpha'
+        resp = client.delete('/api/roadmap/items/1', headers={'If-Match': etag})
+        assert resp.status_code == 412
+
+    def test_stale_if_match_on_vote_and_comment(self, logged_in_client):
+        etag = logged_in_client.get('/api/roadmap/items/1').headers['ETag']
+        logged_in_client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        resp = logged_in_client.post('/api/roadmap/items/1/vote', json={'vote': 'up'},
+                                     headers={'If-Match': etag})
+        assert resp.status_code == 412
+        resp = logged_in_client.post('/api/roadmap/items/1/comments', json={'comment': 'Hi'},
+                                     headers={'If-Match': etag})
+        assert resp.status_code == 412
+
+    def test_wildcard_if_match(self, client):
+        resp = client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'},
+                          headers={'If-Match': '*'})
+        assert resp.status_code == 200
+
+    def test_concurrent_creates_are_not_lost(self, app):
+        import threading
+        def create(n):
+            app.test_client().post('/api/roadmap/items', json={'name': f'Parallel {n}'})
+        threads = [threading.Thread(target=create, args=(n,)) for n in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        items = app.test_client().get('/api/roadmap').get_json()['items']
+        ids = [i['id'] for i in items]
+        assert len(items) == 22
+        assert len(set(ids)) == 22
+
+
+# ---------------------------------------------------------------------------
+# PATCH partial updates
+# ---------------------------------------------------------------------------
+
+class TestPatchItem:
+    """Prevent: one-field edits clobbering other fields or logging phantom changes."""
+
+    def test_returns_only_changed_fields(self, client):
+        before = client.get('/api/roadmap/items/1').get_json()
+        resp = client.patch('/api/roadmap/items/1', json={'owner': 'Ana', 'category': 'DevOps'})
+        body = resp.get_json()
+        assert resp.status_code == 200
+        assert body['changed'] == {'owner': 'Ana', 'history_count': 1, 'last_edit': body['history'][0]}
+        assert body['revision'] == before.get('revision', 0) + 1
+        assert resp.headers['ETag'] == f'"1.{body["revision"]}"'
+        item = client.get('/api/roadmap/items/1').get_json()
+        assert item['owner'] == 'Ana' and item['name'] == before['name']
+        assert item['last_edit']['field'] == 'owner' and item['history_count'] == 1
+
+    def test_status_patch_fills_dates(self, client):
+        body = client.patch('/api/roadmap/items/1', json={'status': 'DONE', 'impact_score': '9'}).get_json()
+        assert set(body['changed']) == {'status', 'completed_date', 'impact_score', 'history_count', 'last_edit'}
+        assert body['changed']['impact_score'] == 9.0
+        assert [h['field'] for h in body['history']] == ['status', 'impact_score', 'completed_date']
+
+    def test_no_op_patch_does_not_save(self, client):
+        revision = client.get('/api/roadmap').get_json().get('revision', 0)
+        body = client.patch('/api/roadmap/items/2', json={'owner': 'Zev'}).get_json()
+        assert (body['changed'], body['history']) == ({}, [])
+        assert client.get('/api/roadmap').get_json().get('revision', 0) == revision
+
+    def test_validates_only_sent_fields(self, client):
+        assert client.patch('/api/roadmap/items/1', json={'ease_score': 11}).status_code == 400
+        assert client.patch('/api/roadmap/items/1', json={'name': ' '}).status_code == 400
+        assert client.patch('/api/roadmap/items/1', json={'votes': []}).status_code == 400
+        assert client.patch('/api/roadmap/items/99', json={'owner': 'Ana'}).status_code == 404
+
+    def test_stale_if_match_returns_412(self, client):
+        etag = client.get('/api/roadmap/items/1').headers['ETag']
+        client.patch('/api/roadmap/items/1', json={'phase': 'Week 3'})
+        resp = client.patch('/api/roadmap/items/1', json={'phase': 'Week 4'}, headers={'If-Match': etag})
+        assert resp.status_code == 412
+
+
+# ---------------------------------------------------------------------------
+# Pre-serialized, compressed GET /api/roadmap
+# ---------------------------------------------------------------------------
+
+class TestRoadmapResponseCache:
+    """Prevent: re-encoding the whole roadmap per page load, or serving a stale body."""
+
+    def _builds(self, client):
+        return client.get('/api/health').get_json()['responses']['builds']
+
+    def test_gzip_negotiated(self, client):
+        import gzip
+        resp = client.get('/api/roadmap', headers={'Accept-Encoding': 'gzip'})
+        assert resp.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in resp.headers['Vary']
+        data = json.loads(gzip.decompress(resp.data))
+        assert [i['id'] for i in data['items']] == [1, 2]
+
+    def test_brotli_preferred_when_available(self, client):
+        brotli = pytest.importorskip('brotli')
+        resp = client.get('/api/roadmap', headers={'Accept-Encoding': 'gzip, br'})
+        assert resp.headers['Content-Encoding'] == 'br'
+        assert json.loads(brotli.decompress(resp.data))['items']
+
+    def test_identity_without_accept_encoding(self, client):
+        resp = client.get('/api/roadmap')
+        assert 'Content-Encoding' not in resp.headers
+        assert resp.get_json()['items']
+
+    def test_if_none_match_returns_304(self, client):
+        etag = client.get('/api/roadmap').headers['ETag']
+        resp = client.get('/api/roadmap', headers={'If-None-Match': etag})
+        assert resp.status_code == 304
+        assert resp.data == b''
+        resp = client.get('/api/roadmap', headers={'If-None-Match': f'W/{etag}'})
+        assert resp.status_code == 304
+
+    def test_body_built_once_per_revision(self, client):
+        client.get('/api/roadmap')
+        builds = self._builds(client)
+        for _ in range(3):
+            client.get('/api/roadmap', headers={'Accept-Encoding': 'gzip'})
+        assert self._builds(client) == builds
+
+    def test_write_invalidates_body_and_etag(self, client):
+        old = client.get('/api/roadmap').headers['ETag']
+        client.put('/api/roadmap/items/1/status', json={'status': 'DONE'})
+        resp = client.get('/api/roadmap', headers={'If-None-Match': old})
+        assert resp.status_code == 200
+        assert resp.headers['ETag'] != old
+        assert resp.get_json()['items'][0]['status'] == 'DONE'
+
+
+# ---------------------------------------------------------------------------
+# Field projection and cursor pagination on /items
+# ---------------------------------------------------------------------------
+
+class TestItemsProjectionAndPagination:
+    """Prevent: card lists shipping every vote/comment/history entry, or pages skipping items."""
+
+    def test_fields_projection(self, client):
+        items = client.get('/api/roadmap/items?fields=name,status').get_json()
+        assert items == [
+            {'id': 1, 'name': 'Test Item Alpha', 'status': 'BACKLOG'},
+            {'id': 2, 'name': 'Test Item Beta', 'status': 'IN_PROGRESS'},
+        ]
+
+    def test_exclude(self, client):
+        item = client.get('/api/roadmap/items?exclude=edit_history,comments,id').get_json()[0]
+        assert 'edit_history' not in item and 'comments' not in item
+        assert item['id'] == 1 and 'votes' in item
+
+    def test_cursor_pages_cover_board_once(self, client):
+        for n in range(5):
+            client.post('/api/roadmap/items', json={'name': f'Paged {n}'})
+        seen, cursor = [], None
+        while True:
+            url = '/api/roadmap/items?limit=3&fields=id' + (f'&cursor={cursor}' if cursor else '')
+            resp = client.get(url)
+            seen += [i['id'] for i in resp.get_json()]
+            cursor = resp.headers.get('X-Next-Cursor')
+            if cursor is None:
+                break
+        assert seen == list(range(1, 8))
+
+    def test_pages_stay_stable_across_deletes(self, client):
+        for n in range(3):
+            client.post('/api/roadmap/items', json={'name': f'Paged {n}'})
+        first = client.get('/api/roadmap/items?limit=2&fields=id')
+        client.delete('/api/roadmap/items/1')
+        rest = client.get(f'/api/roadmap/items?limit=10&fields=id&cursor={first.headers["X-Next-Cursor"]}')
+        assert [i['id'] for i in rest.get_json()] == [3, 4, 5]
+
+    def test_pagination_with_filters(self, client):
+        client.post('/api/roadmap/items', json={'name': 'Also backlog'})
+        resp = client.get('/api/roadmap/items?status=BACKLOG&limit=1&fields=id')
+        assert [i['id'] for i in resp.get_json()] == [1]
+        resp = client.get(f'/api/roadmap/items?status=BACKLOG&limit=1&fields=id&cursor={resp.headers["X-Next-Cursor"]}')
+        assert [i['id'] for i in resp.get_json()] == [3]
+        assert 'X-Next-Cursor' not in resp.headers
+
+    def test_bad_limit_and_cursor(self, client):
+        assert client.get('/api/roadmap/items?limit=0').status_code == 400
+        assert client.get('/api/roadmap/items?limit=abc').status_code == 400
+        assert client.get('/api/roadmap/items?cursor=-1').status_code == 400
+
+    def test_tampered_cursor_is_rejected(self, client):
+        from query import encode_cursor
+        for sort, key in (('priority_score', ['abc', 1]), ('added_date', [7, 1]),
+                          ('id', [None, 1]), (None, [1, True])):
+            url = f'/api/roadmap/items?limit=1&cursor={encode_cursor(key)}'
+            assert client.get(url + (f'&sort={sort}' if sort else '')).status_code == 400
+        ok = f'/api/roadmap/items?limit=1&sort=priority_score&cursor={encode_cursor([None, 1])}'
+        assert client.get(ok).status_code == 200
+
+
+class TestItemsQuery:
+    """Prevent: /api/roadmap/items filters, sorts and cursors disagreeing after writes."""
+
+    def _ids(self, client, query):
+        return [i['id'] for i in client.get(f'/api/roadmap/items?{query}').get_json()]
+
+    def _add(self, client, **fields):
+        return client.post('/api/roadmap/items', json={'name': 'Queried', **fields}).get_json()['id']
+
+    def test_in_lists_and_owner(self, client):
+        assert self._ids(client, 'status=BACKLOG,in_progress') == [1, 2]
+        assert self._ids(client, 'category=devops&category=Reliability&status=BACKLOG') == [1]
+        assert self._ids(client, 'owner=nobody,zev') == [1, 2]
+        assert self._ids(client, 'owner=ana') == []
+
+    def test_score_ranges_and_sort_follow_writes(self, client):
+        a = self._add(client, impact_score=9, ease_score=9)
+        b = self._add(client, impact_score=8.5, ease_score=2)
+        assert self._ids(client, 'impact_min=8&sort=-impact_score') == [a, b]
+        assert self._ids(client, 'impact_min=8&ease_max=5') == [b]
+        client.put(f'/api/roadmap/items/{a}', json={'name': 'Queried', 'impact_score': 1})
+        assert self._ids(client, 'impact_min=8&sort=-impact_score') == [b]
+        assert self._ids(client, 'impact_max=1') == [a]
+
+    def test_has_votes_and_date_range(self, logged_in_client):
+        logged_in_client.post('/api/roadmap/items/2/vote', json={'vote': 'up'})
+        assert self._ids(logged_in_client, 'has_votes=true') == [2]
+        assert self._ids(logged_in_client, 'has_votes=false') == [1]
+        logged_in_client.put('/api/roadmap/items/1/status', json={'status': 'DONE'})
+        done = logged_in_client.get('/api/roadmap/items/1').get_json()['completed_date']
+        assert self._ids(logged_in_client, f'completed_date_from={done}&completed_date_to={done}') == [1]
+        assert self._ids(logged_in_client, 'completed_date_to=2000-01-01') == []
+
+    def test_sorted_cursor_pages_cover_every_item_once(self, client):
+        for score in (5, 9, 5, 1):
+            self._add(client, ease_score=score, impact_score=score)
+        seen, cursor = [], None
+        while True:
+            url = '/api/roadmap/items?sort=-priority_score&limit=2&fields=name' + (f'&cursor={cursor}' if cursor else '')
+            resp = client.get(url)
+            seen += [(i['priority_score'], i['id']) for i in resp.get_json()]
+            cursor = resp.headers.get('X-Next-Cursor')
+            if cursor is None:
+                break
+        assert sorted(i for _, i in seen) == list(range(1, 7))
+        assert [s for s, _ in seen] == sorted((s for s, _ in seen), reverse=True)
+
+    def test_bad_query_parameters(self, client):
+        for query in ('impact_min=high', 'start_date_from=May', 'has_votes=maybe', 'sort=name'):
+            assert client.get(f'/api/roadmap/items?{query}').status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# Batch mutations
+# ---------------------------------------------------------------------------
+
+class TestBatchEndpoint:
+    """Prevent: partial batches applied in atomic mode, or one save per operation."""
+
+    HEADERS = {'Authorization': f'Bearer {TestAPICreateEndpoint.API_KEY}'}
+
+    def _batch(self, client, operations, mode=None):
+        body = {'operations': operations}
+        if mode:
+            body['mode'] = mode
+        return client.post('/api/roadmap/items/batch', json=body, headers=self.HEADERS)
+
+    def _revision(self, client):
+        return client.get('/api/roadmap').get_json().get('revision', 0)
+
+    def test_requires_api_key(self, client):
+        resp = client.post('/api/roadmap/items/batch', json={'operations': []})
+        assert resp.status_code == 401
+
+    def test_mixed_operations_in_one_save(self, client):
+        before = self._revision(client)
+        resp = self._batch(client, [
+            {'op': 'create', 'item': {'name': 'Batch A'}},
+            {'op': 'create', 'item': {'name': 'Batch B', 'status': 'NEXT'}},
+            {'op': 'status', 'id': 1, 'status': 'done'},
+            {'op': 'update', 'id': 2, 'item': {'name': 'Beta Renamed', 'status': 'IN_PROGRESS'}},
+            {'op': 'delete', 'id': 3},
+        ])
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert (body['applied'], body['failed']) == (5, 0)
+        assert [r['status'] for r in body['results']] == [201, 201, 200, 200, 200]
+        assert body['revision'] == before + 1
+        assert self._revision(client) == before + 1
+        items = {i['id']: i for i in client.get('/api/roadmap/items').get_json()}
+        assert sorted(items) == [1, 2, 4]
+        assert items[1]['status'] == 'DONE' and items[1]['completed_date']
+        assert items[2]['name'] == 'Beta Renamed'
+        assert items[4]['last_edit']['edited_by'] == 'API'
+
+    def test_atomic_failure_applies_nothing(self, client):
+        before = self._revision(client)
+        resp = self._batch(client, [
+            {'op': 'status', 'id': 1, 'status': 'DONE'},
+            {'op': 'delete', 'id': 99},
+            {'op': 'create', 'item': {'name': ''}},
+        ])
+        assert resp.status_code == 409
+        assert [r['status'] for r in resp.get_json()['results']] == [424, 404, 400]
+        assert self._revision(client) == before
+        assert client.get('/api/roadmap/items/1').get_json()['status'] == 'BACKLOG'
+
+    def test_best_effort_applies_the_rest(self, client):
+        resp = self._batch(client, [
+            {'op': 'status', 'id': 1, 'status': 'DONE'},
+            {'op': 'status', 'id': 2, 'status': 'NOPE'},
+            {'op': 'delete', 'id': 2},
+            {'op': 'delete', 'id': 2},
+        ], mode='best_effort')
+        body = resp.get_json()
+        assert resp.status_code == 200
+        assert [r['status'] for r in body['results']] == [200, 400, 200, 404]
+        assert (body['applied'], body['failed']) == (2, 2)
+        assert [i['id'] for i in client.get('/api/roadmap/items').get_json()] == [1]
+
+    def test_create_ignores_a_client_id(self, client):
+        resp = self._batch(client, [{'op': 'create', 'id': 1, 'item': {'name': 'Not a duplicate'}}])
+        assert resp.get_json()['results'][0]['id'] == 3
+        ids = [i['id'] for i in client.get('/api/roadmap/items').get_json()]
+        assert ids == [1, 2, 3]
+
+    def test_stale_revision_is_rejected(self, client):
+        client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        resp = self._batch(client, [{'op': 'delete', 'id': 1, 'revision': 0}])
+        assert resp.get_json()['results'][0]['status'] == 412
+        assert client.get('/api/roadmap/items/1').status_code == 200
+
+    def test_rejects_malformed_batches(self, client):
+        assert self._batch(client, []).status_code == 400
+        assert self._batch(client, [{'op': 'create', 'item': {'name': 'x'}}], mode='maybe').status_code == 400
+        resp = self._batch(client, [{'op': 'explode', 'id': 1}])
+        assert resp.get_json()['results'][0]['status'] == 400
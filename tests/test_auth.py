@@ -134,13 +134,13 @@ class TestVoting:
                                      json={'vote': 'up'})
         assert resp.status_code == 404
 
-    def test_vote_tracked_in_history(self, logged_in_client):
+    def test_vote_logged_outside_history(self, logged_in_client, tmp_path):
         logged_in_client.post('/api/roadmap/items/1/vote',
                               json={'vote': 'up'})
-        resp = logged_in_client.get('/api/roadmap/items/1')
-        item = resp.get_json()
-        vote_entries = [h for h in item['edit_history'] if h['field'] == 'votes']
-        assert len(vote_entries) > 0
+        resp = logged_in_client.get('/api/roadmap/items/1/history?field=votes')
+        assert resp.get_json()['entries'] == []
+        log = (tmp_path / 'votes.log').read_text(encoding='utf-8').splitlines()
+        assert len(log) == 1 and json.loads(log[0])[1:] == [1, 1, 'up', 1]
 
     def test_vote_default_is_up(self, logged_in_client):
         """Omitting vote type defaults to 'up'."""
@@ -243,9 +243,8 @@ class TestComments:
     def test_comment_tracked_in_history(self, logged_in_client):
         logged_in_client.post('/api/roadmap/items/1/comments',
                               json={'comment': 'History test'})
-        resp = logged_in_client.get('/api/roadmap/items/1')
-        item = resp.get_json()
-        comment_entries = [h for h in item['edit_history'] if h['field'] == 'comments']
+        resp = logged_in_client.get('/api/roadmap/items/1/history?field=comments')
+        comment_entries = resp.get_json()['entries']
         assert len(comment_entries) > 0
 
     def test_comments_preserved_on_item_update(self, logged_in_client):
@@ -260,3 +259,26 @@ class TestComments:
         comments = resp.get_json()['comments']
         assert len(comments) == 1
         assert comments[0]['comment'] == 'Should survive'
+
+    def test_comments_paginate_newest_first(self, logged_in_client):
+        for n in range(5):
+            logged_in_client.post('/api/roadmap/items/1/comments', json={'comment': f'Note {n}'})
+        page = logged_in_client.get('/api/roadmap/items/1/comments?limit=2').get_json()
+        assert page['total'] == 5
+        assert [c['comment'] for c in page['comments']] == ['Note 4', 'Note 3']
+        rest = logged_in_client.get(
+            f'/api/roadmap/items/1/comments?limit=10&before={page["next_before"]}').get_json()
+        assert [c['comment'] for c in rest['comments']] == ['Note 2', 'Note 1', 'Note 0']
+        assert rest['next_before'] is None
+
+    def test_comment_bodies_stay_out_of_the_document(self, logged_in_client, tmp_roadmap):
+        resp = logged_in_client.post('/api/roadmap/items/1/comments', json={'comment': 'Kept aside'})
+        comment_id = resp.get_json()['comment']['id']
+        logged_in_client.put(f'/api/roadmap/items/1/comments/{comment_id}', json={'comment': 'Edited aside'})
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            text = f.read()
+        assert 'aside' not in text
+        item = logged_in_client.get('/api/roadmap/items/1').get_json()
+        assert item['comment_count'] == 1 and 'comments' not in item
+        logged_in_client.delete(f'/api/roadmap/items/1/comments/{comment_id}')
+        assert logged_in_client.get('/api/roadmap/items/1').get_json()['comment_count'] == 0
@@ -0,0 +1,145 @@
+"""Delta sync and live stream tests — prevent clients missing changes or deletions."""
+
+import json
+
+import pytest
+
+from changes import ChangeLog
+
+
+def items(*ids):
+    return [{'id': i} for i in ids]
+
+
+class TestChangeLog:
+    """Prevent: wrong deltas after deletes, id reuse or log overflow."""
+
+    def test_collapses_to_latest_state(self):
+        log = ChangeLog()
+        log.sync(10, generation=1)
+        log.record(11, items(1), [], before=1, after=2)
+        log.record(12, items(2), [1], before=2, after=3)
+        log.record(13, items(1), [], before=3, after=4)  # Deleted id reused by a create
+        assert log.since(10) == ({2: 12, 1: 13}, {})
+        assert log.since(12) == ({1: 13}, {})
+        assert log.since(13) == ({}, {})
+
+    def test_too_far_behind_returns_none(self):
+        log = ChangeLog(capacity=2)
+        log.sync(0, generation=1)
+        for rev in (1, 2, 3):
+            log.record(rev, items(rev), [], before=rev, after=rev + 1)
+        assert log.floor == 1
+        assert log.since(0) is None
+        assert log.since(1) == ({2: 2, 3: 3}, {})
+
+    def test_unrecorded_generation_resets(self):
+        log = ChangeLog()
+        log.sync(5, generation=1)
+        log.record(6, items(1), [], before=1, after=2)
+        log.sync(9, generation=7)  # Reloaded from disk: saves 7-9 weren't seen
+        assert log.since(6) is None
+        assert log.since(9) == ({}, {})
+
+    def test_events_carry_only_changed_fields(self):
+        log = ChangeLog()
+        log.sync(0, generation=1)
+        item = {'id': 1, 'name': 'A', 'status': 'NEXT', 'revision': 1}
+        log.record(1, [item], [], before=1, after=2)
+        item.update(status='DONE', revision=2)
+        log.record(2, [item], [3], before=2, after=3)
+        first, second = [json.loads(event) for _, event in log.wait(0, timeout=0)]
+        assert first['changed'] == [{'id': 1, 'fields': item | {'status': 'NEXT', 'revision': 1}}]
+        assert second['changed'] == [{'id': 1, 'fields': {'status': 'DONE', 'revision': 2}}]
+        assert second['deleted'] == [3]
+
+    def test_wait_times_out_empty_and_flags_gaps(self):
+        log = ChangeLog()
+        log.sync(4, generation=1)
+        assert log.wait(4, timeout=0.01) == []
+        assert log.wait(3, timeout=0.01) is None
+
+
+class TestChangesEndpoint:
+    """Prevent: GET /api/roadmap/changes disagreeing with the full document."""
+
+    def _revision(self, client):
+        return client.get('/api/roadmap').get_json().get('revision', 0)
+
+    def test_returns_changed_items_and_tombstones(self, client):
+        since = self._revision(client)
+        client.put('/api/roadmap/items/1/status', json={'status': 'DONE'})
+        new_id = client.post('/api/roadmap/items', json={'name': 'Fresh'}).get_json()['id']
+        client.delete('/api/roadmap/items/2')
+        delta = client.get(f'/api/roadmap/changes?since={since}').get_json()
+        assert delta['snapshot'] is False
+        assert delta['revision'] == since + 3
+        assert [(i['id'], i['revision']) for i in delta['items']] == [(1, since + 1), (new_id, since + 2)]
+        assert delta['items'][0]['status'] == 'DONE'
+        assert delta['deleted'] == [{'id': 2, 'revision': since + 3}]
+        assert delta['metadata']['total_items'] == 2
+
+    def test_up_to_date_client_gets_empty_delta(self, client):
+        client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        revision = self._revision(client)
+        delta = client.get(f'/api/roadmap/changes?since={revision}').get_json()
+        assert (delta['items'], delta['deleted']) == ([], [])
+
+    def test_falls_back_to_snapshot(self, client, tmp_roadmap):
+        client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['items'][1]['name'] = 'Hand Edited'
+        with open(tmp_roadmap, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        delta = client.get('/api/roadmap/changes?since=0').get_json()
+        assert delta['snapshot'] is True
+        assert delta['roadmap']['items'][1]['name'] == 'Hand Edited'
+        future = client.get(f'/api/roadmap/changes?since={delta["revision"] + 5}').get_json()
+        assert future['snapshot'] is True
+
+    def test_since_is_required(self, client):
+        assert client.get('/api/roadmap/changes').status_code == 400
+        assert client.get('/api/roadmap/changes?since=abc').status_code == 400
+
+
+class TestChangeStream:
+    """Prevent: live board updates being lost across reconnects."""
+
+    @pytest.fixture(autouse=True)
+    def short_streams(self, monkeypatch):
+        import config
+        monkeypatch.setattr(config.Config, 'STREAM_MAX_SECONDS', 0.2)
+        monkeypatch.setattr(config.Config, 'STREAM_HEARTBEAT', 0.05)
+
+    def _events(self, client, **kwargs):
+        resp = client.get('/api/roadmap/stream', **kwargs)
+        assert resp.mimetype == 'text/event-stream'
+        events = []
+        for block in resp.get_data(as_text=True).split('\n\n'):
+            lines = [line for line in block.splitlines() if not line.startswith(':')]
+            fields = dict(line.split(': ', 1) for line in lines if ': ' in line)
+            if 'event' in fields:
+                events.append((fields['event'], int(fields['id']), json.loads(fields['data'])))
+        return events, resp.get_data(as_text=True)
+
+    def test_resumes_after_last_event_id(self, client):
+        start = client.get('/api/roadmap').get_json().get('revision', 0)
+        client.put('/api/roadmap/items/1/status', json={'status': 'DONE'})
+        client.delete('/api/roadmap/items/2')
+        events, _ = self._events(client, headers={'Last-Event-ID': str(start)})
+        assert [(kind, rev) for kind, rev, _ in events] == [('change', start + 1), ('change', start + 2)]
+        assert events[0][2]['changed'][0]['fields']['status'] == 'DONE'
+        assert events[1][2]['deleted'] == [2]
+        events, _ = self._events(client, query_string={'since': start + 1})
+        assert [rev for _, rev, _ in events] == [start + 2]
+
+    def test_idle_stream_sends_heartbeats(self, client):
+        events, raw = self._events(client)
+        assert events == []
+        assert raw.startswith('retry: ')
+        assert ': ping' in raw
+
+    def test_unknown_history_triggers_resync(self, client):
+        events, _ = self._events(client, query_string={'since': 0}, headers={'Last-Event-ID': '99'})
+        assert events[0][0] == 'resync'
@@ -0,0 +1,64 @@
+"""Export tests — prevent spreadsheet downloads that drop, mangle or mis-filter items."""
+
+import csv
+import io
+import json
+
+from export import csv_chunks
+
+
+def read_csv(resp):
+    return list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+
+
+class TestCsvChunks:
+    """Prevent: unsafe or nested cells in the CSV."""
+
+    def test_cells_are_flat_and_formulas_escaped(self):
+        items = [{'id': 1, 'name': '=HYPERLINK("x")', 'impact_score': -1.5, 'votes': {'3': 'up'},
+                  'start_date': None}]
+        text = ''.join(csv_chunks(items, ['id', 'name', 'impact_score', 'votes', 'start_date']))
+        row = next(csv.DictReader(io.StringIO(text)))
+        assert row == {'id': '1', 'name': '\'=HYPERLINK("x")', 'impact_score': '-1.5',
+                       'votes': '{"3":"up"}', 'start_date': ''}
+
+
+class TestExportEndpoint:
+    """Prevent: export ignoring get_items' filters and projection."""
+
+    def test_csv_with_filters(self, client):
+        resp = client.get('/api/roadmap/export?status=in_progress')
+        assert resp.status_code == 200
+        assert resp.mimetype == 'text/csv'
+        assert 'attachment' in resp.headers['Content-Disposition']
+        rows = read_csv(resp)
+        assert [(r['id'], r['status'], r['priority_score']) for r in rows] == [('2', 'IN_PROGRESS', '5.5')]
+        assert 'votes' not in rows[0] and 'expected_delivery' in rows[0]
+
+    def test_csv_fields_and_sort(self, client):
+        rows = read_csv(client.get('/api/roadmap/export?fields=name,priority_score&sort=priority_score'))
+        assert [list(r) for r in rows][0] == ['id', 'name', 'priority_score']
+        assert [r['id'] for r in rows] == ['2', '1']
+
+    def test_ndjson_matches_items(self, client):
+        resp = client.get('/api/roadmap/export?format=ndjson&exclude=description')
+        assert resp.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        items = client.get('/api/roadmap/items?exclude=description').get_json()
+        assert lines == items
+
+    def test_rejects_bad_parameters(self, client):
+        assert client.get('/api/roadmap/export?format=xlsx').status_code == 400
+        assert client.get('/api/roadmap/export?impact_min=high').status_code == 400
+
+    def test_sqlite_streams_in_batches(self, app, monkeypatch):
+        import config
+        import storage
+        monkeypatch.setattr(config.Config, 'ROADMAP_STORAGE', 'sqlite')
+        monkeypatch.setattr(storage, 'ITER_BATCH', 1)
+        client = app.test_client()
+        client.post('/api/roadmap/items', json={'name': 'Third'})
+        rows = read_csv(client.get('/api/roadmap/export?fields=name'))
+        assert [r['name'] for r in rows] == ['Test Item Alpha', 'Test Item Beta', 'Third']
+        rows = read_csv(client.get('/api/roadmap/export?status=backlog&fields=name'))
+        assert [r['name'] for r in rows] == ['Test Item Alpha', 'Third']
@@ -0,0 +1,79 @@
+"""Git auto-commit queue tests — prevent commit storms and lost commits."""
+
+import threading
+import time
+
+from gitqueue import GitCommitQueue
+
+
+class RecordingCommit:
+    def __init__(self):
+        self.calls = []
+        self.done = threading.Event()
+
+    def __call__(self, item_ids):
+        self.calls.append(item_ids)
+        self.done.set()
+
+
+class TestGitCommitQueue:
+    """Prevent: one git commit per vote, or pending changes never committed."""
+
+    def test_burst_becomes_one_commit(self):
+        commit = RecordingCommit()
+        queue = GitCommitQueue(commit, window=0.2, max_changes=100)
+        for item_id in (3, 1, 3, 2):
+            queue.notify([item_id])
+        assert queue.stats()['queue_depth'] == 4
+        assert commit.done.wait(2)
+        assert commit.calls == [[1, 2, 3]]
+        assert queue.stats()['queue_depth'] == 0
+
+    def test_nothing_committed_inside_window(self):
+        commit = RecordingCommit()
+        queue = GitCommitQueue(commit, window=60, max_changes=100)
+        queue.notify([1])
+        time.sleep(0.1)
+        assert commit.calls == []
+
+    def test_max_changes_commits_early(self):
+        commit = RecordingCommit()
+        queue = GitCommitQueue(commit, window=60, max_changes=3)
+        for item_id in (1, 2, 3):
+            queue.notify([item_id])
+        assert commit.done.wait(2)
+        assert commit.calls == [[1, 2, 3]]
+
+    def test_flush_commits_immediately(self):
+        commit = RecordingCommit()
+        queue = GitCommitQueue(commit, window=60, max_changes=100)
+        queue.notify([7])
+        assert queue.flush() is True
+        assert commit.calls == [[7]]
+        assert queue.flush() is False
+
+    def test_stats_report_latency(self):
+        queue = GitCommitQueue(lambda ids: time.sleep(0.01), window=60)
+        queue.notify([1])
+        queue.flush()
+        stats = queue.stats()
+        assert stats['commits'] == 1
+        assert stats['last_commit_ms'] >= 10
+        assert stats['last_commit_at'].endswith('Z')
+
+
+class TestGitQueueWiring:
+    """Prevent: saves bypassing the queue and committing inside the request."""
+
+    def test_save_notifies_queue(self, app, client, monkeypatch):
+        import config
+        import app as app_module
+        commit = RecordingCommit()
+        monkeypatch.setattr(config.Config, 'GIT_AUTO_COMMIT', True)
+        monkeypatch.setattr(app_module, 'git_queue', GitCommitQueue(commit, window=60))
+        client.put('/api/roadmap/items/2/status', json={'status': 'DONE'})
+        client.delete('/api/roadmap/items/1')
+        assert commit.calls == []
+        assert client.get('/api/health').get_json()['git']['queue_depth'] == 2
+        app_module.git_queue.flush()
+        assert commit.calls == [[1, 2]]
@@ -0,0 +1,98 @@
+"""Dependency graph tests — prevent wrong blocked flags, missed cycles or bad critical paths."""
+
+from graph import DependencyGraph, build_hours, parse_refs
+
+
+def make_items():
+    return [
+        {'id': 1, 'status': 'DONE', 'build_time': '2 hrs', 'dependencies': ''},
+        {'id': 2, 'status': 'BACKLOG', 'build_time': '3-4 hrs', 'dependencies': 'Auto-Config (#1)'},
+        {'id': 3, 'status': 'BACKLOG', 'build_time': '30 minutes', 'dependencies': '#2; Planhat'},
+        {'id': 4, 'status': 'NEXT', 'build_time': '1 hr', 'dependencies': 'Rubric (#2); #3; #99'},
+    ]
+
+
+class TestParsing:
+    """Prevent: free-text dependencies or build times read wrongly."""
+
+    def test_refs_and_hours(self):
+        assert parse_refs({'id': 5, 'dependencies': 'Maturity V1 (#12); #5; Fathom (#12), #3'}) == (12, 3)
+        assert parse_refs({'id': 5, 'dependencies': None}) == ()
+        assert build_hours('3-4 hrs') == 3.5
+        assert build_hours('45 minutes') == 0.75
+        assert build_hours('') == 0.0
+
+
+class TestDependencyGraph:
+    """Prevent: blocked sets drifting from the items after edits."""
+
+    def test_blocked_follows_status_and_edits(self):
+        items = make_items()
+        graph = DependencyGraph(items)
+        assert graph.blocked() == {3, 4}
+        items[1]['status'] = 'DONE'
+        graph.update(items[1])
+        assert graph.blocked() == {4}  # Still waits on #3
+        items[2]['status'] = 'DONE'
+        graph.update(items[2])
+        assert graph.blocked() == set()
+        items[3]['dependencies'] = '#5'
+        graph.update(items[3])
+        assert graph.blocked() == set()
+        graph.update({'id': 5, 'status': 'BACKLOG', 'dependencies': ''})
+        assert graph.blocked() == {4}
+        graph.remove(5)
+        assert graph.blocked() == set()
+        assert graph.blockers(4) == ([], [5])
+
+    def test_transitive_walks(self):
+        graph = DependencyGraph(make_items())
+        assert graph.walk(4) == [(2, 1), (3, 1), (1, 2)]
+        assert graph.walk(4, transitive=False) == [(2, 1), (3, 1)]
+        assert graph.walk(1, reverse=True) == [(2, 1), (3, 2), (4, 2)]
+
+    def test_cycles_and_critical_path(self):
+        items = make_items()
+        graph = DependencyGraph(items)
+        assert graph.cycles() == []
+        assert graph.critical_path() == (5.0, [1, 2, 3, 4])  # DONE #1 counts 0 hours
+        assert graph.critical_path(3) == (4.0, [1, 2, 3])
+        items[1]['dependencies'] = '#4'
+        graph.update(items[1])
+        assert graph.cycles() == [[2, 3, 4]]
+        hours, path = graph.critical_path()
+        assert len(path) == len(set(path))
+
+
+class TestDependencyEndpoints:
+    """Prevent: dependency endpoints disagreeing with item edits."""
+
+    def _chain(self, client):
+        a = client.post('/api/roadmap/items', json={'name': 'A', 'build_time': '2 hrs'}).get_json()['id']
+        b = client.post('/api/roadmap/items', json={'name': 'B', 'build_time': '3 hrs',
+                                                    'dependencies': f'A (#{a})'}).get_json()['id']
+        c = client.post('/api/roadmap/items', json={'name': 'C', 'dependencies': f'#{b}'}).get_json()['id']
+        return a, b, c
+
+    def test_blockers_dependents_and_critical_path(self, client):
+        a, b, c = self._chain(client)
+        resp = client.get(f'/api/roadmap/items/{c}/blockers?transitive=true').get_json()
+        assert resp['blocked'] is True
+        assert [(x['id'], x['depth']) for x in resp['blockers']] == [(b, 1), (a, 2)]
+        deps = client.get(f'/api/roadmap/items/{a}/dependents').get_json()['dependents']
+        assert [x['id'] for x in deps] == [b]
+        graph = client.get('/api/roadmap/dependencies').get_json()
+        assert graph['critical_path']['hours'] == 5.0
+        assert [x['id'] for x in graph['critical_path']['items']] == [a, b, c]
+        assert client.get('/api/roadmap/items/999/blockers').status_code == 404
+
+    def test_blocked_filter_tracks_status_changes(self, client):
+        a, b, c = self._chain(client)
+        blocked = [i['id'] for i in client.get('/api/roadmap/items?blocked=true').get_json()]
+        assert blocked == [2, b, c]  # Fixture item 2 waits on #1
+        client.put(f'/api/roadmap/items/{a}/status', json={'status': 'DONE'})
+        blocked = [i['id'] for i in client.get('/api/roadmap/items?blocked=true').get_json()]
+        assert blocked == [2, c]
+        unblocked = [i['id'] for i in client.get('/api/roadmap/items?blocked=false').get_json()]
+        assert b in unblocked and c not in unblocked
+        assert client.get('/api/roadmap/items?blocked=maybe').status_code == 400
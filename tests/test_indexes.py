@@ -0,0 +1,168 @@
+"""Index tests — prevent lookups and id allocation drifting from the item list."""
+
+from indexes import RoadmapCounters, RoadmapIndex
+from query import ItemQuery, QueryIndex
+
+
+def make_doc(*ids):
+    return {'items': [{'id': i, 'name': f'Item {i}', 'comments': [], 'votes': []} for i in ids]}
+
+
+class TestRoadmapIndex:
+    """Prevent: stale positions after create/delete, wrong or duplicate ids."""
+
+    def test_find_and_next_id(self):
+        index = RoadmapIndex(make_doc(1, 5, 3))
+        assert index.find(5) == (1, {'id': 5, 'name': 'Item 5', 'comments': [], 'votes': []})
+        assert index.find(99) == (None, None)
+        assert index.next_id() == 6
+
+    def test_add_and_remove_keep_positions(self):
+        doc = make_doc(1, 2, 3)
+        index = RoadmapIndex(doc)
+        index.add({'id': 4})
+        index.remove(2)
+        assert [i['id'] for i in doc['items']] == [1, 3, 4]
+        assert index.find(3)[0] == 1
+        assert index.find(4)[0] == 2
+        assert index.find(2) == (None, None)
+
+    def test_removing_max_id_matches_previous_allocation(self):
+        index = RoadmapIndex(make_doc(1, 2, 3))
+        index.remove(3)
+        assert index.next_id() == 3
+        index.remove(1)
+        assert index.next_id() == 3
+
+    def test_recovers_from_external_list_changes(self):
+        doc = make_doc(1, 2, 3)
+        index = RoadmapIndex(doc)
+        doc['items'].pop(0)
+        assert index.find(3) == (1, doc['items'][1])
+        assert index.find(1) == (None, None)
+
+    def test_query_in_id_order_follows_recorded_changes(self):
+        index = RoadmapIndex(make_doc(4, 1, 3))
+        assert [i['id'] for i in index.query(limit=2)] == [1, 3]
+        assert [i['id'] for i in index.query()] == [4, 1, 3]  # Board order when not paging
+        index.add({'id': 2})
+        index.remove(3)
+        index.record_changes([index.get(2)], [3])
+        assert [i['id'] for i in index.query(after=(1, 1))] == [2, 4]
+
+
+class TestRoadmapCounters:
+    """Prevent: dashboard counts drifting from the items after edits."""
+
+    def _items(self):
+        return [
+            {'id': 1, 'category': 'DevOps', 'status': 'DONE', 'owner': 'Zev', 'impact_score': 7.5},
+            {'id': 2, 'category': 'DevOps', 'status': 'NEXT', 'owner': None, 'impact_score': 10},
+            {'id': 3, 'category': 'Reliability', 'status': 'NEXT', 'impact_score': None},
+        ]
+
+    def test_initial_counts(self):
+        counts = RoadmapCounters(self._items()).snapshot()
+        assert counts['total_items'] == 3
+        assert counts['by_category'] == {'DevOps': 2, 'Reliability': 1}
+        assert counts['by_status'] == {'DONE': 1, 'NEXT': 2}
+        assert counts['by_owner'] == {'Zev': 1, 'Unassigned': 2}
+        assert counts['score_histograms']['impact_score'][7] == 1
+        assert counts['score_histograms']['impact_score'][9] == 1
+        assert sum(counts['score_histograms']['impact_score']) == 2
+
+    def test_update_uses_remembered_contribution(self):
+        items = self._items()
+        counters = RoadmapCounters(items)
+        items[0]['status'] = 'NEXT'
+        items[0]['category'] = 'Reliability'
+        counters.update(items[0])
+        counters.update(items[1])  # Unchanged: no-op
+        counters.remove(3)
+        counters.remove(3)
+        assert counters.snapshot()['by_status'] == {'NEXT': 2}
+        assert counters.categories() == ['DevOps', 'Reliability']
+        assert counters.total == 2
+        assert counters.snapshot() == RoadmapCounters(items[:2]).snapshot()
+
+
+class TestQueryIndex:
+    """Prevent: multi-predicate queries missing items or returning stale ones after edits."""
+
+    def _items(self):
+        return [
+            {'id': 1, 'status': 'DONE', 'category': 'DevOps', 'owner': 'Zev', 'priority_score': 7.0,
+             'completed_date': '2026-03-01', 'votes': [{'user_id': 1}]},
+            {'id': 2, 'status': 'NEXT', 'category': 'devops', 'owner': None, 'priority_score': 9.5,
+             'completed_date': None, 'votes': []},
+            {'id': 3, 'status': 'BACKLOG', 'category': 'Reliability', 'owner': 'Ana', 'priority_score': 4.0,
+             'completed_date': '2026-05-10', 'votes': [{'user_id': 2}]},
+        ]
+
+    def _ids(self, index, query):
+        return sorted(index.select(query))
+
+    def test_in_lists_ranges_and_votes_intersect(self):
+        index = QueryIndex(self._items())
+        assert self._ids(index, ItemQuery(statuses=['done', 'next'])) == [1, 2]
+        assert self._ids(index, ItemQuery(categories=['DEVOPS'], ranges={'priority_score': (8, None)})) == [2]
+        assert self._ids(index, ItemQuery(ranges={'completed_date': ('2026-01-01', '2026-03-31')})) == [1]
+        assert self._ids(index, ItemQuery(has_votes=False)) == [2]
+        assert self._ids(index, ItemQuery(owners=['ana', 'zev'], has_votes=True,
+                                          ranges={'priority_score': (None, 5)})) == [3]
+        assert index.select(ItemQuery()) is None
+
+    def test_sorted_order_puts_missing_values_last(self):
+        index = QueryIndex(self._items())
+        assert list(index.ordered('priority_score', descending=True)) == [2, 1, 3]
+        assert list(index.ordered('completed_date')) == [1, 3, 2]
+        assert list(index.ordered('priority_score', ids={1, 3}, after=(4.0, 3))) == [1]
+        assert list(index.ordered('completed_date', after=(None, 1))) == [2]
+
+    def test_updates_move_items_between_indexes(self):
+        items = self._items()
+        index = QueryIndex(items)
+        items[0].update(status='NEXT', priority_score=1.0, votes=[])
+        index.update(items[0])
+        index.remove(2)
+        assert self._ids(index, ItemQuery(statuses=['NEXT'])) == [1]
+        assert self._ids(index, ItemQuery(statuses=['DONE'])) == []
+        assert list(index.ordered('priority_score')) == [1, 3]
+        assert self._ids(index, ItemQuery(has_votes=True)) == [3]
+
+
+class TestIndexedHandlers:
+    """Prevent: handlers disagreeing with the index after mutations."""
+
+    def test_ids_after_delete_and_create(self, client):
+        client.delete('/api/roadmap/items/2')
+        assert client.post('/api/roadmap/items', json={'name': 'Reuses 2'}).get_json()['id'] == 2
+        assert client.post('/api/roadmap/items', json={'name': 'Then 3'}).get_json()['id'] == 3
+        client.delete('/api/roadmap/items/1')
+        assert client.get('/api/roadmap/items/3').get_json()['name'] == 'Then 3'
+        assert client.get('/api/roadmap/items/1').status_code == 404
+
+    def test_vote_toggle_and_comment_ids(self, logged_in_client):
+        c = logged_in_client
+        assert c.post('/api/roadmap/items/1/vote', json={'vote': 'up'}).get_json()['user_vote'] == 'up'
+        assert c.post('/api/roadmap/items/1/vote', json={'vote': 'down'}).get_json()['user_vote'] == 'down'
+        resp = c.post('/api/roadmap/items/1/vote', json={'vote': 'down'}).get_json()
+        assert resp['user_vote'] is None
+        assert resp['vote_count'] == 0
+        ids = [c.post('/api/roadmap/items/1/comments', json={'comment': t}).get_json()['comment']['id']
+               for t in ('one', 'two')]
+        assert ids == [1, 2]
+        c.delete('/api/roadmap/items/1/comments/2')
+        assert c.put('/api/roadmap/items/1/comments/2', json={'comment': 'x'}).status_code == 404
+        assert c.post('/api/roadmap/items/1/comments', json={'comment': 'again'}).get_json()['comment']['id'] == 2
+
+    def test_metadata_endpoint_follows_mutations(self, client):
+        client.put('/api/roadmap/items/1/status', json={'status': 'DONE'})
+        client.post('/api/roadmap/items', json={'name': 'New', 'category': 'Measurement'})
+        client.delete('/api/roadmap/items/2')
+        meta = client.get('/api/roadmap/metadata').get_json()
+        assert meta['total_items'] == 2
+        assert meta['by_status'] == {'BACKLOG': 1, 'PLANNED': 0, 'NEXT': 0, 'IN_PROGRESS': 0, 'DONE': 1}
+        assert meta['categories'] == ['DevOps', 'Measurement']
+        assert meta['revision'] == client.get('/api/roadmap').get_json()['revision']
+        assert client.get('/api/roadmap').get_json()['metadata']['categories'] == meta['categories']
@@ -0,0 +1,76 @@
+"""Search tests — prevent missing, stale or badly ranked search results."""
+
+from search import SearchIndex, highlights
+
+
+def make_items():
+    return [
+        {'id': 1, 'name': 'Churn alert automation', 'category': 'CS Intelligence',
+         'description': 'Flags accounts at risk', 'comments': []},
+        {'id': 2, 'name': 'Renewal digest', 'category': 'DevOps',
+         'description': 'Weekly churn summary for CSMs',
+         'comments': [{'id': 7, 'comment': 'Add alerting too'}]},
+        {'id': 3, 'name': 'Deploy pipeline', 'category': 'DevOps', 'description': 'CI for n8n'},
+    ]
+
+
+class TestSearchIndex:
+    """Prevent: ranking, prefix matching or incremental updates going wrong."""
+
+    def test_name_matches_outrank_description_matches(self):
+        total, ranked = SearchIndex(make_items()).search('churn')
+        assert total == 2
+        assert [item_id for item_id, _ in ranked] == [1, 2]
+
+    def test_prefix_and_all_words_required(self):
+        index = SearchIndex(make_items())
+        assert [i for i, _ in index.search('aler')[1]] == [1, 2]  # "alert", "alerting"
+        assert [i for i, _ in index.search('churn weekly')[1]] == [2]
+        assert index.search('churn nothing') == (0, [])
+        assert index.search('  ') == (0, [])
+
+    def test_updates_and_removes_are_incremental(self):
+        items = make_items()
+        index = SearchIndex(items)
+        items[2]['name'] = 'Churn deploy'
+        index.update(items[2])
+        index.remove(1)
+        assert sorted(i for i, _ in index.search('churn')[1]) == [2, 3]
+        assert index.search('pipeline') == (0, [])
+        assert index.search('flags') == (0, [])
+
+    def test_highlight_offsets(self):
+        item = make_items()[1]
+        found = highlights(item, 'churn alert')
+        assert found['description'] == [[7, 12]]
+        assert found['comments'] == {'7': [[4, 12]]}
+        assert item['description'][7:12] == 'churn'
+
+
+class TestSearchEndpoint:
+    """Prevent: GET /api/roadmap/search drifting from the board after writes."""
+
+    def test_search_ranks_and_projects(self, client):
+        body = client.get('/api/roadmap/search?q=test&fields=name').get_json()
+        assert body['total'] == 2
+        assert set(body['results'][0]['item']) == {'id', 'name'}
+        assert body['results'][0]['highlights']['name'] == [[0, 4]]
+
+    def test_writes_are_searchable_immediately(self, client):
+        client.get('/api/roadmap/search?q=test')
+        new_id = client.post('/api/roadmap/items', json={'name': 'Quarterly zebra report'}).get_json()['id']
+        assert [r['id'] for r in client.get('/api/roadmap/search?q=zeb').get_json()['results']] == [new_id]
+        client.put(f'/api/roadmap/items/{new_id}', json={'name': 'Quarterly report'})
+        assert client.get('/api/roadmap/search?q=zebra').get_json()['total'] == 0
+        client.delete(f'/api/roadmap/items/{new_id}')
+        assert client.get('/api/roadmap/search?q=quarterly').get_json()['total'] == 0
+
+    def test_comments_are_searchable(self, logged_in_client):
+        logged_in_client.post('/api/roadmap/items/2/comments', json={'comment': 'Needs xylophone support'})
+        results = logged_in_client.get('/api/roadmap/search?q=xylophone').get_json()['results']
+        assert [r['id'] for r in results] == [2]
+        assert list(results[0]['highlights']['comments'].values()) == [[[6, 15]]]
+
+    def test_query_required(self, client):
+        assert client.get('/api/roadmap/search').status_code == 400
+        assert client.get('/api/roadmap/search?q=x&limit=0').status_code == 400
@@ -250,14 +250,17 @@ class TestDependencyIntegrity:
     # Packages that are part of the Python stdlib or project-local
     STDLIB_AND_LOCAL = {
         'functools', 'flask', 'flask_cors', 'flask_login',
-        'werkzeug', 'config', 'auth', 'hmac', 'json', 'os',
+        'werkzeug', 'config', 'auth', 'storage', 'manage', 'gitqueue', 'indexes', 'respcache', 'changes', 'search', 'query', 'history', 'comments', 'votes', 'groupcommit', 'graph', 'stats', 'timeline', 'export', 'csv', 'hmac', 'json', 'os',
         'subprocess', 'datetime', 'sys', 'pathlib', 'hashlib', 'traceback',
         'secrets', 'logging', 'collections', 'typing', 'abc',
         're', 'io', 'time', 'copy', 'math', 'uuid', 'base64',
-        'urllib', 'importlib', 'contextlib', 'dataclasses',
+        'urllib', 'importlib', 'contextlib', 'dataclasses', 'threading',
+        'sqlite3', 'argparse', 'fcntl', 'atexit', 'signal', 'gzip', 'bisect', 'heapq', 'itertools',
         'markupsafe', 'jinja2', 'click', 'itsdangerous',
         'dotenv', 'python-dotenv',
         'authlib', 'requests',
+        # Optional accelerators, imported with a stdlib fallback
+        'orjson', 'brotli',
     }
 
     # Map import names to requirement names (when they differ)
@@ -0,0 +1,76 @@
+"""Roadmap stats tests — prevent group aggregates drifting from the items they summarise."""
+
+import pytest
+
+from stats import GroupStats, StatsError, parse_metrics
+
+
+def make_items():
+    return [
+        {'id': 1, 'category': 'DevOps', 'status': 'DONE', 'priority_score': 8.0, 'vote_count': 2},
+        {'id': 2, 'category': 'DevOps', 'status': 'NEXT', 'priority_score': 6.0, 'vote_count': 1},
+        {'id': 3, 'category': '', 'status': 'NEXT', 'priority_score': None, 'vote_count': 0},
+    ]
+
+
+class TestGroupStats:
+    """Prevent: stale or miscounted groups after edits."""
+
+    def test_groups_and_totals(self):
+        stats = GroupStats(make_items())
+        result = stats.query(('category',), ('count', 'avg:priority_score', 'sum:vote_count'))
+        assert result['groups'] == [
+            {'category': 'DevOps', 'count': 2, 'avg:priority_score': 7.0, 'sum:vote_count': 3},
+            {'category': 'Uncategorized', 'count': 1, 'avg:priority_score': None, 'sum:vote_count': 0},
+        ]
+        assert result['totals'] == {'count': 3, 'avg:priority_score': 7.0, 'sum:vote_count': 3}
+
+    def test_updates_move_items_between_groups(self):
+        items = make_items()
+        stats = GroupStats(items)
+        before = stats.query(('status', 'category'), ('count',))
+        assert [(g['status'], g['category'], g['count']) for g in before['groups']] == [
+            ('DONE', 'DevOps', 1), ('NEXT', 'DevOps', 1), ('NEXT', 'Uncategorized', 1)]
+        items[1]['status'] = 'DONE'
+        stats.update(items[1])
+        stats.remove(3)
+        stats.update({'id': 4, 'category': 'Reliability', 'status': 'NEXT', 'priority_score': 2.0})
+        after = stats.query(('status', 'category'), ('count', 'sum:priority_score'))
+        assert after['groups'] == [
+            {'status': 'DONE', 'category': 'DevOps', 'count': 2, 'sum:priority_score': 14.0},
+            {'status': 'NEXT', 'category': 'Reliability', 'count': 1, 'sum:priority_score': 2.0},
+        ]
+        assert after == GroupStats([*items[:2], {'id': 4, 'category': 'Reliability', 'status': 'NEXT',
+                                                 'priority_score': 2.0}]).query(
+            ('status', 'category'), ('count', 'sum:priority_score'))
+
+    def test_rejects_unknown_metrics(self):
+        with pytest.raises(StatsError):
+            parse_metrics(['max:priority_score'])
+        with pytest.raises(StatsError):
+            parse_metrics(['avg:name'])
+
+
+class TestStatsEndpoint:
+    """Prevent: the stats endpoint serving counts from before a save."""
+
+    def test_stats_follow_writes(self, client):
+        url = '/api/roadmap/stats?group_by=category,status&metrics=count,avg:priority_score,sum:vote_count'
+        resp = client.get(url)
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert body['group_by'] == ['category', 'status']
+        assert body['totals']['count'] == 2
+        assert {(g['category'], g['status'], g['count']) for g in body['groups']} == {
+            ('DevOps', 'BACKLOG', 1), ('Reliability', 'IN_PROGRESS', 1)}
+        client.put('/api/roadmap/items/1/status', json={'status': 'DONE'})
+        after = client.get(url)
+        assert after.headers['ETag'] != resp.headers['ETag']
+        assert {(g['category'], g['status']) for g in after.get_json()['groups']} == {
+            ('DevOps', 'DONE'), ('Reliability', 'IN_PROGRESS')}
+
+    def test_rejects_bad_parameters(self, client):
+        assert client.get('/api/roadmap/stats?group_by=name').status_code == 400
+        assert client.get('/api/roadmap/stats?metrics=median:priority_score').status_code == 400
+        totals = client.get('/api/roadmap/stats').get_json()
+        assert totals['groups'] == [{'count': 2}] and totals['totals'] == {'count': 2}
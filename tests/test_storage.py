@@ -0,0 +1,468 @@
+"""Storage tests — prevent stale reads, lost writes and cache corruption."""
+
+import json
+import os
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Parsed-document cache
+# ---------------------------------------------------------------------------
+
+class TestRoadmapCache:
+    """Prevent: every request re-parsing roadmap.json, or serving stale data."""
+
+    def _cache(self, client):
+        return client.get('/api/health').get_json()['cache']
+
+    def test_repeated_reads_hit_cache(self, client):
+        client.get('/api/roadmap')
+        before = self._cache(client)
+        client.get('/api/roadmap/items')
+        client.get('/api/roadmap/items/1')
+        after = self._cache(client)
+        assert after['misses'] == before['misses']
+        assert after['hits'] >= before['hits'] + 2
+
+    def test_external_edit_is_picked_up(self, client, tmp_roadmap):
+        client.get('/api/roadmap')
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['items'][0]['name'] = 'Edited On Disk'
+        with open(tmp_roadmap, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        resp = client.get('/api/roadmap/items/1')
+        assert resp.get_json()['name'] == 'Edited On Disk'
+
+    def test_save_bumps_revision_and_stays_warm(self, client):
+        before = self._cache(client)
+        client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        after = self._cache(client)
+        assert after['generation'] > before['generation']
+        assert after['misses'] == before['misses']
+        assert client.get('/api/roadmap/items/1').get_json()['status'] == 'NEXT'
+
+    def test_save_writes_through_to_disk(self, client, tmp_roadmap):
+        client.post('/api/roadmap/items', json={'name': 'Persisted'})
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            names = [i['name'] for i in json.load(f)['items']]
+        assert 'Persisted' in names
+        assert not os.path.exists(tmp_roadmap + '.tmp')
+
+
+# ---------------------------------------------------------------------------
+# On-disk encoding
+# ---------------------------------------------------------------------------
+
+class TestSerialization:
+    """Prevent: whitespace bloat on disk, or formats that do not round-trip."""
+
+    def test_saves_are_compact_by_default(self, client, tmp_roadmap):
+        client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        with open(tmp_roadmap, 'rb') as f:
+            raw = f.read()
+        assert b'\n' not in raw and b'": ' not in raw
+        assert json.loads(raw)['items'][0]['status'] == 'NEXT'
+
+    @pytest.mark.parametrize('fmt', ['compact', 'orjson', 'pretty'])
+    def test_formats_round_trip(self, fmt):
+        import storage
+        data = {'items': [{'id': 1, 'name': 'Caf\u00e9 \u2192 n8n', 'score': 7.5, 'owner': None}]}
+        assert storage.decode(storage.encode(data, fmt)) == data
+
+    def test_orjson_falls_back_to_stdlib(self, monkeypatch):
+        import storage
+        monkeypatch.setattr(storage, 'orjson', None)
+        raw = storage.encode({'a': [1, 2]}, 'orjson')
+        assert raw == b'{"a":[1,2]}'
+        assert storage.decode(raw) == {'a': [1, 2]}
+
+    def test_pretty_command(self, client, tmp_roadmap, tmp_path):
+        import manage
+        client.put('/api/roadmap/items/1/status', json={'status': 'DONE'})
+        out = tmp_path / 'pretty.json'
+        manage.main(['--file', tmp_roadmap, 'pretty', tmp_roadmap, '--out', str(out)])
+        text = out.read_text(encoding='utf-8')
+        assert text.startswith('{\n  "')
+        assert json.loads(text)['items'][0]['status'] == 'DONE'
+
+    def test_split_history_command(self, client, tmp_roadmap, tmp_path):
+        import manage
+        manage.main(['--file', tmp_roadmap, 'split-history'])
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            items = json.load(f)['items']
+        assert all('edit_history' not in i and i['history_count'] == 0 for i in items)
+        client.put('/api/roadmap/items/2/status', json={'status': 'DONE'})
+        assert (tmp_path / 'history' / '2.jsonl').read_text(encoding='utf-8').count('\n') == 1
+
+    def test_split_comments_command(self, client, tmp_roadmap, tmp_path):
+        import manage
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['items'][0]['comments'] = [{'id': 1, 'user_id': 1, 'comment': 'Inline'}]
+        with open(tmp_roadmap, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        manage.main(['--file', tmp_roadmap, 'split-comments'])
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            items = json.load(f)['items']
+        assert all('comments' not in i for i in items)
+        assert [i['comment_count'] for i in items] == [1, 0]
+        saved = json.loads((tmp_path / 'comments' / '1.json').read_text(encoding='utf-8'))
+        assert saved[0]['comment'] == 'Inline'
+        resp = client.get('/api/roadmap/items/1/comments').get_json()
+        assert resp['total'] == 1 and resp['comments'][0]['comment'] == 'Inline'
+
+
+# ---------------------------------------------------------------------------
+# Operation log storage mode
+# ---------------------------------------------------------------------------
+
+class TestOpLogStorage:
+    """Prevent: oplog mode losing writes across restarts or compaction."""
+
+    @pytest.fixture()
+    def oplog_client(self, app, monkeypatch):
+        import config
+        monkeypatch.setattr(config.Config, 'ROADMAP_STORAGE', 'oplog')
+        return app.test_client()
+
+    def _fresh_load(self, tmp_roadmap):
+        """Replay snapshot + log the way a newly started process would."""
+        from storage import OpLogStore
+        return OpLogStore(tmp_roadmap).load()
+
+    def test_mutations_append_instead_of_rewriting(self, oplog_client, tmp_roadmap):
+        with open(tmp_roadmap, 'rb') as f:
+            snapshot = f.read()
+        oplog_client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        oplog_client.post('/api/roadmap/items', json={'name': 'Logged'})
+        with open(tmp_roadmap, 'rb') as f:
+            assert f.read() == snapshot
+        log_path = tmp_roadmap.replace('.json', '.oplog')
+        with open(log_path, 'r', encoding='utf-8') as f:
+            assert len(f.readlines()) == 2
+
+    def test_replay_rebuilds_state(self, oplog_client, tmp_roadmap):
+        oplog_client.put('/api/roadmap/items/1/status', json={'status': 'DONE'})
+        oplog_client.post('/api/roadmap/items', json={'name': 'Replayed'})
+        oplog_client.delete('/api/roadmap/items/2')
+        data = self._fresh_load(tmp_roadmap)
+        by_id = {i['id']: i for i in data['items']}
+        assert by_id[1]['status'] == 'DONE'
+        assert by_id[3]['name'] == 'Replayed'
+        assert 2 not in by_id
+        assert data['metadata']['total_items'] == 2
+
+    def test_compaction_folds_log_into_snapshot(self, oplog_client, tmp_roadmap, monkeypatch):
+        import config
+        monkeypatch.setattr(config.Config, 'OPLOG_COMPACT_EVERY', 3)
+        for status in ('PLANNED', 'NEXT', 'DONE'):
+            oplog_client.put('/api/roadmap/items/1/status', json={'status': status})
+        log_path = tmp_roadmap.replace('.json', '.oplog')
+        assert os.path.getsize(log_path) == 0
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            assert json.load(f)['items'][0]['status'] == 'DONE'
+        assert self._fresh_load(tmp_roadmap)['items'][0]['status'] == 'DONE'
+
+    def test_torn_last_record_is_ignored(self, oplog_client, tmp_roadmap):
+        oplog_client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        with open(tmp_roadmap.replace('.json', '.oplog'), 'a', encoding='utf-8') as f:
+            f.write('{"put":[{"id":1,"status":"DO')
+        assert self._fresh_load(tmp_roadmap)['items'][0]['status'] == 'NEXT'
+
+
+# ---------------------------------------------------------------------------
+# SQLite backend
+# ---------------------------------------------------------------------------
+
+class TestSqliteStorage:
+    """Prevent: SQLite backend diverging from the roadmap.json behaviour."""
+
+    @pytest.fixture()
+    def sqlite_client(self, app, monkeypatch):
+        import config
+        monkeypatch.setattr(config.Config, 'ROADMAP_STORAGE', 'sqlite')
+        return app.test_client()
+
+    def test_bootstraps_from_roadmap_json(self, sqlite_client, tmp_roadmap):
+        items = sqlite_client.get('/api/roadmap/items').get_json()
+        assert [i['id'] for i in items] == [1, 2]
+        assert os.path.exists(tmp_roadmap.replace('.json', '.db'))
+
+    def test_indexed_filters(self, sqlite_client):
+        items = sqlite_client.get('/api/roadmap/items?status=in_progress').get_json()
+        assert [i['id'] for i in items] == [2]
+        items = sqlite_client.get('/api/roadmap/items?category=devops').get_json()
+        assert [i['id'] for i in items] == [1]
+
+    def test_crud_round_trip(self, sqlite_client):
+        resp = sqlite_client.post('/api/roadmap/items', json={'name': 'In SQLite'})
+        new_id = resp.get_json()['id']
+        sqlite_client.put(f'/api/roadmap/items/{new_id}/status', json={'status': 'DONE'})
+        item = sqlite_client.get(f'/api/roadmap/items/{new_id}').get_json()
+        assert item['status'] == 'DONE'
+        assert item['last_edit']['new_value'] == 'DONE'
+        sqlite_client.delete('/api/roadmap/items/1')
+        ids = [i['id'] for i in sqlite_client.get('/api/roadmap').get_json()['items']]
+        assert ids == [2, new_id]
+
+    def test_comments_and_votes_persist(self, app, sqlite_client):
+        sqlite_client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin'})
+        sqlite_client.post('/api/roadmap/items/1/vote', json={'vote': 'up'})
+        sqlite_client.post('/api/roadmap/items/1/comments', json={'comment': 'Stored in a file'})
+        item = sqlite_client.get('/api/roadmap/items/1').get_json()
+        assert item['vote_count'] == 1
+        assert item['votes'] == {'1': 'up'}
+        assert item['comment_count'] == 1
+        comments = sqlite_client.get('/api/roadmap/items/1/comments').get_json()['comments']
+        assert comments[0]['comment'] == 'Stored in a file'
+
+    def test_projection_and_pagination(self, sqlite_client):
+        sqlite_client.post('/api/roadmap/items', json={'name': 'Third'})
+        resp = sqlite_client.get('/api/roadmap/items?limit=2&exclude=edit_history,votes')
+        items = resp.get_json()
+        assert [i['id'] for i in items] == [1, 2]
+        assert 'edit_history' not in items[0] and 'votes' not in items[0]
+        assert items[0]['name'] == 'Test Item Alpha'
+        resp = sqlite_client.get(f'/api/roadmap/items?limit=2&fields=name&cursor={resp.headers["X-Next-Cursor"]}')
+        assert resp.get_json() == [{'id': 3, 'name': 'Third'}]
+
+    def test_multi_value_filters_and_sorting(self, sqlite_client):
+        third = sqlite_client.post('/api/roadmap/items', json={'name': 'Third', 'category': 'reliability', 'impact_score': 10}).get_json()['id']
+        ids = lambda q: [i['id'] for i in sqlite_client.get(f'/api/roadmap/items?{q}').get_json()]
+        assert ids('status=backlog,in_progress&category=DEVOPS,reliability') == [1, 2, third]
+        assert ids('owner=ZEV&category=devops') == [1]
+        assert ids('sort=-impact_score&limit=1') == [third]
+
+    def test_export_round_trips_to_json(self, sqlite_client, tmp_roadmap):
+        from storage import migrate
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            key_order = list(json.load(f))
+        sqlite_client.put('/api/roadmap/items/1/status', json={'status': 'NEXT'})
+        before = sqlite_client.get('/api/roadmap').get_json()
+        migrate(tmp_roadmap, 'sqlite', 'json')
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            exported = json.load(f)
+        assert exported == before
+        assert list(exported) == key_order + ['revision']
+
+
+# ---------------------------------------------------------------------------
+# Per-item sharded layout
+# ---------------------------------------------------------------------------
+
+class TestShardedStorage:
+    """Prevent: sharded layout rewriting untouched items or losing order."""
+
+    @pytest.fixture()
+    def sharded_client(self, app, monkeypatch):
+        import config
+        monkeypatch.setattr(config.Config, 'ROADMAP_STORAGE', 'sharded')
+        return app.test_client()
+
+    def _items_dir(self, tmp_roadmap):
+        return os.path.join(os.path.dirname(tmp_roadmap), 'items')
+
+    def test_bootstraps_one_file_per_item(self, sharded_client, tmp_roadmap):
+        assert [i['id'] for i in sharded_client.get('/api/roadmap/items').get_json()] == [1, 2]
+        assert sorted(os.listdir(self._items_dir(tmp_roadmap))) == ['1.json', '2.json', 'manifest.json']
+
+    def test_cold_get_item_bootstraps(self, tmp_roadmap):
+        from storage import ShardedStore
+        store = ShardedStore(tmp_roadmap)
+        assert store.get_item(2)['name'] == 'Test Item Beta'
+        assert os.path.exists(os.path.join(self._items_dir(tmp_roadmap), 'manifest.json'))
+
+    def test_mutation_rewrites_only_its_shard(self, sharded_client, tmp_roadmap):
+        sharded_client.get('/api/roadmap')
+        other = os.path.join(self._items_dir(tmp_roadmap), '2.json')
+        before = os.stat(other)
+        sharded_client.put('/api/roadmap/items/1/status', json={'status': 'DONE'})
+        after = os.stat(other)
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+        with open(os.path.join(self._items_dir(tmp_roadmap), '1.json'), 'r', encoding='utf-8') as f:
+            assert json.load(f)['status'] == 'DONE'
+
+    def test_create_and_delete_keep_order(self, sharded_client, tmp_roadmap):
+        new_id = sharded_client.post('/api/roadmap/items', json={'name': 'Shard'}).get_json()['id']
+        sharded_client.delete('/api/roadmap/items/1')
+        assert not os.path.exists(os.path.join(self._items_dir(tmp_roadmap), '1.json'))
+        from storage import ShardedStore
+        fresh = ShardedStore(tmp_roadmap)
+        assert [i['id'] for i in fresh.load()['items']] == [2, new_id]
+        assert fresh.get_item(new_id)['name'] == 'Shard'
+
+    def test_other_process_writes_are_seen(self, sharded_client, tmp_roadmap):
+        sharded_client.get('/api/roadmap')
+        from storage import ShardedStore
+        other = ShardedStore(tmp_roadmap)
+        data = other.load()
+        data['items'][1]['name'] = 'Renamed Elsewhere'
+        other.save(data, changed=[data['items'][1]])
+        assert sharded_client.get('/api/roadmap/items/2').get_json()['name'] == 'Renamed Elsewhere'
+
+    def test_exports_back_to_single_file(self, sharded_client, tmp_roadmap):
+        from storage import migrate
+        sharded_client.put('/api/roadmap/items/2/status', json={'status': 'DONE'})
+        before = sharded_client.get('/api/roadmap').get_json()
+        migrate(tmp_roadmap, 'sharded', 'json')
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            assert json.load(f) == before
+
+
+# ---------------------------------------------------------------------------
+# Group commit
+# ---------------------------------------------------------------------------
+
+class TestGroupCommit:
+    """Prevent: coalesced saves being lost, reordered, or acknowledged before they are written."""
+
+    def _store(self, tmp_roadmap, backend='json', window=0.05, max_batch=64):
+        from storage import STORAGE_BACKENDS
+        store = STORAGE_BACKENDS[backend](tmp_roadmap)
+        store.enable_group_commit(window, max_batch)
+        writes = []
+        write = store._write
+        store._write = lambda data, changed, deleted: (writes.append(len(changed)), write(data, changed, deleted))
+        return store, writes
+
+    def _rename(self, store, item_id, name):
+        with store.write_lock():
+            data = store.load()
+            item = next(i for i in data['items'] if i['id'] == item_id)
+            item['name'] = name
+            store.save(data, changed=[item])
+        store.wait_for_flush()
+
+    def test_concurrent_saves_share_one_write(self, tmp_roadmap):
+        import threading
+        store, writes = self._store(tmp_roadmap)
+        threads = [threading.Thread(target=self._rename, args=(store, 1 + n % 2, f'Name {n}'))
+                   for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(writes) < 8
+        assert store.group_commit.batch_sizes.count == len(writes)
+        assert store.group_commit.batch_sizes.total == 8
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            on_disk = json.load(f)['items']
+        assert [i['name'] for i in on_disk] == [i['name'] for i in store.load()['items']]
+
+    def test_full_batch_flushes_without_waiting_for_the_window(self, tmp_roadmap):
+        import time
+        store, writes = self._store(tmp_roadmap, window=30, max_batch=1)
+        started = time.monotonic()
+        self._rename(store, 1, 'Quick')
+        assert time.monotonic() - started < 5
+        assert writes == [1]
+
+    def test_flush_error_reaches_the_waiting_request(self, tmp_roadmap):
+        store, _ = self._store(tmp_roadmap, window=0)
+
+        def fail(data, changed, deleted):
+            raise OSError('disk full')
+        store._write = fail
+        with pytest.raises(OSError):
+            self._rename(store, 1, 'Lost')
+        assert store.group_commit.failures == 1
+        assert store.load()['items'][0]['name'] == 'Test Item Alpha'
+
+    def test_invalidate_discards_the_pending_batch(self, tmp_roadmap):
+        import threading
+        from groupcommit import BatchDiscarded
+        store, writes = self._store(tmp_roadmap, window=30)
+        errors = []
+
+        def rename():
+            try:
+                self._rename(store, 1, 'Never written')
+            except BatchDiscarded as e:
+                errors.append(e)
+        t = threading.Thread(target=rename)
+        t.start()
+        while store.group_commit.pending is None:
+            t.join(0.01)
+        store.invalidate()
+        t.join()
+        assert errors and writes == []
+        assert store.load()['items'][0]['name'] == 'Test Item Alpha'
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            assert json.load(f)['items'][0]['name'] == 'Test Item Alpha'
+
+    def test_crashed_request_does_not_null_a_pending_save(self, app, monkeypatch, tmp_roadmap):
+        import sys
+        import threading
+        import config
+        monkeypatch.setattr(config.Config, 'GROUP_COMMIT_WINDOW_MS', 30000)
+        app_module = sys.modules['app']
+        client = app.test_client()
+        store = app_module.roadmap_store()
+        responses = []
+
+        def save():
+            try:
+                responses.append(client.put('/api/roadmap/items/1/status', json={'status': 'DONE'}))
+            except Exception as e:  # TESTING propagates the discarded batch's error
+                responses.append(e)
+        t = threading.Thread(target=save)
+        t.start()
+        while store.group_commit.pending is None:
+            t.join(0.01)
+
+        def crash(*args, **kwargs):
+            raise RuntimeError('boom')
+        monkeypatch.setattr(app_module, 'highlights', crash)
+        with pytest.raises(RuntimeError):
+            client.get('/api/roadmap/search?q=alpha')
+        t.join()
+        assert not (hasattr(responses[0], 'status_code') and responses[0].status_code == 200)
+        with open(tmp_roadmap, 'r', encoding='utf-8') as f:
+            assert json.load(f)['items'][0]['status'] == 'BACKLOG'
+        assert client.get('/api/roadmap').status_code == 200
+
+    def test_sqlite_reads_see_the_pending_batch(self, tmp_roadmap):
+        from query import ItemQuery
+        store, writes = self._store(tmp_roadmap, backend='sqlite', window=30)
+        store.load()
+        writes.clear()  # Bootstrapping roadmap.db
+        with store.write_lock():
+            data = store.load()
+            item = data['items'][0]
+            item['status'] = 'DONE'
+            store.save(data, changed=[item])
+        assert writes == []
+        assert store.get_item(1)['status'] == 'DONE'
+        assert [i['id'] for i in store.list_items(ItemQuery(statuses={'DONE'}))] == [1]
+        assert [i['id'] for i in store.iter_items(ItemQuery(statuses={'BACKLOG'}))] == []
+        store.flush()
+        assert writes == [1]
+        assert [i['id'] for i in store.list_items(ItemQuery(statuses={'DONE'}))] == [1]
+
+    def test_idle_flush_leaves_the_lock_file_alone(self, tmp_roadmap):
+        store, writes = self._store(tmp_roadmap)
+        store.load()
+        store.flush()  # As the atexit hook does, possibly after the data dir is gone
+        assert writes == [] and not os.path.exists(store.lock_path)
+
+    def test_recreated_id_is_not_merged_with_its_delete(self, tmp_roadmap):
+        store, writes = self._store(tmp_roadmap, backend='oplog', window=30)
+        with store.write_lock():
+            data = store.load()
+            data['items'] = [i for i in data['items'] if i['id'] != 2]
+            store.save(data, deleted=[2])
+            data['items'].append({'id': 2, 'name': 'Reborn'})
+            store.save(data, changed=[data['items'][-1]])
+        store.flush()
+        assert writes == [0, 1]
+        from storage import OpLogStore
+        assert OpLogStore(tmp_roadmap).load()['items'][-1] == {'id': 2, 'name': 'Reborn'}
+
+    def test_health_reports_histograms(self, client):
+        client.put('/api/roadmap/items/1/status', json={'status': 'DONE'})
+        stats = client.get('/api/health').get_json()['group_commit']
+        assert stats['flushes'] == 1
+        assert stats['batch_size']['buckets']['<=1'] == 1
+        assert stats['flush_ms']['count'] == 1
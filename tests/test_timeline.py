@@ -0,0 +1,96 @@
+"""Time-travel tests — prevent past reads showing the wrong state of the board."""
+
+import json
+
+import pytest
+
+from timeline import Timeline, parse_timestamp
+
+
+def item(item_id, status):
+    return {'id': item_id, 'name': f'Item {item_id}', 'status': status}
+
+
+class TestTimeline:
+    """Prevent: replay applying the wrong saves or too many of them."""
+
+    def _history(self, tmp_path, interval=2):
+        timeline = Timeline(str(tmp_path / 'timeline'), interval=interval)
+        data = {'revision': 1, 'last_updated': '2026-01-01T00:00:00Z',
+                'items': [item(1, 'BACKLOG'), item(2, 'BACKLOG')], 'metadata': {}}
+        timeline.record(data, [], [], 0, 1)
+        saves = [
+            ('2026-01-02T00:00:00Z', [item(1, 'NEXT')], []),
+            ('2026-01-03T00:00:00Z', [item(3, 'BACKLOG')], []),
+            ('2026-01-04T00:00:00Z', [], [2]),
+            ('2026-01-05T00:00:00Z', [item(1, 'DONE')], []),
+        ]
+        for n, (ts, changed, deleted) in enumerate(saves, 2):
+            by_id = {i['id']: i for i in data['items']}
+            by_id.update({i['id']: i for i in changed})
+            data = {'revision': n, 'last_updated': ts, 'metadata': {'total_items': 0},
+                    'items': [i for i in by_id.values() if i['id'] not in deleted]}
+            timeline.record(data, changed, deleted, n - 1, n)
+        return timeline
+
+    def state(self, timeline, ts):
+        body = timeline.body_at(ts)
+        if body is None:
+            return None
+        data = json.loads(body.encoded('identity'))
+        return data['revision'], {i['id']: i['status'] for i in data['items']}
+
+    def test_replays_onto_the_nearest_checkpoint(self, tmp_path):
+        timeline = self._history(tmp_path)
+        assert [rev for rev, _ in timeline.checkpoints()] == [1, 4]
+        assert self.state(timeline, '2025-12-31T00:00:00Z') is None
+        assert self.state(timeline, '2026-01-01T12:00:00Z') == (1, {1: 'BACKLOG', 2: 'BACKLOG'})
+        assert self.state(timeline, '2026-01-03T00:00:00Z') == (3, {1: 'NEXT', 2: 'BACKLOG', 3: 'BACKLOG'})
+        assert self.state(timeline, '2026-01-04T06:00:00Z') == (4, {1: 'NEXT', 3: 'BACKLOG'})
+        assert self.state(timeline, '2027-01-01T00:00:00Z') == (5, {1: 'DONE', 3: 'BACKLOG'})
+
+    def test_cache_shared_between_saves(self, tmp_path):
+        timeline = self._history(tmp_path)
+        first = timeline.body_at('2026-01-02T01:00:00Z')
+        assert timeline.body_at('2026-01-02T23:00:00Z') is first
+        assert (timeline.hits, timeline.builds) == (1, 1)
+
+    def test_old_checkpoints_are_pruned(self, tmp_path):
+        timeline = self._history(tmp_path, interval=1)
+        assert [rev for rev, _ in timeline.checkpoints()] == [1, 3, 5]
+        timeline.keep = 2
+        data = {'revision': 6, 'last_updated': '2026-01-06T00:00:00Z', 'items': [item(1, 'DONE')]}
+        timeline.record(data, [], [], 5, 6)
+        assert [rev for rev, _ in timeline.checkpoints()] == [5, 6]
+        assert sorted(p.name for p in (tmp_path / 'timeline').iterdir()) == [
+            '0000000005-2026-01-05T000000Z.json', '0000000006-2026-01-06T000000Z.json']
+        assert self.state(timeline, '2026-01-03T00:00:00Z') is None
+        assert self.state(timeline, '2026-01-05T12:00:00Z') == (5, {1: 'DONE', 3: 'BACKLOG'})
+
+    def test_unseen_generation_takes_a_checkpoint(self, tmp_path):
+        timeline = self._history(tmp_path, interval=100)
+        data = {'revision': 6, 'last_updated': '2026-01-06T00:00:00Z', 'items': [item(9, 'NEXT')]}
+        timeline.record(data, [item(9, 'NEXT')], [], 42, 43)  # Someone else wrote generation 42
+        assert [rev for rev, _ in timeline.checkpoints()] == [1, 6]
+        assert self.state(timeline, '2026-01-07T00:00:00Z') == (6, {9: 'NEXT'})
+
+    def test_parse_timestamp(self):
+        assert parse_timestamp('2026-03-01') == '2026-03-01T00:00:00Z'
+        assert parse_timestamp('2026-03-01T10:30:00+02:00') == '2026-03-01T08:30:00Z'
+        assert parse_timestamp('2026-03-01T10:30:00Z') == '2026-03-01T10:30:00Z'
+        with pytest.raises(ValueError):
+            parse_timestamp('last week')
+
+
+class TestAsOfEndpoint:
+    """Prevent: ?as_of= serving today's board or accepting junk timestamps."""
+
+    def test_as_of_reads_past_saves(self, client):
+        assert client.get('/api/roadmap?as_of=2026-01-01').status_code == 404
+        client.put('/api/roadmap/items/1/status', json={'status': 'DONE'})
+        resp = client.get('/api/roadmap?as_of=2999-01-01')
+        assert resp.status_code == 200
+        assert resp.get_json()['items'][0]['status'] == 'DONE'
+        assert client.get('/api/roadmap?as_of=yesterday').status_code == 400
+        missing = client.get('/api/roadmap?as_of=2000-01-01')
+        assert missing.status_code == 404 and missing.get_json()['earliest']
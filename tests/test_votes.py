@@ -0,0 +1,39 @@
+"""Vote tests — prevent tallies drifting from the vote map or the vote log."""
+
+from votes import VoteLog, cast_vote, vote_map
+
+
+class TestCastVote:
+    """Prevent: wrong running tallies on toggle, switch or legacy vote lists."""
+
+    def test_toggle_and_switch_adjust_the_tally(self):
+        item = {'id': 1, 'votes': {}, 'voter_names': {}, 'vote_count': 0}
+        assert cast_vote(item, 7, 'ann', 'up') == ('up', 1)
+        assert cast_vote(item, 8, 'bob', 'down') == ('down', -1)
+        assert cast_vote(item, 7, 'ann', 'down') == ('down', -2)
+        assert item['vote_count'] == -2
+        assert cast_vote(item, 7, 'ann', 'down') == (None, 1)
+        assert item['votes'] == {'8': 'down'} and item['voter_names'] == {'8': 'bob'}
+        assert item['vote_count'] == -1
+
+    def test_legacy_vote_list_is_converted(self):
+        item = {'id': 1, 'vote_count': 0, 'votes': [
+            {'user_id': 3, 'username': 'cy', 'vote': 'up', 'timestamp': '2026-01-01T00:00:00Z'},
+            {'user_id': 4, 'username': 'di', 'vote': 'up'},
+        ]}
+        assert vote_map(item) == {'3': 'up', '4': 'up'}
+        assert item['vote_count'] == 2 and item['voter_names']['4'] == 'di'
+        assert cast_vote(item, 3, 'cy', 'up') == (None, -1)
+        assert item['vote_count'] == 1
+
+
+class TestVoteLog:
+    """Prevent: vote events lost, or log tallies disagreeing with the items."""
+
+    def test_log_replays_to_item_tallies(self, client, logged_in_client, tmp_path):
+        for item_id, vote in ((1, 'up'), (2, 'down'), (1, 'down'), (2, 'down')):
+            logged_in_client.post(f'/api/roadmap/items/{item_id}/vote', json={'vote': vote})
+        items = client.get('/api/roadmap').get_json()['items']
+        log = VoteLog(str(tmp_path / 'votes.log'))
+        assert log.tallies() == {i['id']: i['vote_count'] for i in items}
+        assert [e[3] for e in log.read(2)] == ['down', None]